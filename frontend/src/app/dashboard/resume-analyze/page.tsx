@@ -21,6 +21,7 @@ export default function AnalyzePage() {
     const [uploading, setUploading] = useState(false);
     const [error, setError] = useState<string | null>(null);
     const [dragActive, setDragActive] = useState(false);
+    const [progress, setProgress] = useState<string[]>([]);
     const [savedAnalyses, setSavedAnalyses] = useState<SavedAnalysis[]>([]);
     const [loadingAnalyses, setLoadingAnalyses] = useState(false);
 
@@ -93,21 +94,56 @@ export default function AnalyzePage() {
 
         setUploading(true);
         setError(null);
+        setProgress([]);
 
         try {
             const formData = new FormData();
             formData.append('file', file);
 
-            const response = await fetch(`${process.env.NEXT_PUBLIC_ML_URL}/analyze-resume`, { 
+            // Streaming endpoint: one JSON event per line as each stage finishes
+            const response = await fetch(`${process.env.NEXT_PUBLIC_ML_URL}/analyze-resume/stream`, { 
                 method: 'POST',
                 body: formData,
             });
 
-            if (!response.ok) {
+            if (!response.ok || !response.body) {
                 throw new Error('Analysis failed');
             }
 
-            const result = await response.json();
+            const reader = response.body.getReader();
+            const decoder = new TextDecoder();
+            let buffer = '';
+            let result = null;
+
+            while (!result) {
+                const { done, value } = await reader.read();
+                if (done) break;
+                buffer += decoder.decode(value, { stream: true });
+
+                const lines = buffer.split('\n');
+                buffer = lines.pop() || '';
+                for (const line of lines) {
+                    if (!line.trim()) continue;
+                    const { event, data } = JSON.parse(line);
+                    if (event === 'text') {
+                        setProgress(p => [...p, `Read ${data.words} words from your resume`]);
+                    } else if (event === 'entities') {
+                        setProgress(p => [...p, data.name ? `Found profile for ${data.name}` : 'Extracted your profile details']);
+                    } else if (event === 'skills') {
+                        const top = data.slice(0, 5).map((s: { skill: string }) => s.skill).join(', ');
+                        setProgress(p => [...p, `Detected ${data.length} skills${top ? `: ${top}` : ''}`]);
+                    } else if (event === 'result') {
+                        result = data;
+                    } else if (event === 'error') {
+                        throw new Error(data.detail);
+                    }
+                }
+            }
+
+            if (!result) {
+                throw new Error('Analysis stream ended early');
+            }
+
             localStorage.setItem('resumeAnalysis', JSON.stringify(result));
             router.push('/dashboard/resume-analyze/results');
 
@@ -445,6 +481,14 @@ export default function AnalyzePage() {
                             <span className="w-3 h-3 bg-primary rounded-full animate-bounce" style={{ animationDelay: '300ms' }}></span>
                         </div>
 
+                        {progress.length > 0 && (
+                            <ul className="text-left text-sm text-white/70 space-y-1 mb-6">
+                                {progress.map((step, i) => (
+                                    <li key={i}>✓ {step}</li>
+                                ))}
+                            </ul>
+                        )}
+
                         <div className="space-y-2">
                             <div className="h-2 bg-black/30 rounded-full overflow-hidden">
                                 <div className="h-full w-3/4 bg-gradient-to-r from-primary to-primary-600 rounded-full animate-pulse"></div>
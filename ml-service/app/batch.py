@@ -0,0 +1,194 @@
+"""
+Batch resume analysis
+Many resumes per request, streamed back as NDJSON as they finish
+
+How a batch flows:
+1. Uploads (and the members of any .zip) are split into chunks
+2. Each chunk is one CPU task: parse every file, run spaCy over all of
+   them with nlp.pipe, and encode all their sentences in one
+   model.encode call
+3. Chunks run in parallel across the worker processes; only a few are
+   read into memory at a time
+4. As a chunk finishes, each resume gets its Gemini analysis on the I/O
+   threads and is written to the stream the moment it's done
+"""
+
+import asyncio
+import json
+import threading
+import time
+import zipfile
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Tuple
+
+from fastapi import UploadFile
+
+from app import config
+from app.executors import executor
+from app.metrics import ERRORS
+from app.models import BatchResumeResult
+from app.pipeline import gemini_stage
+
+
+SUPPORTED_EXTENSIONS = ('.pdf', '.docx')
+
+
+@dataclass
+class BatchSource:
+    """One resume in a batch; bytes are read only when its chunk runs"""
+    index: int
+    filename: str
+    read: Callable[[], Awaitable[bytes]]
+
+
+def analyze_batch_cpu(items: List[Tuple[str, bytes]]) -> List[Dict[str, Any]]:
+    """
+    CPU stages for a chunk of resumes (runs in a worker process)
+
+    Args:
+        items: (filename, file bytes) pairs
+
+    Returns:
+        Per item: {"text", "entities", "skills", "error"}, in input order
+    """
+    from app.parsers import extract_resume_text
+    from app.ner_extractor import extract_entities_batch
+    from app.skill_matcher import extract_skills_batch
+
+    results = []
+    for filename, data in items:
+        try:
+            text = extract_resume_text(data, filename)
+            error = None if len(text) >= 100 else "Resume text too short"
+        except Exception as e:
+            text, error = "", str(e)
+        results.append({"text": text, "entities": None, "skills": [], "error": error})
+
+    # Only resumes that parsed cleanly go through the models
+    ok = [r for r in results if r["error"] is None]
+    if ok:
+        texts = [r["text"] for r in ok]
+        entities_per_resume = extract_entities_batch(texts, n_process=config.NER_PROCESSES,
+                                                     batch_size=config.NER_BATCH_SIZE)
+        for r, entities, skills in zip(ok, entities_per_resume, extract_skills_batch(texts)):
+            r["entities"] = entities
+            r["skills"] = skills
+
+    return results
+
+
+async def collect_sources(files: List[UploadFile]) -> List[BatchSource]:
+    """
+    Flatten uploads into resume sources, expanding .zip archives
+
+    Raises:
+        ValueError: On unsupported files, oversized zip members or too
+            many resumes in total
+    """
+    max_bytes = config.BATCH_MAX_FILE_MB * 1024 * 1024
+    sources: List[BatchSource] = []
+
+    for upload in files:
+        name = upload.filename or ""
+        if name.lower().endswith('.zip'):
+            archive = await executor.run_io(zipfile.ZipFile, upload.file)
+            lock = threading.Lock()
+            for info in archive.infolist():
+                if info.is_dir() or not info.filename.lower().endswith(SUPPORTED_EXTENSIONS):
+                    continue
+                if info.file_size > max_bytes:
+                    raise ValueError(f"{info.filename} exceeds {config.BATCH_MAX_FILE_MB} MB")
+                sources.append(BatchSource(
+                    index=len(sources),
+                    filename=info.filename,
+                    read=_zip_reader(archive, info, lock)
+                ))
+        elif name.lower().endswith(SUPPORTED_EXTENSIONS):
+            if upload.size is not None and upload.size > max_bytes:
+                raise ValueError(f"{name} exceeds {config.BATCH_MAX_FILE_MB} MB")
+            sources.append(BatchSource(index=len(sources), filename=name, read=upload.read))
+        else:
+            raise ValueError(f"Unsupported file: {name}. Upload PDF, DOCX or ZIP files.")
+
+        if len(sources) > config.BATCH_MAX_FILES:
+            raise ValueError(f"Too many resumes in one batch (limit {config.BATCH_MAX_FILES})")
+
+    return sources
+
+
+def _zip_reader(archive: zipfile.ZipFile, info: zipfile.ZipInfo, lock: threading.Lock):
+    """Async reader for one member; the lock serialises access to the archive"""
+    def read_member() -> bytes:
+        with lock:
+            return archive.read(info)
+
+    async def read() -> bytes:
+        return await executor.run_io(read_member)
+
+    return read
+
+
+async def stream_batch(sources: List[BatchSource], include_analysis: bool) -> AsyncIterator[str]:
+    """
+    Run the batch and yield one NDJSON line per resume as it finishes,
+    then a summary line. Results arrive in completion order; use "index"
+    to match them to the upload.
+    """
+    start = time.perf_counter()
+    queue: asyncio.Queue = asyncio.Queue()
+    chunk_size = max(1, config.BATCH_CHUNK_SIZE)
+    chunks = [sources[i:i + chunk_size] for i in range(0, len(sources), chunk_size)]
+
+    # Two chunks per worker keeps every process busy while bounding
+    # how many files are held in memory at once
+    slots = asyncio.Semaphore(max(1, executor.cpu_workers) * 2)
+    # Gemini calls are bounded separately: a chunk finishing must not fan
+    # out into one upstream request per resume
+    llm_slots = asyncio.Semaphore(max(1, config.BATCH_LLM_CONCURRENCY))
+
+    async def finish(source: BatchSource, result: Dict[str, Any]) -> None:
+        item = BatchResumeResult(index=source.index, filename=source.filename, status="success")
+        try:
+            if result["error"] is not None:
+                raise ValueError(result["error"])
+            item.extracted_info = result["entities"]
+            item.skills = result["skills"]
+            if include_analysis:
+                async with llm_slots:
+                    item.analysis = await gemini_stage(result["text"], result["skills"], result["entities"])
+        except Exception as e:
+            item.status, item.error = "error", str(e)
+            ERRORS.inc(stage="batch")
+        item.processing_time = round(time.perf_counter() - start, 2)
+        await queue.put(item)
+
+    async def run_chunk(chunk: List[BatchSource]) -> None:
+        try:
+            async with slots:
+                payload = [(source.filename, await source.read()) for source in chunk]
+                results = await executor.run_cpu(analyze_batch_cpu, payload)
+        except Exception as e:
+            results = [{"error": f"Batch worker failed: {e}"} for _ in chunk]
+        await asyncio.gather(*(finish(source, result) for source, result in zip(chunk, results)))
+
+    tasks = [asyncio.create_task(run_chunk(chunk)) for chunk in chunks]
+    succeeded = 0
+    try:
+        for _ in range(len(sources)):
+            item = await queue.get()
+            succeeded += item.status == "success"
+            yield item.model_dump_json() + "\n"
+
+        yield json.dumps({
+            "status": "done",
+            "total": len(sources),
+            "succeeded": succeeded,
+            "failed": len(sources) - succeeded,
+            "processing_time": round(time.perf_counter() - start, 2)
+        }) + "\n"
+    finally:
+        # Client went away (or we're done): stop outstanding chunks, and
+        # wait for them so none is left pending when the loop closes
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
@@ -0,0 +1,284 @@
+"""
+Caching primitives for the resume pipeline
+
+- LRUCache:    in-process, bounded by entry count, optional TTL
+- SQLiteCache: on-disk, survives restarts, TTL + total-size eviction
+- ResultCache: two-tier cache of full /analyze-resume responses, keyed on
+               SHA-256 of the uploaded bytes plus the pipeline version
+- stage_caches: per-stage memoization (entities, skills, Gemini) keyed on
+               the extracted text / prompt, for re-exported files whose
+               bytes differ but whose text doesn't
+
+Every cache keeps hit/miss counters for diagnostics.
+"""
+
+import hashlib
+import unicodedata
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+from app import config
+
+
+class LRUCache:
+    """
+    Thread-safe least-recently-used cache
+
+    Args:
+        max_entries: Entries kept before the least recently used is evicted
+        ttl_seconds: Entry lifetime (None = no expiry)
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: Optional[float] = None):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._data: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: str) -> Any:
+        """Return the cached value, or None on a miss or expired entry"""
+        with self._lock:
+            item = self._data.get(key)
+            if item is not None:
+                value, expires_at = item
+                if expires_at is None or expires_at > time.monotonic():
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._data[key]
+            self.misses += 1
+            return None
+
+    def set(self, key: str, value: Any) -> None:
+        if self.max_entries <= 0:
+            return
+        expires_at = time.monotonic() + self.ttl_seconds if self.ttl_seconds else None
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "entries": len(self._data),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions
+        }
+
+
+class SQLiteCache:
+    """
+    On-disk cache in a single SQLite file
+
+    Blocking: call from a worker thread, not the event loop.
+
+    Args:
+        path: Database file
+        ttl_seconds: Entry lifetime
+        max_bytes: Total value size kept; least recently used go first
+    """
+
+    def __init__(self, path: str, ttl_seconds: float, max_bytes: int):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache ("
+            " key TEXT PRIMARY KEY,"
+            " value BLOB NOT NULL,"
+            " size INTEGER NOT NULL,"
+            " created_at REAL NOT NULL,"
+            " accessed_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS cache_accessed ON cache (accessed_at)")
+        self._conn.commit()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: str) -> Optional[bytes]:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, created_at FROM cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or row[1] + self.ttl_seconds < now:
+                self.misses += 1
+                return None
+            self._conn.execute("UPDATE cache SET accessed_at = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            self.hits += 1
+            return row[0]
+
+    def set(self, key: str, value: bytes) -> None:
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache (key, value, size, created_at, accessed_at)"
+                " VALUES (?, ?, ?, ?, ?)",
+                (key, value, len(value), now, now)
+            )
+            self._evict(now)
+            self._conn.commit()
+
+    def _evict(self, now: float) -> None:
+        """Drop expired entries, then least recently used until under max_bytes"""
+        expired = self._conn.execute(
+            "DELETE FROM cache WHERE created_at < ?", (now - self.ttl_seconds,)
+        ).rowcount
+        self.evictions += max(0, expired)
+
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM cache").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for key, size in self._conn.execute(
+            "SELECT key, size FROM cache ORDER BY accessed_at"
+        ).fetchall():
+            if total <= self.max_bytes:
+                break
+            self._conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+            total -= size
+            self.evictions += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            entries, total = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM cache"
+            ).fetchone()
+        return {
+            "entries": entries,
+            "bytes": total,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions
+        }
+
+
+class ResultCache:
+    """
+    Full-response cache: in-process LRU in front of an optional SQLite tier
+
+    Values are serialized JSON (bytes), so both tiers hold the same thing
+    and a disk hit can be promoted to memory as-is.
+
+    Args:
+        version: Pipeline/model version mixed into every key
+        memory: In-process tier
+        disk: Optional on-disk tier
+    """
+
+    def __init__(self, version: str, memory: LRUCache, disk: Optional[SQLiteCache] = None):
+        self.version = version
+        self.memory = memory
+        self.disk = disk
+
+    def key_for(self, digest: str) -> str:
+        """Cache key from the SHA-256 hex digest of the uploaded bytes"""
+        return f"{self.version}:{digest}"
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Look up memory, then disk (blocking when a disk tier is set)"""
+        value = self.memory.get(key)
+        if value is None and self.disk is not None:
+            value = self.disk.get(key)
+            if value is not None:
+                self.memory.set(key, value)
+        return value
+
+    def set(self, key: str, value: bytes) -> None:
+        self.memory.set(key, value)
+        if self.disk is not None:
+            self.disk.set(key, value)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "version": self.version,
+            "memory": self.memory.stats(),
+            "disk": self.disk.stats() if self.disk is not None else None
+        }
+
+
+def sha256_hex(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def text_hash(text: str) -> str:
+    """
+    Hash of normalised extracted text
+
+    Unicode NFC and collapsed spaces within each line, so re-exported PDFs
+    that only differ in layout spacing share a key. Line breaks are kept:
+    the chunker, section detection and the header name all read the text
+    line by line. Case is kept too: NER depends on it.
+    """
+    lines = [" ".join(line.split()) for line in unicodedata.normalize("NFC", text).splitlines()]
+    return sha256_hex("\n".join(lines).strip("\n").encode("utf-8"))
+
+
+def pipeline_version() -> str:
+    """
+    Version mixed into result-cache keys
+
+    Combines config.PIPELINE_VERSION (bumped by hand when models, prompt
+    or pipeline logic change) with a hash of the skills database, so
+    editing skills_db.json invalidates cached results automatically.
+    """
+    digest = hashlib.sha256(config.PIPELINE_VERSION.encode("utf-8"))
+    if config.PDF_LAYOUT:
+        # Layout mode changes the skills and adds sections to the response
+        digest.update(b"|pdf-layout")
+    if not config.SKILL_LEXICON:
+        digest.update(b"|no-lexicon")
+    if config.NER_FULL_PIPELINE:
+        digest.update(b"|ner-full")
+    if not config.NER_RULES:
+        digest.update(b"|no-ner-rules")
+    try:
+        with open(config.SKILLS_DB_PATH, "rb") as f:
+            digest.update(f.read())
+    except OSError:
+        pass
+    return digest.hexdigest()[:16]
+
+
+def _build_result_cache() -> ResultCache:
+    disk = None
+    if config.RESULT_CACHE_DB:
+        disk = SQLiteCache(
+            config.RESULT_CACHE_DB,
+            ttl_seconds=config.RESULT_CACHE_TTL_SECONDS,
+            max_bytes=config.RESULT_CACHE_DB_MAX_MB * 1024 * 1024
+        )
+    return ResultCache(
+        version=pipeline_version(),
+        memory=LRUCache(config.RESULT_CACHE_ENTRIES, ttl_seconds=config.RESULT_CACHE_TTL_SECONDS),
+        disk=disk
+    )
+
+
+# Shared instances used by the FastAPI app
+result_cache = _build_result_cache()
+
+# Per-stage caches, each with its own eviction policy:
+# - entities/skills are deterministic for a given text: LRU, no expiry
+# - gemini output is sampled (temperature > 0): LRU with a TTL so
+#   repeated resumes still get fresh advice eventually
+stage_caches: Dict[str, LRUCache] = {
+    "entities": LRUCache(config.STAGE_CACHE_ENTRIES),
+    "skills": LRUCache(config.STAGE_CACHE_ENTRIES),
+    "gemini": LRUCache(config.GEMINI_CACHE_ENTRIES, ttl_seconds=config.GEMINI_CACHE_TTL_SECONDS)
+}
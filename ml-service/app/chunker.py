@@ -0,0 +1,227 @@
+"""
+Section-aware resume chunking for skill matching
+
+Every chunk returned here is embedded by Sentence-BERT, and encoding cost
+is linear in the number of chunks. Splitting on every newline and ". "
+sends SBERT the name and address, date lines, repeated bullets and
+half-sentences broken by PDF line wrapping. chunk_resume() instead:
+
+1. Detects section headings and drops sections that never hold skills
+   (the contact header before the first heading, education)
+2. Merges wrapped lines back into one chunk per bullet / paragraph
+   (lines in the skills section stay separate: one category per line)
+3. Drops junk: lines that are only contact details, URLs or dates, and
+   chunks with fewer than MIN_WORDS words once those are removed (skills
+   section lines are exempt from the word and length minimums: a line
+   there is often a single skill such as "Go" or "SQL")
+4. Removes duplicate chunks (case and whitespace insensitive)
+5. Caps the chunk count, keeping the most skill-dense sections first
+
+The result says how many chunks were dropped and why.
+"""
+
+import re
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from app import config
+from app.layout import SKILL_SECTIONS, classify_heading
+
+
+# Chunks outside this length range are not embedded
+MIN_CHUNK_CHARS = 10
+MAX_CHUNK_CHARS = 500
+
+# Wrapped lines are merged until a chunk reaches this length
+MERGE_CHARS = 300
+
+# Lines before the first heading are the contact header only if there are
+# few of them; otherwise the resume simply has no recognisable headings
+MAX_HEADER_LINES = 8
+
+# When over the cap, chunks are kept in this section order
+SECTION_PRIORITY = ("skills", "experience", "projects", "summary", "certifications", "achievements", "other")
+
+_BULLET = re.compile(r"^(?:[-–—•●○◦▪■□►▸*·]|\d{1,2}[.)])\s*")
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+
+# Removed before judging whether a line has enough words to embed
+_NOISE = re.compile(
+    r"[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}"                       # email
+    r"|(?:https?://|www\.)\S+|\b[\w-]+\.(?:com|in|io|dev|me|org)/\S*"        # URL
+    r"|\+?\d[\d\s\-().]{6,}\d"                                               # phone / ids
+    r"|\b(?:jan|feb|mar|apr|may|jun|jul|aug|sep|sept|oct|nov|dec)[a-z]*\.?\b"  # months
+    r"|\b(?:present|current|till date)\b|\b\d{4}\b",
+    re.IGNORECASE
+)
+_WORD = re.compile(r"[A-Za-z][A-Za-z+#.]*")
+
+# Chunks need this many words left once contact details and dates are removed
+MIN_WORDS = 2
+
+
+@dataclass
+class Chunks:
+    """
+    Chunks to embed, and how many candidate chunks were dropped
+
+    dropped counts by reason: "section" (header/education), "junk",
+    "length", "duplicate" and "cap".
+    """
+    chunks: List[str]
+    sections: List[str] = field(default_factory=list)  # section kind of each chunk
+    dropped: Dict[str, int] = field(default_factory=dict)
+
+    @property
+    def dropped_total(self) -> int:
+        return sum(self.dropped.values())
+
+
+def _word_count(line: str) -> int:
+    """Words left once contact details, URLs and dates are removed"""
+    return len(_WORD.findall(_NOISE.sub(" ", line)))
+
+
+def _split_long(chunk: str) -> List[str]:
+    """Split an over-long paragraph at sentence ends into pieces <= MAX_CHUNK_CHARS"""
+    if len(chunk) < MAX_CHUNK_CHARS:
+        return [chunk]
+    pieces, current = [], ""
+    for sentence in _SENTENCE_END.split(chunk):
+        if current and len(current) + len(sentence) + 1 > MERGE_CHARS:
+            pieces.append(current)
+            current = sentence
+        else:
+            current = f"{current} {sentence}".strip()
+    if current:
+        pieces.append(current)
+    return pieces
+
+
+def _sectioned_lines(text: str) -> List[Tuple[str, Optional[str]]]:
+    """
+    (section kind, line) for every line; None lines mark paragraph breaks
+
+    Heading lines are consumed (text after "Skills:" is kept as a line).
+    """
+    lines = text.splitlines()
+    first_heading = next(
+        (i for i, line in enumerate(lines) if classify_heading(line.partition(":")[0].strip())),
+        None
+    )
+    leading = lines[:first_heading] if first_heading is not None else lines
+    header_lines = sum(1 for line in leading if line.strip())
+    kind = "header" if first_heading is not None and header_lines <= MAX_HEADER_LINES else "other"
+
+    out: List[Tuple[str, Optional[str]]] = []
+    for line in lines:
+        stripped = line.strip()
+        title, colon, inline = stripped.partition(":")
+        heading = classify_heading(title.strip())
+        if heading is not None:
+            kind = heading
+            out.append((kind, None))
+            stripped = inline.strip() if colon else ""
+            if not stripped:
+                continue
+        out.append((kind, stripped or None))
+    return out
+
+
+def select_sections(text: str, kinds: Iterable[str]) -> str:
+    """
+    The lines of text that belong to sections of the given kinds
+
+    Uses the same heading detection as chunk_resume; heading lines
+    themselves are left out. Text without recognisable headings is all
+    "other" (plus "header" for a short block before the first heading).
+    """
+    wanted = set(kinds)
+    lines = []
+    for kind, line in _sectioned_lines(text):
+        if kind in wanted:
+            lines.append(line or "")
+    return "\n".join(lines).strip()
+
+
+def chunk_resume(text: str, max_chunks: Optional[int] = None) -> Chunks:
+    """
+    Split resume text into the chunks worth embedding
+
+    Args:
+        text: Resume text (newlines preserved)
+        max_chunks: Cap on the number of chunks (default ML_SKILL_MAX_CHUNKS; 0 = no cap)
+
+    Returns:
+        Chunks in document order, with drop counts by reason
+    """
+    max_chunks = config.SKILL_MAX_CHUNKS if max_chunks is None else max_chunks
+    dropped: Dict[str, int] = {}
+
+    def drop(reason: str, count: int = 1) -> None:
+        dropped[reason] = dropped.get(reason, 0) + count
+
+    # 1-2. Sections, and wrapped lines merged into bullet/paragraph chunks
+    candidates: List[Tuple[str, str]] = []
+    current: List[str] = []
+    current_kind = "other"
+
+    def flush() -> None:
+        if current:
+            candidates.append((current_kind, " ".join(current)))
+            current.clear()
+
+    for kind, line in _sectioned_lines(text):
+        if line is None or kind != current_kind:
+            flush()
+            current_kind = kind
+            if line is None:
+                continue
+        if kind not in SKILL_SECTIONS:
+            drop("section")
+            continue
+        if _word_count(line) == 0:
+            # Nothing but contact details / dates / numbers: don't merge it in
+            drop("junk")
+            continue
+        bullet = _BULLET.match(line)
+        if bullet:
+            line = line[bullet.end():]
+        joined = len(" ".join(current)) + len(line)
+        if bullet or kind == "skills" or joined > MERGE_CHARS or (current and current[-1].endswith((".", "!", "?"))):
+            flush()
+        current.append(line)
+    flush()
+
+    # 3-4. Length bounds, junk and de-duplication
+    seen = set()
+    kept: List[Tuple[str, str]] = []
+    for kind, chunk in candidates:
+        for piece in _split_long(chunk):
+            listed = kind == "skills"
+            if len(piece) >= MAX_CHUNK_CHARS or (len(piece) <= MIN_CHUNK_CHARS and not listed):
+                drop("length")
+                continue
+            if _word_count(piece) < MIN_WORDS and not listed:
+                drop("junk")
+                continue
+            key = " ".join(piece.lower().split())
+            if key in seen:
+                drop("duplicate")
+                continue
+            seen.add(key)
+            kept.append((kind, piece))
+
+    # 5. Cap: keep the most skill-dense sections, then restore document order
+    if max_chunks and len(kept) > max_chunks:
+        rank = {kind: i for i, kind in enumerate(SECTION_PRIORITY)}
+        order = sorted(range(len(kept)), key=lambda i: (rank.get(kept[i][0], len(rank)), i))
+        keep = sorted(order[:max_chunks])
+        drop("cap", len(kept) - max_chunks)
+        kept = [kept[i] for i in keep]
+
+    return Chunks(
+        chunks=[chunk for _, chunk in kept],
+        sections=[kind for kind, _ in kept],
+        dropped=dropped
+    )
@@ -0,0 +1,161 @@
+"""
+Service configuration
+All tunables are read once from environment variables (or .env)
+"""
+
+import os
+import time
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Reference point for the tracked startup time (config is imported first)
+PROCESS_STARTED = time.perf_counter()
+
+
+def _env_int(name: str, default: int) -> int:
+    """Read an integer setting, falling back to the default when unset or invalid"""
+    value = os.getenv(name)
+    if value is None or value.strip() == "":
+        return default
+    try:
+        return int(value)
+    except ValueError:
+        return default
+
+
+def _env_float(name: str, default: float) -> float:
+    """Read a float setting, falling back to the default when unset or invalid"""
+    value = os.getenv(name)
+    if value is None or value.strip() == "":
+        return default
+    try:
+        return float(value)
+    except ValueError:
+        return default
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    """Read a boolean setting ("1", "true", "yes", "on" are true)"""
+    value = os.getenv(name)
+    if value is None or value.strip() == "":
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+# Fast-start: skip the background warm-up; models load on first use
+FAST_START = _env_bool("ML_FAST_START", False)
+
+# Executor layer (see app/executors.py)
+# CPU_WORKERS = 0 runs the CPU stages in the thread pool instead of processes
+CPU_WORKERS = _env_int("ML_CPU_WORKERS", 2)
+IO_WORKERS = _env_int("ML_IO_WORKERS", 8)
+# Requests admitted at once (running + waiting); beyond this we answer 503
+MAX_PENDING_REQUESTS = _env_int("ML_MAX_PENDING_REQUESTS", 16)
+# Seconds clients are told to wait before retrying a rejected request
+RETRY_AFTER_SECONDS = _env_int("ML_RETRY_AFTER_SECONDS", 5)
+
+# Skill taxonomy; the embedding cache (.npy) is written next to it
+SKILLS_DB_PATH = os.getenv("ML_SKILLS_DB_PATH", "skills_db.json")
+
+# Skill nearest-neighbour index (see app/skill_index.py)
+# "auto" uses an exact scan for small vocabularies and IVF for large ones
+SKILL_INDEX_BACKEND = os.getenv("ML_SKILL_INDEX", "auto")
+SKILL_INDEX_NPROBE = _env_int("ML_SKILL_INDEX_NPROBE", 8)
+# Lowest recall@10 an approximate index may serve with; below it IVF probes
+# more clusters, then the exact scan is used instead
+SKILL_INDEX_MIN_RECALL = _env_float("ML_SKILL_INDEX_MIN_RECALL", 0.95)
+# Most resume chunks embedded per resume (see app/chunker.py; 0 = no cap)
+SKILL_MAX_CHUNKS = _env_int("ML_SKILL_MAX_CHUNKS", 64)
+# Exact-match lexicon tier before SBERT (see app/skill_lexicon.py)
+SKILL_LEXICON = _env_bool("ML_SKILL_LEXICON", True)
+
+# Uploads: largest resume accepted, and where uploads are spooled
+# (empty = system temp dir). Larger requests are rejected with 413.
+MAX_UPLOAD_MB = _env_int("ML_MAX_UPLOAD_MB", 10)
+UPLOAD_TMP_DIR = os.getenv("ML_UPLOAD_TMP_DIR", "")
+
+# PDF extraction (see app/parsers.py): pages read at most, and pages per
+# worker task - longer PDFs are split into ranges extracted in parallel
+PDF_MAX_PAGES = _env_int("ML_PDF_MAX_PAGES", 50)
+PDF_CHUNK_PAGES = _env_int("ML_PDF_CHUNK_PAGES", 8)
+# Layout mode (see app/layout.py): split PDFs into typed sections and
+# match skills only in the relevant ones (skills, experience, projects, ...)
+PDF_LAYOUT = _env_bool("ML_PDF_LAYOUT", False)
+
+# spaCy NER (see app/ner_extractor.py): trimmed pipeline on the relevant
+# sections by default; FULL = every component on the whole text
+NER_FULL_PIPELINE = _env_bool("ML_NER_FULL_PIPELINE", False)
+NER_MAX_CHARS = _env_int("ML_NER_MAX_CHARS", 20000)
+# Rule layer before NER (see app/entity_rules.py): EntityRuler from the
+# gazetteer; the model is skipped when the rules are confident
+NER_RULES = _env_bool("ML_NER_RULES", True)
+ENTITY_GAZETTEER_PATH = os.getenv("ML_ENTITY_GAZETTEER_PATH", "entity_gazetteer.json")
+# Batches of resumes (see ner_extractor.iter_entities): documents per
+# nlp.pipe batch, and spaCy processes. Keep 1 in the service - batch
+# chunks already run on ML_CPU_WORKERS processes; raise it for offline jobs
+NER_BATCH_SIZE = _env_int("ML_NER_BATCH_SIZE", 32)
+NER_PROCESSES = _env_int("ML_NER_PROCESSES", 1)
+
+# Seconds a /health/deep result is reused before probing the models again
+HEALTH_DEEP_CACHE_SECONDS = _env_int("ML_HEALTH_DEEP_CACHE_SECONDS", 60)
+
+# Full-response cache for /analyze-resume (see app/cache.py)
+# Bump PIPELINE_VERSION whenever models, the prompt or pipeline logic change
+PIPELINE_VERSION = os.getenv("ML_PIPELINE_VERSION", "spacy-sm-3.7|minilm-l3-v2|gemini-2.5-flash-lite|9")
+RESULT_CACHE_ENTRIES = _env_int("ML_RESULT_CACHE_ENTRIES", 256)
+RESULT_CACHE_TTL_SECONDS = _env_int("ML_RESULT_CACHE_TTL_SECONDS", 7 * 24 * 3600)
+# SQLite file for the on-disk tier (empty = memory only)
+RESULT_CACHE_DB = os.getenv("ML_RESULT_CACHE_DB", "")
+RESULT_CACHE_DB_MAX_MB = _env_int("ML_RESULT_CACHE_DB_MAX_MB", 256)
+
+# Per-stage caches keyed on extracted text / prompt (see app/cache.py)
+STAGE_CACHE_ENTRIES = _env_int("ML_STAGE_CACHE_ENTRIES", 1024)
+GEMINI_CACHE_ENTRIES = _env_int("ML_GEMINI_CACHE_ENTRIES", 512)
+GEMINI_CACHE_TTL_SECONDS = _env_int("ML_GEMINI_CACHE_TTL_SECONDS", 24 * 3600)
+
+# Batch endpoint (see app/batch.py)
+BATCH_MAX_FILES = _env_int("ML_BATCH_MAX_FILES", 1000)
+# Resumes per CPU task: parsed, NER'd (nlp.pipe) and encoded together
+BATCH_CHUNK_SIZE = _env_int("ML_BATCH_CHUNK_SIZE", 16)
+# Largest single resume accepted inside a batch / zip (zip-bomb guard)
+BATCH_MAX_FILE_MB = _env_int("ML_BATCH_MAX_FILE_MB", 10)
+# Whole batch request body (all files / zips together)
+BATCH_MAX_UPLOAD_MB = _env_int("ML_BATCH_MAX_UPLOAD_MB", 500)
+# Gemini calls in flight per batch; more just earns 429s and trips the
+# breaker shared with every other endpoint
+BATCH_LLM_CONCURRENCY = _env_int("ML_BATCH_LLM_CONCURRENCY", 4)
+
+# Gemini client (see app/gemini_client.py)
+GEMINI_MODEL = os.getenv("ML_GEMINI_MODEL", "gemini-2.5-flash-lite")
+# Per-attempt timeout and overall deadline (retries included), in seconds
+GEMINI_TIMEOUT_SECONDS = _env_float("ML_GEMINI_TIMEOUT_SECONDS", 20.0)
+GEMINI_DEADLINE_SECONDS = _env_float("ML_GEMINI_DEADLINE_SECONDS", 30.0)
+GEMINI_MAX_RETRIES = _env_int("ML_GEMINI_MAX_RETRIES", 2)
+GEMINI_BACKOFF_SECONDS = _env_float("ML_GEMINI_BACKOFF_SECONDS", 0.5)
+# Send a duplicate request if the first hasn't answered by then (0 = off)
+GEMINI_HEDGE_AFTER_SECONDS = _env_float("ML_GEMINI_HEDGE_AFTER_SECONDS", 0.0)
+# Consecutive failures before failing fast, and for how long
+GEMINI_BREAKER_FAILURES = _env_int("ML_GEMINI_BREAKER_FAILURES", 5)
+GEMINI_BREAKER_COOLDOWN_SECONDS = _env_float("ML_GEMINI_BREAKER_COOLDOWN_SECONDS", 30.0)
+
+# LLM backend: "gemini", or "mock" for offline benchmarks (see app/llm_backends.py)
+LLM_BACKEND = os.getenv("ML_LLM_BACKEND", "gemini").strip().lower()
+MOCK_LLM_LATENCY_MS = _env_float("ML_MOCK_LLM_LATENCY_MS", 800.0)
+# fixed | uniform | lognormal; JITTER is ±fraction (uniform) or sigma (lognormal)
+MOCK_LLM_LATENCY_DIST = os.getenv("ML_MOCK_LLM_LATENCY_DIST", "lognormal").strip().lower()
+MOCK_LLM_JITTER = _env_float("ML_MOCK_LLM_JITTER", 0.5)
+# Fraction of mock calls failing with 429/503 (exercises retries and the breaker)
+MOCK_LLM_ERROR_RATE = _env_float("ML_MOCK_LLM_ERROR_RATE", 0.0)
+MOCK_LLM_SEED = _env_int("ML_MOCK_LLM_SEED", 0)
+
+# Logging (see app/logging_config.py)
+LOG_LEVEL = os.getenv("ML_LOG_LEVEL", "INFO")
+# Per-stage overrides, e.g. "ner=DEBUG,skills=DEBUG,gemini=WARNING"
+LOG_STAGE_LEVELS = os.getenv("ML_LOG_LEVELS", "")
+# Fraction of requests whose INFO/DEBUG lines are kept (warnings always are)
+LOG_SAMPLE_RATE = _env_float("ML_LOG_SAMPLE_RATE", 1.0)
+# json (one object per line) or text
+LOG_FORMAT = os.getenv("ML_LOG_FORMAT", "json").strip().lower()
+# Records buffered for the writer thread; beyond this they are dropped
+LOG_QUEUE_SIZE = _env_int("ML_LOG_QUEUE_SIZE", 10000)
@@ -0,0 +1,138 @@
+"""
+Contact details in one pass: email, phone, LinkedIn and GitHub
+
+All four fields are alternatives of a single precompiled pattern, so the
+text is scanned once, left to right, and the scan stops as soon as every
+field has its first match (usually within the header). Each alternative
+is guarded against the inputs that make naive patterns slow:
+
+- A lookbehind stops matches from starting inside a word, so a long run
+  of letters/digits is tried once, not from every position in it; a
+  lookahead on the first character picks the one alternative to try
+- Quantifiers are bounded (RFC lengths for email, E.164's 15 digits for
+  phones), so a failed attempt never backtracks far
+
+Phones accept international formats ("+44 20 7946 0958",
+"+1 (415) 555-2671", "+91-98765 43210", "098765 43210") and are checked
+by digit count. Dates are kept out: a number never starts with a year
+group, a match stops before a separator followed by a year ("9876543210
+2021" gives "9876543210"), and anything left with a year group in it
+("2019 - 2022", "01.2019") is rejected.
+contact_benchmark.py times this against the old findall-based version.
+"""
+
+import re
+from dataclasses import dataclass
+from typing import Optional
+
+
+# Digits in a phone number: local numbers without a country code, and E.164
+MIN_PHONE_DIGITS = 10
+MIN_INTERNATIONAL_DIGITS = 8
+MAX_PHONE_DIGITS = 15
+
+_CONTACT = re.compile(
+    r"""
+    # Nothing starts inside a word: one cheap check rejects most positions
+    (?<![A-Za-z0-9_])
+    (?:
+        # Phones start with + ( or a digit
+        (?=[+(0-9])
+        (?P<phone>
+            (?<!\+)
+            (?!(?:19|20)\d\d[ .\-])
+            (?:\+\d{1,3}[ .\-]?)?
+            (?:\(\d{1,5}\)[ .\-]?)?
+            # A separator ends the number if a year-like group follows it
+            \d(?:\d|[ .\-](?![ .\-]*(?:19|20)\d\d(?!\d))){4,20}\d
+            (?![\d@])
+        )
+        # URLs with or without scheme / www.
+        | (?=[hlgwHLGW])
+        (?:
+            (?P<linkedin>
+                (?<![./])
+                (?:https?://)?(?:[a-z]{2,3}\.)?[Ll]inked[Ii]n\.com/(?:in|pub)/
+                (?P<linkedin_handle>[A-Za-z0-9\-_%]{2,100})
+            )
+            | (?P<github>
+                (?<![./])
+                (?:https?://)?(?:www\.)?[Gg]it[Hh]ub\.com/
+                (?P<github_handle>[A-Za-z0-9](?:[A-Za-z0-9]|-(?=[A-Za-z0-9])){0,38})
+                (?![A-Za-z0-9\-])
+            )
+        )
+        # Emails; the possessive local part never backtracks
+        | (?P<email>
+            (?<![.%+\-])
+            [A-Za-z0-9._%+\-]{1,64}+
+            @[A-Za-z0-9\-]{1,63}(?:\.[A-Za-z0-9\-]{1,63}){0,8}\.[A-Za-z]{2,24}
+            (?![A-Za-z0-9\-])
+        )
+    )
+    """,
+    re.VERBOSE,
+)
+
+_DIGIT = re.compile(r"\d")
+_YEAR = re.compile(r"(?:19|20)\d\d")
+_SEPARATORS = re.compile(r"[ .\-]+")
+
+FIELDS = ("email", "phone", "linkedin", "github")
+
+
+@dataclass
+class Contact:
+    """First email, phone, LinkedIn and GitHub URL in a resume (None if absent)"""
+    email: Optional[str] = None
+    phone: Optional[str] = None
+    linkedin: Optional[str] = None
+    github: Optional[str] = None
+
+
+def _phone(raw: str) -> Optional[str]:
+    """The number as written, if it has a plausible digit count"""
+    digits = len(_DIGIT.findall(raw))
+    minimum = MIN_INTERNATIONAL_DIGITS if raw.startswith("+") else MIN_PHONE_DIGITS
+    if not minimum <= digits <= MAX_PHONE_DIGITS:
+        return None
+    # "2018 - 2022" / "01.2019": a year group means a date, not a number
+    groups = _SEPARATORS.split(raw.strip("()"))
+    if any(_YEAR.fullmatch(group) for group in groups):
+        return None
+    return raw.strip(" .-")
+
+
+def scan_contact(text: str) -> Contact:
+    """
+    Find contact details in one pass over text
+
+    Args:
+        text: Full resume text
+
+    Returns:
+        Contact with the first match per field; URLs are normalized to
+        https://www.linkedin.com/in/<handle> and https://github.com/<user>
+    """
+    contact = Contact()
+    missing = set(FIELDS)
+    for match in _CONTACT.finditer(text):
+        field = match.lastgroup
+        if field not in missing:
+            continue
+
+        if field == "email":
+            value = match.group("email")
+        elif field == "phone":
+            value = _phone(match.group("phone"))
+        elif field == "linkedin":
+            value = f"https://www.linkedin.com/in/{match.group('linkedin_handle').rstrip('.-_')}"
+        else:
+            value = f"https://github.com/{match.group('github_handle')}"
+
+        if value:
+            setattr(contact, field, value)
+            missing.discard(field)
+            if not missing:
+                break
+    return contact
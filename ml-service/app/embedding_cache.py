@@ -0,0 +1,98 @@
+"""
+Persisted skill-embedding cache
+Saves the encoded skill DB as a .npy file next to skills_db.json
+
+The file name carries a hash of the model name and the skill list, so
+the cache is rebuilt only when either changes. Loading uses a read-only
+memory map: every worker process maps the same file and the OS keeps a
+single copy in the page cache.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+from typing import Callable, List
+
+import numpy as np
+
+from app.logging_config import get_logger
+
+
+log = get_logger("skills")
+
+CACHE_PREFIX = "skills_embeddings."
+
+
+def cache_key(model_name: str, skills: List[str]) -> str:
+    """
+    Version key for a model + skill list pair
+
+    Args:
+        model_name: Sentence-BERT model identifier
+        skills: Skill strings in index order
+
+    Returns:
+        Hex SHA-256 digest
+    """
+    payload = json.dumps({"model": model_name, "skills": skills}, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def load_or_build_embeddings(model_name: str, skills: List[str], cache_dir: str,
+                             encode: Callable[[List[str]], np.ndarray]) -> np.ndarray:
+    """
+    Return skill embeddings, encoding them only on a cache miss
+
+    Args:
+        model_name: Sentence-BERT model identifier (part of the cache key)
+        skills: Skill strings in index order
+        cache_dir: Directory holding the .npy files (next to skills_db.json)
+        encode: Called with the skill list on a miss; must return
+            normalised float32 embeddings
+
+    Returns:
+        Read-only memory-mapped array [skills, dim]
+    """
+    path = os.path.join(cache_dir, f"{CACHE_PREFIX}{cache_key(model_name, skills)[:16]}.npy")
+
+    if os.path.exists(path):
+        try:
+            embeddings = np.load(path, mmap_mode="r")
+            if embeddings.shape[0] == len(skills):
+                log.info("Loaded cached skill embeddings", extra={"fields": {"file": os.path.basename(path)}})
+                return embeddings
+        except (OSError, ValueError):
+            pass  # Truncated or corrupt file: rebuild below
+        log.warning("Skill embedding cache unreadable, rebuilding", extra={"fields": {"file": os.path.basename(path)}})
+
+    log.info("Computing skill embeddings", extra={"fields": {"skills": len(skills)}})
+    embeddings = np.ascontiguousarray(encode(skills), dtype=np.float32)
+
+    # Write to a temp file and rename, so concurrent workers never see a
+    # half-written cache; the last writer wins with identical content
+    fd, tmp_path = tempfile.mkstemp(dir=cache_dir, prefix=CACHE_PREFIX, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            np.save(f, embeddings)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        # Read-only filesystem etc.: serve from memory this time
+        log.warning("Could not persist skill embeddings", extra={"fields": {"error": str(e)}})
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        return embeddings
+
+    _remove_stale(cache_dir, keep=path)
+    return np.load(path, mmap_mode="r")
+
+
+def _remove_stale(cache_dir: str, keep: str) -> None:
+    """Delete cache files written for older model/skill versions"""
+    for name in os.listdir(cache_dir):
+        full = os.path.join(cache_dir, name)
+        if name.startswith(CACHE_PREFIX) and name.endswith(".npy") and full != keep:
+            try:
+                os.remove(full)
+            except OSError:
+                pass
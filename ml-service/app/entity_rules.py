@@ -0,0 +1,218 @@
+"""
+Rule-based entities for resumes: an EntityRuler that runs before NER
+
+Resumes are predictable: the name is the first line, employers and
+colleges come from a fairly small set, dates look like "Jan 2021" or
+"2019 - 2022". A spaCy EntityRuler compiled from gazetteers
+(entity_gazetteer.json) and token patterns labels those spans before the
+statistical model runs:
+
+- ORG: known companies and colleges, "<Name> Technologies/Labs/Pvt Ltd",
+  "University of <Name>", "IIT/NIT/BITS <Campus>"
+- GPE: known cities, states and countries
+- DATE: month-year and year ranges
+- SKILL: skill names from skills_db.json, so NER can't label "React" an
+  ORG or "GitHub" a place (extract_entities ignores this label)
+
+When the rules alone already give a name, an employer, a place and a
+date, and every dated entry line (a job or degree) has its date and its
+employer/college labelled, extract_entities skips the statistical model
+(rules_confident). Anything less and the model runs.
+All pattern and filter sets are built once, when spaCy loads.
+"""
+
+import json
+import re
+from bisect import bisect_right
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, FrozenSet, List, Optional, Set
+
+from app import config
+from app.layout import SECTION_HEADINGS
+from app.skill_lexicon import ALIASES, AMBIGUOUS
+
+
+RULER_NAME = "resume_rules"
+
+_MONTHS = ["jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "sept", "oct", "nov", "dec",
+           "january", "february", "march", "april", "june", "july", "august", "september", "october",
+           "november", "december"]
+_RANGE = ["-", "–", "—", "to", "till"]
+_ONGOING = ["present", "current", "now", "date"]
+_ORG_SUFFIXES = ["technologies", "technology", "solutions", "labs", "systems", "software", "services",
+                 "consulting", "consultancy", "pvt", "ltd", "limited", "inc", "llc", "llp", "corporation",
+                 "corp", "infotech", "networks", "analytics", "ventures"]
+_SCHOOL_WORDS = ["university", "college", "institute", "school", "academy", "vidyalaya", "vidyapeetham"]
+
+# Words that never appear in a person's name on a resume header
+NAME_STOPWORDS = frozenset({
+    "resume", "curriculum", "vitae", "cv", "profile", "portfolio", "contact", "email", "phone", "mobile",
+    "address", "linkedin", "github", "engineer", "developer", "designer", "manager", "analyst", "intern",
+    "student", "scientist", "consultant", "architect", "lead", "senior", "junior", "software", "full",
+    "stack", "data", "web", "university", "college", "institute", "school",
+})
+
+_NAME_TOKEN = re.compile(r"^[A-Z][a-zA-Z'\-]*\.?$")
+
+# Lines of the header searched for the candidate's name
+HEADER_LINES = 4
+
+# An entry's employer/college may sit on its dated line or this many lines above
+# ("Acme Technologies / Software Engineer / Jan 2020 - Present")
+ENTRY_LINES = 2
+
+# A line with a year on it is an experience/education entry line
+_YEAR = re.compile(r"(?<!\d)(?:19|20)\d\d(?!\d)")
+
+
+@dataclass(frozen=True)
+class ResumeRules:
+    """Gazetteers and exclusion sets, loaded once per process"""
+    companies: FrozenSet[str]
+    colleges: FrozenSet[str]
+    locations: FrozenSet[str]
+    # Lowercase skill names and aliases: never an ORG, place or person
+    tech_terms: FrozenSet[str]
+    # Lowercase section headings ("work experience", "skills", ...)
+    headings: FrozenSet[str]
+
+
+def _read_json(path: str, default):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return default
+
+
+@lru_cache(maxsize=1)
+def resume_rules() -> ResumeRules:
+    """Load the gazetteers and skill names (cached for the process)"""
+    gazetteer: Dict[str, List[str]] = _read_json(config.ENTITY_GAZETTEER_PATH, {})
+    skills: List[str] = _read_json(config.SKILLS_DB_PATH, [])
+    tech_terms = {name.lower() for name in skills}
+    tech_terms |= {alias for name, aliases in ALIASES.items() for alias in aliases}
+    tech_terms |= {"linkedin", "github", "tailwindcss", "nodejs", "reactjs", "html", "css", "js", "api",
+                   "sql", "aws", "gcp", "node", "react"}
+    return ResumeRules(
+        companies=frozenset(gazetteer.get("companies", [])),
+        colleges=frozenset(gazetteer.get("colleges", [])),
+        locations=frozenset(gazetteer.get("locations", [])),
+        tech_terms=frozenset(tech_terms),
+        headings=frozenset(phrase for phrases in SECTION_HEADINGS.values() for phrase in phrases)
+    )
+
+
+def build_patterns(nlp, rules: ResumeRules) -> List[dict]:
+    """EntityRuler patterns: gazetteer phrases, then token patterns"""
+    patterns: List[dict] = []
+    patterns += [{"label": "ORG", "pattern": name} for name in sorted(rules.companies | rules.colleges)]
+    patterns += [{"label": "GPE", "pattern": name} for name in sorted(rules.locations)]
+
+    # Skill names, matched case-insensitively token by token
+    for term in sorted(rules.tech_terms - AMBIGUOUS):
+        tokens = [t.lower_ for t in nlp.make_doc(term)]
+        if tokens:
+            patterns.append({"label": "SKILL", "pattern": [{"LOWER": t} for t in tokens]})
+
+    title = {"IS_TITLE": True}
+    patterns += [
+        # Acme Technologies / Foo Labs Pvt Ltd
+        {"label": "ORG", "pattern": [dict(title, OP="+"), {"LOWER": {"IN": _ORG_SUFFIXES}},
+                                     {"LOWER": {"IN": _ORG_SUFFIXES}, "OP": "*"}]},
+        # Stanford University / RV College of Engineering
+        {"label": "ORG", "pattern": [dict(title, OP="+"), {"LOWER": {"IN": _SCHOOL_WORDS}},
+                                     {"LOWER": "of", "OP": "?"}, dict(title, OP="*")]},
+        # University of Mumbai
+        {"label": "ORG", "pattern": [{"LOWER": {"IN": _SCHOOL_WORDS}}, {"LOWER": "of"}, dict(title, OP="+")]},
+        # IIT Bombay / NIT Trichy / BITS Pilani
+        {"label": "ORG", "pattern": [{"ORTH": {"IN": ["IIT", "NIT", "IIIT", "BITS", "IIM"]}}, title]},
+        # Jan 2021 / September, 2019
+        {"label": "DATE", "pattern": [{"LOWER": {"IN": _MONTHS}}, {"ORTH": {"IN": [",", "'"]}, "OP": "?"},
+                                      {"SHAPE": {"IN": ["dddd", "dd"]}}]},
+        # 2019 - 2022 / 2021 - Present
+        {"label": "DATE", "pattern": [{"SHAPE": "dddd"}, {"LOWER": {"IN": _RANGE}},
+                                      {"LOWER": {"IN": _MONTHS}, "OP": "?"},
+                                      {"SHAPE": "dddd"}]},
+        {"label": "DATE", "pattern": [{"SHAPE": "dddd"}, {"LOWER": {"IN": _RANGE}},
+                                      {"LOWER": {"IN": _ONGOING}}]},
+    ]
+    return patterns
+
+
+def add_entity_ruler(nlp) -> None:
+    """Add the resume rules to a loaded pipeline, before "ner" (once)"""
+    if RULER_NAME in nlp.pipe_names:
+        return
+    where = {"before": "ner"} if "ner" in nlp.pipe_names else {}
+    ruler = nlp.add_pipe("entity_ruler", name=RULER_NAME, config={"overwrite_ents": True, "validate": False}, **where)
+    ruler.add_patterns(build_patterns(nlp, resume_rules()))
+
+
+def header_name(text: str) -> Optional[str]:
+    """
+    The candidate's name from the first lines of the resume
+
+    A line of 2-4 capitalised words ("Priya Sharma", "ROHAN K. IYER")
+    that isn't a heading, a job title, a skill, a known place or a
+    company (known, or named like "Acme Technologies").
+    """
+    rules = resume_rules()
+    seen = 0
+    for line in text.splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        seen += 1
+        if seen > HEADER_LINES:
+            break
+        words = line.split()
+        if not 2 <= len(words) <= 4 or not all(_NAME_TOKEN.match(w) or w.isupper() for w in words):
+            continue
+        lowered = line.lower()
+        bare = {w.lower().strip(".,") for w in words}
+        if (bare & NAME_STOPWORDS or bare.intersection(_ORG_SUFFIXES) or lowered in rules.headings
+                or lowered in rules.tech_terms or line in rules.locations or line in rules.companies
+                or any(w.strip(",") in rules.locations for w in words)):
+            continue
+        return line.title() if line.isupper() else line
+    return None
+
+
+def rules_confident(doc, text: str) -> bool:
+    """
+    Whether the rule-only Doc is enough to skip the statistical model
+
+    True when the header gives a name, the rules found at least one
+    employer/college, one place and one date, and they cover every entry:
+    each line with a year on it has a DATE on that line and an ORG on it
+    or on one of the ENTRY_LINES lines above (not past the previous entry).
+    One uncovered job or degree is enough to run the model.
+    """
+    labels = {ent.label_ for ent in doc.ents}
+    if not {"ORG", "GPE", "DATE"} <= labels or header_name(text) is None:
+        return False
+
+    starts, offset = [], 0
+    for line in text.splitlines(keepends=True):
+        starts.append(offset)
+        offset += len(line)
+    lines = text.splitlines()
+
+    def lines_with(label: str) -> Set[int]:
+        return {bisect_right(starts, ent.start_char) - 1 for ent in doc.ents if ent.label_ == label}
+
+    orgs, dates = lines_with("ORG"), lines_with("DATE")
+
+    previous = -1
+    for i, line in enumerate(lines):
+        if not _YEAR.search(line):
+            continue
+        if i not in dates:
+            return False
+        above = [j for j in range(previous + 1, i) if lines[j].strip()][-ENTRY_LINES:]
+        if i not in orgs and not orgs.intersection(above):
+            return False
+        previous = i
+    return True
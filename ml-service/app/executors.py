@@ -0,0 +1,201 @@
+"""
+Executor layer for the resume pipeline
+Keeps blocking work off the asyncio event loop
+
+- CPU-bound stages (PyMuPDF, spaCy, Sentence-BERT) run in worker processes
+- Blocking I/O (upload/zip reads, the SQLite cache) runs in a thread pool
+- Admission is bounded: once too many requests are in flight, new ones
+  are rejected with QueueFullError, which main.py turns into HTTP 503
+"""
+
+import asyncio
+import functools
+import multiprocessing
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from typing import Any, Callable, Dict, List, Optional
+
+from app import config
+from app.metrics import current_rss_bytes, metrics
+from app.logging_config import setup_logging
+
+
+class QueueFullError(Exception):
+    """Raised when the pipeline already has max_pending requests in flight"""
+
+
+# Models the CPU stages need in each worker process
+CPU_MODELS = ["spacy", "sentence_bert", "skill_catalog"]
+
+
+def _init_cpu_worker() -> None:
+    """
+    Process pool initializer
+
+    Importing the model modules registers their loaders. Unless fast-start
+    is on, spaCy and Sentence-BERT are loaded here, once per worker, so
+    the first request routed to a worker doesn't pay for it.
+    """
+    import app.ner_extractor  # noqa: F401
+    import app.skill_matcher  # noqa: F401
+
+    # Observations are shipped back to the parent with each result
+    metrics.buffer_observations()
+    setup_logging()
+
+    if not config.FAST_START:
+        from app.model_registry import registry
+        registry.warm_up(CPU_MODELS)
+
+
+def _worker_model_status() -> Dict[str, Any]:
+    """Model status of the worker this runs in (warms models if needed)"""
+    import app.ner_extractor  # noqa: F401
+    import app.skill_matcher  # noqa: F401
+    from app.model_registry import registry
+
+    return registry.warm_up(CPU_MODELS)
+
+
+def _run_instrumented(fn: Callable, *args: Any, **kwargs: Any):
+    """
+    Run fn in a worker process, returning its result together with the
+    metrics it recorded and a memory snapshot of the worker
+    """
+    from app.model_registry import registry
+
+    result = fn(*args, **kwargs)
+    snapshot = {
+        "pid": os.getpid(),
+        "rss_bytes": current_rss_bytes(),
+        "model_rss_bytes": dict(registry.load_rss_bytes)
+    }
+    return result, metrics.drain(), snapshot
+
+
+class PipelineExecutor:
+    """
+    Thread + process pools with bounded admission
+
+    Args:
+        cpu_workers: Worker processes for CPU stages (0 = use threads)
+        io_workers: Threads for blocking I/O such as the Gemini call
+        max_pending: Requests allowed in flight before rejecting
+    """
+
+    def __init__(self, cpu_workers: int, io_workers: int, max_pending: int):
+        self.cpu_workers = cpu_workers
+        self.io_workers = io_workers
+        self.max_pending = max_pending
+        self._pending = 0
+        # Tasks submitted and not yet finished, per pool (event loop only)
+        self.in_flight = {"cpu": 0, "io": 0}
+        self._cpu_pool: Optional[Executor] = None
+        self._io_pool: Optional[ThreadPoolExecutor] = None
+
+    @property
+    def pending(self) -> int:
+        """Requests currently admitted (running or waiting for a worker)"""
+        return self._pending
+
+    def start(self) -> None:
+        """Create the pools (called from the app lifespan)"""
+        self._io_pool = ThreadPoolExecutor(
+            max_workers=self.io_workers,
+            thread_name_prefix="pipeline-io"
+        )
+        if self.cpu_workers > 0:
+            # spawn, not fork: forking after torch has started threads can deadlock
+            self._cpu_pool = ProcessPoolExecutor(
+                max_workers=self.cpu_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_cpu_worker
+            )
+        else:
+            self._cpu_pool = self._io_pool
+
+    def shutdown(self) -> None:
+        """Stop the pools, cancelling work that hasn't started yet"""
+        if self._cpu_pool is not None and self._cpu_pool is not self._io_pool:
+            self._cpu_pool.shutdown(wait=False, cancel_futures=True)
+        if self._io_pool is not None:
+            self._io_pool.shutdown(wait=False, cancel_futures=True)
+        self._cpu_pool = None
+        self._io_pool = None
+
+    def acquire(self) -> None:
+        """
+        Reserve a slot for one request
+
+        Runs on the event loop thread only, so a plain counter is enough.
+
+        Raises:
+            QueueFullError: If max_pending requests are already in flight
+        """
+        if self._pending >= self.max_pending:
+            raise QueueFullError(
+                f"{self._pending} requests in flight (limit {self.max_pending})"
+            )
+        self._pending += 1
+
+    def release(self) -> None:
+        """Give back a slot taken with acquire()"""
+        self._pending -= 1
+
+    @asynccontextmanager
+    async def admit(self):
+        """Hold a request slot for the duration of the block (see acquire)"""
+        self.acquire()
+        try:
+            yield
+        finally:
+            self.release()
+
+    async def warm_up(self) -> List[Dict[str, Any]]:
+        """
+        Load the CPU-stage models wherever CPU stages will run
+
+        With a process pool, one task per worker forces every worker to
+        spawn (and warm in its initializer). Returns the model status
+        reported by each task.
+        """
+        tasks = [
+            self.run_cpu(_worker_model_status)
+            for _ in range(max(1, self.cpu_workers))
+        ]
+        return list(await asyncio.gather(*tasks))
+
+    async def run_cpu(self, fn: Callable, *args: Any, **kwargs: Any) -> Any:
+        """Run a CPU-bound stage in the process pool"""
+        if self.cpu_workers <= 0:
+            return await self._run("cpu", self._cpu_pool, fn, *args, **kwargs)
+
+        result, observations, snapshot = await self._run(
+            "cpu", self._cpu_pool, _run_instrumented, fn, *args, **kwargs
+        )
+        metrics.replay(observations)
+        metrics.worker_snapshots[snapshot["pid"]] = snapshot
+        return result
+
+    async def run_io(self, fn: Callable, *args: Any, **kwargs: Any) -> Any:
+        """Run a blocking I/O call in the thread pool"""
+        return await self._run("io", self._io_pool, fn, *args, **kwargs)
+
+    async def _run(self, kind: str, pool: Optional[Executor], fn: Callable, *args: Any, **kwargs: Any) -> Any:
+        if pool is None:
+            raise RuntimeError("PipelineExecutor used before start()")
+        loop = asyncio.get_running_loop()
+        self.in_flight[kind] += 1
+        try:
+            return await loop.run_in_executor(pool, functools.partial(fn, *args, **kwargs))
+        finally:
+            self.in_flight[kind] -= 1
+
+
+# Shared instance used by the FastAPI app
+executor = PipelineExecutor(
+    cpu_workers=config.CPU_WORKERS,
+    io_workers=config.IO_WORKERS,
+    max_pending=config.MAX_PENDING_REQUESTS
+)
@@ -3,24 +3,74 @@ Intelligent career analysis with deep niche exploration
 Detects specializations and suggests cutting-edge paths
 """
 
-from google import genai
 from google.genai import types
 import json
 import os
 from typing import List, Dict
 from dotenv import load_dotenv
+from app import config
+from app.gemini_client import CircuitBreaker, CircuitOpenError, ResilientClient
+from app.llm_backends import GeminiBackend, LLMBackend, MockLLMBackend
+from app.metrics import FALLBACKS, time_stage
+from app.logging_config import get_logger
 from app.models import GeminiAnalysis, CareerRecommendation, SalaryPrediction
+from app.model_registry import registry
 
 load_dotenv()
-client = genai.Client(api_key=os.getenv("GEMINI_API_KEY"))
 
+log = get_logger("gemini")
 
-def analyze_with_gemini(resume_text: str, extracted_skills: List[Dict], entities: Dict) -> GeminiAnalysis:
-    """Smart analysis with deep niche exploration"""
-    
-    skills_list = [s.get("skill", "") for s in (extracted_skills or [])][:25]
+
+GENERATION_CONFIG = types.GenerateContentConfig(
+    temperature=0.85,  # Higher for creative niche suggestions
+    max_output_tokens=2500,
+    safety_settings=[
+        types.SafetySetting(category=types.HarmCategory.HARM_CATEGORY_HATE_SPEECH, threshold=types.HarmBlockThreshold.BLOCK_NONE),
+        types.SafetySetting(category=types.HarmCategory.HARM_CATEGORY_HARASSMENT, threshold=types.HarmBlockThreshold.BLOCK_NONE),
+        types.SafetySetting(category=types.HarmCategory.HARM_CATEGORY_SEXUALLY_EXPLICIT, threshold=types.HarmBlockThreshold.BLOCK_NONE),
+        types.SafetySetting(category=types.HarmCategory.HARM_CATEGORY_DANGEROUS_CONTENT, threshold=types.HarmBlockThreshold.BLOCK_NONE)
+    ]
+)
+
+
+def _create_backend() -> LLMBackend:
+    """LLM backend chosen by ML_LLM_BACKEND"""
+    if config.LLM_BACKEND == "mock":
+        return MockLLMBackend(
+            latency_ms=config.MOCK_LLM_LATENCY_MS,
+            distribution=config.MOCK_LLM_LATENCY_DIST,
+            jitter=config.MOCK_LLM_JITTER,
+            error_rate=config.MOCK_LLM_ERROR_RATE,
+            seed=config.MOCK_LLM_SEED
+        )
+    return GeminiBackend(os.getenv("GEMINI_API_KEY"), config.GEMINI_MODEL, GENERATION_CONFIG)
+
+
+def _create_client() -> ResilientClient:
+    """
+    Shared async LLM client, created on first use
+
+    The backend (one per process, so connections are reused) is wrapped
+    with timeouts, retries, hedging and a circuit breaker.
+    """
+    return ResilientClient(
+        _create_backend().generate,
+        attempt_timeout=config.GEMINI_TIMEOUT_SECONDS,
+        deadline=config.GEMINI_DEADLINE_SECONDS,
+        max_retries=config.GEMINI_MAX_RETRIES,
+        backoff_base=config.GEMINI_BACKOFF_SECONDS,
+        hedge_after=config.GEMINI_HEDGE_AFTER_SECONDS,
+        breaker=CircuitBreaker(config.GEMINI_BREAKER_FAILURES, config.GEMINI_BREAKER_COOLDOWN_SECONDS)
+    )
+
+
+registry.register("gemini", _create_client)
+
+
+def build_prompt(resume_text: str, skills_list: List[str]) -> str:
+    """Prompt for the career analysis (also the Gemini cache key input)"""
     
-    prompt = f"""You're a senior tech career advisor with deep knowledge of emerging tech ecosystems.
+    return f"""You're a senior tech career advisor with deep knowledge of emerging tech ecosystems.
 
 SKILLS: {', '.join(skills_list)}
 
@@ -62,48 +112,77 @@ Return JSON:
 
 BE SPECIFIC. If they show interest in a niche, explore it deeply."""
 
+
+def prompt_skills(extracted_skills: List[Dict]) -> List[str]:
+    """Top 25 skill names that go into the prompt"""
+    return [s.get("skill", "") for s in (extracted_skills or [])][:25]
+
+
+async def analyze_with_gemini(resume_text: str, extracted_skills: List[Dict], entities: Dict) -> GeminiAnalysis:
+    """Smart analysis with deep niche exploration"""
+    
+    skills_list = prompt_skills(extracted_skills)
+    prompt = build_prompt(resume_text, skills_list)
+    return await generate_analysis(prompt, skills_list, resume_text)
+
+
+async def generate_analysis(prompt: str, skills_list: List[str], resume_text: str) -> GeminiAnalysis:
+    """Send a prepared prompt to Gemini (falls back to rule-based analysis)"""
+
     try:
-        response = client.models.generate_content(
-            model='gemini-2.5-flash-lite',
-            contents=prompt,
-            config=types.GenerateContentConfig(
-                temperature=0.85,  # Higher for creative niche suggestions
-                max_output_tokens=2500,
-                safety_settings=[
-                    types.SafetySetting(category=types.HarmCategory.HARM_CATEGORY_HATE_SPEECH, threshold=types.HarmBlockThreshold.BLOCK_NONE),
-                    types.SafetySetting(category=types.HarmCategory.HARM_CATEGORY_HARASSMENT, threshold=types.HarmBlockThreshold.BLOCK_NONE),
-                    types.SafetySetting(category=types.HarmCategory.HARM_CATEGORY_SEXUALLY_EXPLICIT, threshold=types.HarmBlockThreshold.BLOCK_NONE),
-                    types.SafetySetting(category=types.HarmCategory.HARM_CATEGORY_DANGEROUS_CONTENT, threshold=types.HarmBlockThreshold.BLOCK_NONE)
-                ]
-            )
-        )
-        
-        if not response or not response.text:
-            return create_niche_aware_fallback(skills_list, resume_text)
-        
-        text = response.text.strip()
-        if '{' in text:
-            text = text[text.find('{'):text.rfind('}')+1]
-        text = text.replace('``````', '').strip()
-        
-        result = json.loads(text)
-        
-        recs = result.get("career_recommendations", [])
-        if not recs or len(recs) < 2:
-            return create_niche_aware_fallback(skills_list, resume_text)
-        
-        return GeminiAnalysis(
-            career_recommendations=[CareerRecommendation(**r) for r in recs[:3]],
-            ats_score=result.get("ats_score", 70),
-            ats_feedback=result.get("ats_feedback", ""),
-            missing_skills=result.get("missing_skills", [])[:5],
-            quick_wins=result.get("quick_wins", [])[:3],
-            salary_prediction=SalaryPrediction(**result.get("salary_prediction", {"min": 600000, "max": 1200000})),
-            summary=result.get("summary", "")
-        )
+        client = registry.get("gemini")
+        with time_stage("gemini"):
+            text = await client.generate(prompt)
+    
+    except CircuitOpenError:
+        # Gemini has been failing: answer with the fallback right away
+        FALLBACKS.inc(reason="circuit_open")
+        return create_niche_aware_fallback(skills_list, resume_text)
+    
+    except Exception as e:
+        log.warning("Gemini failed, using fallback", extra={"fields": {"error": f"{type(e).__name__}: {e}"}})
+        FALLBACKS.inc(reason="upstream_error")
+        return create_niche_aware_fallback(skills_list, resume_text)
+    
+    try:
+        analysis = parse_analysis(text, skills_list, resume_text)
+    except Exception:
+        analysis = create_niche_aware_fallback(skills_list, resume_text)
+    if analysis.is_fallback:
+        FALLBACKS.inc(reason="invalid_response")
+    return analysis
+
+
+def parse_analysis(text: str, skills_list: List[str], resume_text: str) -> GeminiAnalysis:
+    """
+    Turn Gemini's response text into a GeminiAnalysis
+
+    Raises:
+        ValueError: If the text isn't the JSON we asked for
+    """
+    if not text:
+        return create_niche_aware_fallback(skills_list, resume_text)
     
-    except:
+    text = text.strip()
+    if '{' in text:
+        text = text[text.find('{'):text.rfind('}')+1]
+    text = text.replace('``````', '').strip()
+    
+    result = json.loads(text)
+    
+    recs = result.get("career_recommendations", [])
+    if not recs or len(recs) < 2:
         return create_niche_aware_fallback(skills_list, resume_text)
+    
+    return GeminiAnalysis(
+        career_recommendations=[CareerRecommendation(**r) for r in recs[:3]],
+        ats_score=result.get("ats_score", 70),
+        ats_feedback=result.get("ats_feedback", ""),
+        missing_skills=result.get("missing_skills", [])[:5],
+        quick_wins=result.get("quick_wins", [])[:3],
+        salary_prediction=SalaryPrediction(**result.get("salary_prediction", {"min": 600000, "max": 1200000})),
+        summary=result.get("summary", "")
+    )
 
 
 def create_niche_aware_fallback(skills: List[str], resume_text: str) -> GeminiAnalysis:
@@ -236,5 +315,6 @@ def create_niche_aware_fallback(skills: List[str], resume_text: str) -> GeminiAn
             f"Document tech stack and architecture (2 hours)"
         ],
         salary_prediction=SalaryPrediction(min=sal_min, max=sal_max, currency="INR"),
-        summary=f"You show {niche_name.upper()} interest with {niche_count} relevant skills. {'Go deep in this niche - high demand, premium salaries.' if niche_count >= 2 else 'Pick one specialization and go deep.'} Add production signals (Docker, tests, CI/CD). Target ₹{sal_min//100000}-{sal_max//100000}L. {'Explore ' + (roles[0].role if roles else 'opportunities') + ' deeply.' if niche_count >= 2 else 'Build 2-3 focused projects.'}"
+        summary=f"You show {niche_name.upper()} interest with {niche_count} relevant skills. {'Go deep in this niche - high demand, premium salaries.' if niche_count >= 2 else 'Pick one specialization and go deep.'} Add production signals (Docker, tests, CI/CD). Target ₹{sal_min//100000}-{sal_max//100000}L. {'Explore ' + (roles[0].role if roles else 'opportunities') + ' deeply.' if niche_count >= 2 else 'Build 2-3 focused projects.'}",
+        is_fallback=True
     )
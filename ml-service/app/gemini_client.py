@@ -0,0 +1,208 @@
+"""
+Resilient async client for Gemini
+Deadlines, retries, hedging and a circuit breaker around one shared client
+
+- One genai.Client per process (via the model registry), so its HTTP
+  connection pool is reused across requests
+- Every attempt has a timeout, and the whole call has an overall deadline
+- Retryable failures (timeouts, connection errors, 429/5xx) are retried
+  with exponential backoff and jitter
+- Optional hedging: if an attempt hasn't answered after hedge_after
+  seconds, a second identical request is sent and the first answer wins
+- Circuit breaker: after N consecutive failures, calls fail fast for a
+  cooldown period so the caller can switch to the fallback immediately
+"""
+
+import asyncio
+import random
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+try:
+    import httpx
+    _TRANSPORT_ERRORS = (httpx.TransportError,)
+except ImportError:  # httpx ships with google-genai, but don't depend on it
+    _TRANSPORT_ERRORS = ()
+
+
+# HTTP status codes worth retrying
+RETRYABLE_STATUS = {408, 429, 500, 502, 503, 504}
+
+
+class CircuitOpenError(Exception):
+    """Raised without calling upstream while the breaker is open"""
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker
+
+    closed → open after failure_threshold failures in a row
+    open → half-open once cooldown_seconds have passed (one trial call)
+    half-open → closed on success, open again on failure
+    """
+
+    def __init__(self, failure_threshold: int, cooldown_seconds: float):
+        self.failure_threshold = failure_threshold
+        self.cooldown_seconds = cooldown_seconds
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._trial_in_flight = False
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.cooldown_seconds:
+            return "half_open"
+        return "open"
+
+    def allow(self) -> bool:
+        """Whether a call may go upstream now"""
+        state = self.state
+        if state == "closed":
+            return True
+        if state == "half_open" and not self._trial_in_flight:
+            self._trial_in_flight = True
+            return True
+        return False
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self.opened_at = None
+        self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        self._trial_in_flight = False
+        if self.opened_at is not None or self.failures >= self.failure_threshold:
+            self.opened_at = time.monotonic()
+
+    def release_trial(self) -> None:
+        """Free the half-open trial slot when the trial ended without an outcome (cancelled)"""
+        self._trial_in_flight = False
+
+
+def is_retryable(error: BaseException) -> bool:
+    """Timeouts, connection problems and 408/429/5xx responses"""
+    if isinstance(error, (asyncio.TimeoutError, ConnectionError) + _TRANSPORT_ERRORS):
+        return True
+    code = getattr(error, "code", None) or getattr(error, "status_code", None)
+    return code in RETRYABLE_STATUS
+
+
+class ResilientClient:
+    """
+    Wraps an async send(prompt) -> text call with the policies above
+
+    Args:
+        send: Coroutine function doing a single upstream request
+        attempt_timeout: Seconds allowed per attempt
+        deadline: Seconds allowed for the whole call, retries included
+        max_retries: Extra attempts after the first
+        backoff_base: First backoff in seconds (doubles each retry)
+        hedge_after: Seconds before sending a hedged duplicate (0 = off)
+        breaker: Shared circuit breaker
+    """
+
+    def __init__(self, send: Callable[[str], Awaitable[str]], attempt_timeout: float,
+                 deadline: float, max_retries: int, backoff_base: float,
+                 hedge_after: float, breaker: CircuitBreaker):
+        self.send = send
+        self.attempt_timeout = attempt_timeout
+        self.deadline = deadline
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.hedge_after = hedge_after
+        self.breaker = breaker
+        self.stats = {
+            "calls": 0, "successes": 0, "failures": 0, "retries": 0,
+            "hedges": 0, "hedge_wins": 0, "timeouts": 0, "short_circuited": 0
+        }
+
+    async def generate(self, prompt: str) -> str:
+        """
+        Send the prompt, returning the response text
+
+        Raises:
+            CircuitOpenError: If the breaker is open (no upstream call made)
+            Exception: The last upstream error once retries/deadline run out
+        """
+        self.stats["calls"] += 1
+        # This call is the half-open trial (if allowed through below)
+        trial = self.breaker.state == "half_open"
+        if not self.breaker.allow():
+            self.stats["short_circuited"] += 1
+            raise CircuitOpenError("Gemini circuit breaker is open")
+
+        try:
+            give_up_at = time.monotonic() + self.deadline
+            attempt = 0
+            while True:
+                remaining = give_up_at - time.monotonic()
+                try:
+                    if remaining <= 0:
+                        raise asyncio.TimeoutError("Gemini deadline exceeded")
+                    text = await self._hedged(prompt, min(self.attempt_timeout, remaining))
+                except Exception as e:
+                    if isinstance(e, asyncio.TimeoutError):
+                        self.stats["timeouts"] += 1
+                    backoff = self.backoff_base * (2 ** attempt) * random.uniform(0.5, 1.0)
+                    retry = (
+                        is_retryable(e)
+                        and attempt < self.max_retries
+                        and time.monotonic() + backoff < give_up_at
+                    )
+                    if not retry:
+                        self.stats["failures"] += 1
+                        self.breaker.record_failure()
+                        raise
+                    attempt += 1
+                    self.stats["retries"] += 1
+                    await asyncio.sleep(backoff)
+                    continue
+
+                self.stats["successes"] += 1
+                self.breaker.record_success()
+                return text
+        finally:
+            # A cancelled call (client gone, stage failed, outer timeout) records
+            # neither outcome; without this the half-open trial would never end
+            if trial:
+                self.breaker.release_trial()
+
+    async def _hedged(self, prompt: str, timeout: float) -> str:
+        """One logical attempt, optionally hedged with a duplicate request"""
+        primary = asyncio.ensure_future(asyncio.wait_for(self.send(prompt), timeout))
+        tasks = {primary}
+        try:
+            if self.hedge_after <= 0 or self.hedge_after >= timeout:
+                return await primary
+
+            done, _ = await asyncio.wait(tasks, timeout=self.hedge_after)
+            if done:
+                return primary.result()
+
+            # Primary is slow: race a duplicate against it for the time left
+            self.stats["hedges"] += 1
+            backup = asyncio.ensure_future(asyncio.wait_for(self.send(prompt), timeout - self.hedge_after))
+            tasks.add(backup)
+            error: Optional[BaseException] = None
+            pending = set(tasks)
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is backup:
+                            self.stats["hedge_wins"] += 1
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            # Loser (or everything, if we were cancelled) stops here
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+
+    def status(self) -> Dict[str, Any]:
+        return {"breaker": self.breaker.state, **self.stats}
@@ -0,0 +1,65 @@
+"""
+Deep health diagnostics
+Runs a tiny inference on the models that are already loaded
+
+Never constructs models: anything the registry hasn't loaded yet is
+reported as "not_loaded". Runs inside a CPU worker (see main.py), so it
+exercises the same processes that serve requests.
+"""
+
+import os
+import time
+from typing import Any, Dict
+
+from app.model_registry import registry
+
+
+# Small enough to take milliseconds, rich enough to hit NER and skills
+PROBE_TEXT = (
+    "Priya Sharma worked as a Software Engineer at Infosys in Bengaluru from 2021 to 2023. "
+    "Built REST APIs with Python, FastAPI and PostgreSQL, deployed with Docker."
+)
+
+
+def _probe(name: str, fn) -> Dict[str, Any]:
+    """Time fn() against a loaded model, or report that it isn't loaded"""
+    if not registry.is_loaded(name):
+        return {"status": "not_loaded"}
+    began = time.perf_counter()
+    try:
+        detail = fn(registry.peek(name))
+    except Exception as e:
+        return {"status": "error", "error": str(e)}
+    return {
+        "status": "ok",
+        "latency_ms": round((time.perf_counter() - began) * 1000, 2),
+        **detail
+    }
+
+
+def run_micro_inference() -> Dict[str, Any]:
+    """
+    Probe each CPU model once
+
+    Returns:
+        Per-model status with latency, plus the worker's pid
+    """
+    # Registers the loaders when this runs in a fresh worker process
+    import app.ner_extractor  # noqa: F401
+    import app.skill_matcher  # noqa: F401
+
+    checks = {
+        "spacy": _probe(
+            "spacy",
+            lambda nlp: {"entities": len(nlp(PROBE_TEXT).ents)}
+        ),
+        "sentence_bert": _probe(
+            "sentence_bert",
+            lambda model: {"dim": int(model.encode([PROBE_TEXT], normalize_embeddings=True).shape[1])}
+        ),
+        "skill_catalog": _probe(
+            "skill_catalog",
+            lambda catalog: {"skills": len(catalog.skills), "index": catalog.index.name}
+        )
+    }
+    return {"pid": os.getpid(), "checks": checks}
@@ -0,0 +1,260 @@
+"""
+Layout-aware PDF extraction
+Typed resume sections (header, experience, skills, ...) with bounding boxes
+
+page.get_text() flattens a page into one string, losing the structure
+the layout already shows. Here PyMuPDF's "dict" output is read instead:
+every text block keeps its bounding box, font size and weight, so
+section headings ("EXPERIENCE", "Technical Skills", ...) can be
+recognised and the blocks under each one grouped into a section.
+
+Downstream stages can then work on the sections they need, e.g. skill
+matching embeds skills/experience/projects and skips the contact header
+and education blocks.
+"""
+
+import re
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import fitz  # PyMuPDF
+
+from app import config
+from app.metrics import time_stage
+from app.parsers import FileSource, _open_pdf
+
+
+# Bounding box in PDF points: (x0, y0, x1, y1), origin top-left
+BBox = Tuple[float, float, float, float]
+
+# Section kinds, and the heading phrases that start each one (lowercase,
+# compared after stripping punctuation)
+SECTION_HEADINGS: Dict[str, Tuple[str, ...]] = {
+    "summary": ("summary", "professional summary", "career summary", "profile summary", "executive summary",
+                "profile", "professional profile", "objective", "career objective", "about me", "about"),
+    "experience": ("experience", "work experience", "professional experience", "employment", "work history",
+                   "internships", "internship", "employment history", "relevant experience"),
+    "skills": ("skills", "technical skills", "key skills", "core skills", "technologies", "tech stack",
+               "tools", "competencies", "core competencies", "expertise"),
+    "projects": ("projects", "personal projects", "academic projects", "key projects", "project experience"),
+    "education": ("education", "academic background", "academics", "qualifications", "educational qualifications"),
+    "certifications": ("certifications", "certificates", "courses", "licenses", "training"),
+    "achievements": ("achievements", "awards", "honors", "honours", "accomplishments", "publications"),
+}
+
+_HEADING_KINDS = {phrase: kind for kind, phrases in SECTION_HEADINGS.items() for phrase in phrases}
+
+# Kinds whose text is worth embedding for skill matching
+SKILL_SECTIONS = ("summary", "skills", "experience", "projects", "certifications", "achievements", "other")
+
+# Headings are short; longer lines are body text even if they contain "skills"
+MAX_HEADING_CHARS = 40
+
+# Drop image blocks: we only need text, and images bloat the dict output
+_TEXT_FLAGS = fitz.TEXTFLAGS_DICT & ~fitz.TEXT_PRESERVE_IMAGES
+
+_BOLD = 1 << 4  # span "flags" bit for bold text
+
+_NON_LETTERS = re.compile(r"[^a-z& ]+")
+
+
+@dataclass
+class LayoutBlock:
+    """One text block of a page"""
+    page: int
+    bbox: BBox
+    text: str
+    font_size: float
+    bold: bool
+
+
+@dataclass
+class PdfLayout:
+    """Text blocks of a range of pages, plus the document's total page count"""
+    page_count: int
+    blocks: List[LayoutBlock]
+
+
+@dataclass
+class LayoutSection:
+    """
+    A run of blocks under one heading
+
+    kind is one of the SECTION_HEADINGS keys, "header" (everything before
+    the first heading: name, contact details) or "other" (a styled heading
+    we don't recognise).
+    """
+    kind: str
+    title: str
+    blocks: List[LayoutBlock] = field(default_factory=list)
+
+    @property
+    def text(self) -> str:
+        return "\n".join(block.text for block in self.blocks)
+
+    @property
+    def page(self) -> int:
+        return self.blocks[0].page if self.blocks else 0
+
+    @property
+    def bbox(self) -> BBox:
+        """Union of the block boxes on the section's first page"""
+        boxes = [b.bbox for b in self.blocks if b.page == self.page]
+        if not boxes:
+            return (0.0, 0.0, 0.0, 0.0)
+        return (min(b[0] for b in boxes), min(b[1] for b in boxes),
+                max(b[2] for b in boxes), max(b[3] for b in boxes))
+
+
+def _page_blocks(page, page_num: int) -> List[LayoutBlock]:
+    """Text blocks of one page, lines joined with newlines"""
+    blocks = []
+    for block in page.get_text("dict", flags=_TEXT_FLAGS)["blocks"]:
+        if block.get("type") != 0:
+            continue
+        lines, sizes, bold = [], [], False
+        for line in block["lines"]:
+            spans = [span for span in line["spans"] if span["text"].strip()]
+            if not spans:
+                continue
+            lines.append("".join(span["text"] for span in spans).strip())
+            sizes.extend(span["size"] for span in spans)
+            bold = bold or all(span["flags"] & _BOLD for span in spans)
+        if lines:
+            blocks.append(LayoutBlock(
+                page=page_num,
+                bbox=tuple(round(v, 1) for v in block["bbox"]),
+                text="\n".join(lines),
+                font_size=max(sizes),
+                bold=bold
+            ))
+    return blocks
+
+
+def extract_pdf_layout(source: FileSource, start: int = 0, stop: Optional[int] = None) -> PdfLayout:
+    """
+    Extract the text blocks of pages [start, stop) of a PDF
+
+    Same page-range contract as parsers.extract_pdf_pages, so the
+    pipeline can read long PDFs page-parallel in either mode.
+
+    Args:
+        source: PDF file as bytes, or its path
+        start: First page (0-based)
+        stop: Page after the last one (None = up to PDF_MAX_PAGES)
+
+    Returns:
+        PdfLayout with the blocks of every page in the range, in page order
+
+    Raises:
+        Exception: If PDF parsing fails
+    """
+    try:
+        with time_stage("parse"):
+            doc = _open_pdf(source)
+            try:
+                page_count = doc.page_count
+                stop = min(page_count, config.PDF_MAX_PAGES if stop is None else stop)
+                blocks = [block for page_num in range(start, stop)
+                          for block in _page_blocks(doc[page_num], page_num)]
+            finally:
+                doc.close()
+        return PdfLayout(page_count=page_count, blocks=blocks)
+
+    except Exception as e:
+        raise Exception(f"PDF parsing error: {str(e)}")
+
+
+def classify_heading(text: str) -> Optional[str]:
+    """
+    Section kind for a heading line, or None if it isn't a known heading
+
+    Only whole phrases match ("Experience", "WORK EXPERIENCE"), so a body
+    line such as "Experience with Kafka" does not. Combined headings are
+    classified by their first part: "Skills & Tools" -> "skills".
+    """
+    if len(text) > MAX_HEADING_CHARS:
+        return None
+    normalized = " ".join(_NON_LETTERS.sub(" ", text.lower()).split())
+    first = normalized.replace(" and ", " & ").split(" & ")[0].strip()
+    return _HEADING_KINDS.get(first)
+
+
+def _looks_like_heading(block: LayoutBlock, body_size: float) -> bool:
+    """
+    A short, single-line block set apart like a heading
+
+    Larger than the body text, or bold capitals. Bold alone is not
+    enough: job titles and company names are often bold.
+    """
+    text = block.text
+    if "\n" in text or len(text) > MAX_HEADING_CHARS or not any(c.isalpha() for c in text):
+        return False
+    return block.font_size > body_size + 1 or (block.bold and text.isupper())
+
+
+def _body_font_size(blocks: Iterable[LayoutBlock]) -> float:
+    """Most common font size, weighted by text length"""
+    weights: Dict[float, int] = {}
+    for block in blocks:
+        size = round(block.font_size)
+        weights[size] = weights.get(size, 0) + len(block.text)
+    return max(weights, key=weights.get) if weights else 0.0
+
+
+def group_sections(blocks: List[LayoutBlock]) -> List[LayoutSection]:
+    """
+    Split blocks into sections at their headings
+
+    A block starts a new section when its first line is a known heading
+    (classify_heading), or - once the first section has started - when
+    it is a short line styled like a heading, which becomes "other".
+    Blocks before the first heading form the "header" section (the
+    name is usually the largest text there). Text that follows a
+    heading in the same block, e.g. "Skills: Python, SQL", stays in
+    that section.
+
+    Args:
+        blocks: Blocks in reading order, across pages
+
+    Returns:
+        Non-empty sections in document order
+    """
+    body_size = _body_font_size(blocks)
+    sections = [LayoutSection(kind="header", title="")]
+    for block in blocks:
+        first_line, _, rest = block.text.partition("\n")
+        title, _, inline = first_line.partition(":")
+        kind = classify_heading(title)
+        if kind is None and sections[-1].kind != "header" and _looks_like_heading(block, body_size):
+            kind, inline = "other", ""
+        if kind is None:
+            sections[-1].blocks.append(block)
+            continue
+        section = LayoutSection(kind=kind, title=title.strip())
+        body = "\n".join(part.strip() for part in (inline, rest) if part.strip())
+        if body:
+            # Heading and body share a block: keep the body, drop the heading
+            section.blocks.append(LayoutBlock(block.page, block.bbox, body, block.font_size, block.bold))
+        sections.append(section)
+    return [s for s in sections if s.blocks]
+
+
+def layout_text(blocks: List[LayoutBlock]) -> str:
+    """Document text from blocks (what extract_resume_text would return)"""
+    pages: Dict[int, List[str]] = {}
+    for block in blocks:
+        pages.setdefault(block.page, []).append(block.text)
+    return "\n".join("\n".join(texts) for _, texts in sorted(pages.items())).strip()
+
+
+def sections_text(sections: List[LayoutSection], kinds: Iterable[str] = SKILL_SECTIONS) -> str:
+    """
+    Text of the sections of the given kinds, in document order
+
+    Each section starts with its heading line, so the chunker (which
+    reads plain text) sees the same section boundaries.
+    """
+    wanted = set(kinds)
+    parts = [f"{s.title}\n{s.text}" if s.title else s.text for s in sections if s.kind in wanted]
+    return "\n\n".join(parts).strip()
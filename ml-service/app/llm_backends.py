@@ -0,0 +1,167 @@
+"""
+Pluggable LLM backends for the career analysis
+Chosen with ML_LLM_BACKEND: "gemini" (default) or "mock"
+
+Every backend is an async generate(prompt) -> response text. The
+ResilientClient in gemini_client.py wraps whichever one is configured, so
+timeouts, retries, hedging and the circuit breaker behave the same.
+
+The mock backend answers locally with realistic, deterministic JSON after
+a configurable delay and can inject errors, so /analyze-resume can be
+benchmarked and load-tested without network access or API quota.
+"""
+
+import asyncio
+import hashlib
+import json
+import math
+import random
+import re
+from typing import Any, List, Optional
+
+
+class LLMBackend:
+    """Interface: one upstream request per generate() call"""
+
+    name = "base"
+
+    async def generate(self, prompt: str) -> str:
+        raise NotImplementedError
+
+
+class GeminiBackend(LLMBackend):
+    """
+    Google Gemini through the shared async client
+
+    Args:
+        api_key: Gemini API key
+        model: Model name, e.g. "gemini-2.5-flash-lite"
+        generation_config: types.GenerateContentConfig for every request
+    """
+
+    name = "gemini"
+
+    def __init__(self, api_key: Optional[str], model: str, generation_config: Any):
+        from google import genai
+
+        # One client per process: its HTTP connection pool is reused
+        self.client = genai.Client(api_key=api_key)
+        self.model = model
+        self.generation_config = generation_config
+
+    async def generate(self, prompt: str) -> str:
+        response = await self.client.aio.models.generate_content(
+            model=self.model,
+            contents=prompt,
+            config=self.generation_config
+        )
+        return response.text if response else ""
+
+
+class MockLLMError(Exception):
+    """Injected upstream failure; code mimics an HTTP status"""
+
+    def __init__(self, code: int, message: str):
+        super().__init__(message)
+        self.code = code
+
+
+_MOCK_ROLES = [
+    ("Backend Engineer", "Deepen API design, PostgreSQL tuning and Redis caching. Add load tests to your projects."),
+    ("Full-Stack Developer", "Ship one Next.js + FastAPI product end to end with auth, tests and CI/CD."),
+    ("ML Engineer", "Move models to production with MLflow, BentoML and a vector database."),
+    ("Cloud/DevOps Engineer", "Learn Terraform and Kubernetes; add Prometheus and Grafana dashboards."),
+    ("Data Engineer", "Build a pipeline with Airflow, dbt and a warehouse such as BigQuery."),
+    ("Mobile Developer", "Publish a Flutter or React Native app with offline sync and analytics."),
+    ("Web3 Developer", "Write and test Solidity contracts with Foundry; deploy to Base or Polygon."),
+]
+
+
+class MockLLMBackend(LLMBackend):
+    """
+    Local stand-in for Gemini
+
+    The response is a pure function of the prompt (same prompt, same
+    JSON). Latency and injected errors come from a seeded RNG, so a load
+    test with the same seed and request order is repeatable.
+
+    Args:
+        latency_ms: Typical latency (the median for "lognormal")
+        distribution: "fixed", "uniform" or "lognormal"
+        jitter: Spread: ±fraction for "uniform", sigma for "lognormal"
+        error_rate: Fraction of calls that fail with a 429/503
+        seed: RNG seed for latency and errors
+    """
+
+    name = "mock"
+
+    def __init__(self, latency_ms: float = 800, distribution: str = "lognormal",
+                 jitter: float = 0.5, error_rate: float = 0.0, seed: int = 0):
+        if distribution not in ("fixed", "uniform", "lognormal"):
+            raise ValueError(f"Unknown latency distribution: {distribution}")
+        self.latency_ms = latency_ms
+        self.distribution = distribution
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self._rng = random.Random(seed)
+
+    def sample_latency(self) -> float:
+        """Seconds to wait for the next call"""
+        if self.distribution == "fixed":
+            ms = self.latency_ms
+        elif self.distribution == "uniform":
+            ms = self.latency_ms * self._rng.uniform(1 - self.jitter, 1 + self.jitter)
+        else:
+            ms = self._rng.lognormvariate(math.log(max(self.latency_ms, 1e-3)), self.jitter)
+        return max(0.0, ms) / 1000
+
+    async def generate(self, prompt: str) -> str:
+        delay = self.sample_latency()
+        fail = self._rng.random() < self.error_rate
+        code = self._rng.choice((429, 503))
+        await asyncio.sleep(delay)
+        if fail:
+            raise MockLLMError(code, f"Mock LLM injected error {code}")
+        return mock_response(prompt)
+
+
+_SKILLS_LINE = re.compile(r"^SKILLS:(.*)$", re.MULTILINE)
+
+
+def mock_response(prompt: str) -> str:
+    """Realistic analysis JSON derived from the prompt's skills list"""
+    seed = int.from_bytes(hashlib.sha256(prompt.encode("utf-8")).digest()[:8], "big")
+    rng = random.Random(seed)
+
+    match = _SKILLS_LINE.search(prompt)
+    skills: List[str] = [s.strip() for s in match.group(1).split(",") if s.strip()] if match else []
+    shown = ", ".join(skills[:3]) or "your core stack"
+
+    roles = rng.sample(_MOCK_ROLES, 3)
+    low = rng.choice([400000, 600000, 800000, 1000000])
+    result = {
+        "career_recommendations": [
+            {
+                "role": role,
+                "match_score": score,
+                "reasoning": f"You already use {shown}. {advice}"
+            }
+            for (role, advice), score in zip(roles, (rng.randint(80, 95), rng.randint(70, 85), rng.randint(60, 78)))
+        ],
+        "ats_score": rng.randint(55, 92),
+        "ats_feedback": "Clear structure and relevant skills. Add metrics to bullets and link your GitHub.",
+        "missing_skills": rng.sample(
+            ["Docker - reproducible deploys", "TypeScript - safer frontends", "System Design - senior interviews",
+             "CI/CD - GitHub Actions", "Kubernetes - cloud-native roles", "Testing - pytest/Jest coverage",
+             "SQL tuning - backend depth"], 5
+        ),
+        "quick_wins": [
+            "Add numbers to 3 bullets (1 hour)",
+            "Pin 2 projects with live demos on GitHub (1 day)",
+            "List your tech stack per project (30 minutes)"
+        ],
+        "salary_prediction": {"min": low, "max": low * 2, "currency": "INR"},
+        "summary": f"Solid foundation in {shown}. Pick one niche, ship a production-grade project and target {roles[0][0]} roles."
+    }
+    # Gemini usually wraps JSON in a fenced block; parse_analysis handles both
+    return "```json\n" + json.dumps(result, ensure_ascii=False, indent=2) + "\n```"
@@ -0,0 +1,187 @@
+"""
+Structured, queue-backed logging for the request path
+
+- Request handlers only put records on an in-memory queue; a background
+  listener thread formats and writes them, so no stdout I/O happens
+  while serving a request (a full queue drops records instead of blocking)
+- Every record carries the request ID of the request that produced it
+- INFO/DEBUG records can be sampled per request (keep all or none of a
+  request's lines); warnings and errors are always kept
+- Emails and phone numbers are redacted before anything is written
+- One logger per stage ("ml.parse", "ml.ner", "ml.skills", "ml.gemini",
+  ...) with its own level, e.g. ML_LOG_LEVELS="ner=DEBUG,gemini=WARNING"
+
+Usage:
+    log = get_logger("skills")
+    log.info("Skills matched", extra={"fields": {"count": 12}})
+"""
+
+import contextvars
+import json
+import logging
+import logging.handlers
+import queue
+import re
+import sys
+import zlib
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+
+from app import config
+
+# Set per request by the middleware in main.py; copied into stage tasks
+request_id_var: contextvars.ContextVar[str] = contextvars.ContextVar("request_id", default="-")
+
+ROOT_LOGGER = "ml"
+
+_EMAIL = re.compile(r"[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}")
+_PHONE = re.compile(r"(?<!\w)\+?\d[\d\s\-().]{8,}\d(?!\w)")
+
+
+def _mask_phone(match: "re.Match") -> str:
+    # Date ranges and timings also look like digit runs; phones have 10+ digits
+    return "[phone]" if sum(c.isdigit() for c in match.group()) >= 10 else match.group()
+
+
+def redact(text: str) -> str:
+    """Mask email addresses and phone numbers"""
+    return _PHONE.sub(_mask_phone, _EMAIL.sub("[email]", text))
+
+
+def get_logger(stage: str) -> logging.Logger:
+    """Logger for one stage, e.g. get_logger("ner") -> "ml.ner" """
+    return logging.getLogger(f"{ROOT_LOGGER}.{stage}")
+
+
+class RequestContextFilter(logging.Filter):
+    """Stamp the current request ID on the record (runs in the caller)"""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = request_id_var.get()
+        return True
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Keep a fraction of requests' INFO/DEBUG records
+
+    The decision is a hash of the request ID, so a sampled request keeps
+    all of its lines. Records outside a request are always kept.
+    """
+
+    def __init__(self, rate: float):
+        super().__init__()
+        self.threshold = int(max(0.0, min(1.0, rate)) * 10000)
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING or self.threshold >= 10000:
+            return True
+        request_id = getattr(record, "request_id", "-")
+        if request_id == "-":
+            return True
+        return zlib.crc32(request_id.encode("utf-8")) % 10000 < self.threshold
+
+
+class RedactingFilter(logging.Filter):
+    """Mask PII in the message and fields (runs on the listener thread)"""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.msg = redact(str(record.msg))
+        fields = getattr(record, "fields", None)
+        if fields:
+            record.fields = {
+                key: redact(value) if isinstance(value, str) else value
+                for key, value in fields.items()
+            }
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry: Dict[str, Any] = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "request_id": getattr(record, "request_id", "-"),
+            "message": record.getMessage()
+        }
+        entry.update(getattr(record, "fields", None) or {})
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class TextFormatter(logging.Formatter):
+    """Human-readable lines for local development"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        fields = getattr(record, "fields", None) or {}
+        extra = " ".join(f"{key}={value}" for key, value in fields.items())
+        time_str = datetime.fromtimestamp(record.created).strftime("%H:%M:%S")
+        line = f"{time_str} {record.levelname:<7} [{getattr(record, 'request_id', '-')}] {record.name}: {record.getMessage()}"
+        return f"{line} {extra}" if extra else line
+
+
+class _DroppingQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that drops records when the queue is full instead of erroring"""
+
+    dropped = 0
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            _DroppingQueueHandler.dropped += 1
+
+
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+def _parse_levels(spec: str) -> Dict[str, int]:
+    """"ner=DEBUG,gemini=WARNING" -> {"ner": 10, "gemini": 30} (bad entries skipped)"""
+    levels = {}
+    for part in spec.split(","):
+        stage, _, level = part.partition("=")
+        value = logging.getLevelName(level.strip().upper())
+        if stage.strip() and isinstance(value, int):
+            levels[stage.strip()] = value
+    return levels
+
+
+def setup_logging() -> None:
+    """
+    Route the "ml" loggers through a queue to a background writer
+
+    Idempotent; call once per process (app lifespan, CPU worker init).
+    """
+    global _listener
+    if _listener is not None:
+        return
+
+    output = logging.StreamHandler(sys.stdout)
+    output.setFormatter(JsonFormatter() if config.LOG_FORMAT == "json" else TextFormatter())
+    output.addFilter(RedactingFilter())
+
+    records: queue.Queue = queue.Queue(maxsize=config.LOG_QUEUE_SIZE)
+    handler = _DroppingQueueHandler(records)
+    handler.addFilter(RequestContextFilter())
+    handler.addFilter(SamplingFilter(config.LOG_SAMPLE_RATE))
+
+    root = logging.getLogger(ROOT_LOGGER)
+    root.handlers[:] = [handler]
+    level = logging.getLevelName(config.LOG_LEVEL.upper())
+    root.setLevel(level if isinstance(level, int) else logging.INFO)
+    root.propagate = False
+    for stage, level in _parse_levels(config.LOG_STAGE_LEVELS).items():
+        get_logger(stage).setLevel(level)
+
+    _listener = logging.handlers.QueueListener(records, output, respect_handler_level=False)
+    _listener.start()
+
+
+def shutdown_logging() -> None:
+    """Flush queued records and stop the writer thread"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
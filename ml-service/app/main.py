@@ -5,25 +5,82 @@ This is the entry point for the ML service
 Architecture:
 - FastAPI handles HTTP requests
 - CORS enabled for Next.js frontend communication
-- Async processing for better performance
+- Blocking pipeline stages run on a bounded executor (app/executors.py)
 - Comprehensive error handling
-- Detailed logging for debugging
+- Structured, queue-backed logging with request IDs (app/logging_config.py)
 
 Endpoints:
 - GET / : Health check and service info
+- GET /health : Liveness (cheap, used by the Docker HEALTHCHECK)
+- GET /ready : Readiness (models warm) for load balancers
+- GET /health/deep : Cached micro-inference on the loaded models
+- GET /cache/stats : Result and stage cache counters
+- GET /metrics : Prometheus metrics (stage latency, caches, queue, memory)
 - POST /analyze-resume : Main resume analysis endpoint
+- POST /analyze-resume/stream : Same pipeline, stage results streamed (NDJSON/SSE)
+- POST /analyze-resumes/batch : Many resumes (or a zip), streamed as NDJSON
 """
 
-from fastapi import FastAPI, File, UploadFile, HTTPException
+from fastapi import FastAPI, File, UploadFile, HTTPException, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from contextlib import asynccontextmanager
+from typing import List
+import asyncio
+import os
 import time
+import uuid
+import zipfile
 
 # Import our custom modules
-from app.parsers import extract_resume_text
-from app.ner_extractor import extract_entities
-from app.skill_matcher import extract_skills
-from app.gemini_analyzer import analyze_with_gemini
 from app.models import ResumeAnalysisResponse
+from app.executors import executor, QueueFullError
+from app.model_registry import registry
+from app.health import run_micro_inference
+from app.cache import result_cache, stage_caches
+from app.pipeline import StageEvent, lookup_cached, replay_cached, run_pipeline
+from app.batch import collect_sources, stream_batch
+from app.metrics import REQUEST_SECONDS, REQUESTS, current_rss_bytes, metrics
+from app.logging_config import get_logger, request_id_var, setup_logging, shutdown_logging
+from app.uploads import SpooledUpload, UploadLimitMiddleware, UploadTooLargeError, spool_upload
+from app import config
+
+
+log = get_logger("request")
+
+
+async def warm_up_models(app: FastAPI):
+    """
+    Background warm-up: load models in every CPU worker, then the Gemini
+    client here. The process serves /health and /ready meanwhile.
+    """
+    try:
+        app.state.worker_models = await executor.warm_up()
+        await executor.run_io(registry.warm_up, ["gemini"])
+        app.state.models_warm = True
+        log.info("Models warm", extra={"fields": {"startup_seconds": registry.startup_seconds}})
+    except Exception as e:
+        log.error("Model warm-up failed", extra={"fields": {"error": str(e)}})
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Start the worker pools (and warm-up) with the app, stop them on shutdown"""
+    setup_logging()
+    executor.start()
+    app.state.models_warm = False
+    app.state.worker_models = []
+    warm_task = None
+    if not config.FAST_START:
+        warm_task = asyncio.create_task(warm_up_models(app))
+    try:
+        yield
+    finally:
+        if warm_task is not None:
+            warm_task.cancel()
+        executor.shutdown()
+        shutdown_logging()
+
 
 # Initialize FastAPI application
 app = FastAPI(
@@ -31,7 +88,8 @@ app = FastAPI(
     description="AI-powered resume analysis using spaCy, Sentence-BERT, and Google Gemini",
     version="1.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    lifespan=lifespan
 )
 
 # Configure CORS
@@ -47,6 +105,42 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@app.middleware("http")
+async def assign_request_id(request: Request, call_next):
+    """Tag the request (and every log line it produces) with an ID"""
+    request_id = request.headers.get("x-request-id") or uuid.uuid4().hex[:16]
+    token = request_id_var.set(request_id[:64])
+    try:
+        response = await call_next(request)
+        response.headers["X-Request-ID"] = request_id_var.get()
+        return response
+    finally:
+        request_id_var.reset(token)
+
+@app.middleware("http")
+async def record_request_metrics(request: Request, call_next):
+    """Request count and latency per route (streams: until headers are sent)"""
+    began = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        route = request.scope.get("route")
+        path = getattr(route, "path", "unmatched")
+        REQUEST_SECONDS.observe(time.perf_counter() - began, path=path)
+        REQUESTS.inc(path=path, status=status)
+
+# Outermost: oversized bodies get a 413 before the multipart parser sees them
+# (a little headroom over the file limit for the multipart framing)
+_MULTIPART_OVERHEAD = 64 * 1024
+app.add_middleware(UploadLimitMiddleware, limits={
+    "/analyze-resume": config.MAX_UPLOAD_MB * 1024 * 1024 + _MULTIPART_OVERHEAD,
+    "/analyze-resume/stream": config.MAX_UPLOAD_MB * 1024 * 1024 + _MULTIPART_OVERHEAD,
+    "/analyze-resumes/batch": config.BATCH_MAX_UPLOAD_MB * 1024 * 1024 + _MULTIPART_OVERHEAD
+})
+
 @app.get("/")
 async def root():
     """Root endpoint - Health check and service information"""
@@ -63,51 +157,192 @@ async def root():
         },
         "endpoints": {
             "analyze": "/analyze-resume (POST)",
+            "analyze_stream": "/analyze-resume/stream (POST)",
+            "analyze_batch": "/analyze-resumes/batch (POST)",
             "docs": "/docs",
-            "health": "/"
+            "health": "/health",
+            "ready": "/ready",
+            "deep_health": "/health/deep",
+            "metrics": "/metrics"
         }
     }
 
+@app.get("/ready")
+async def readiness_check(response: Response):
+    """
+    Readiness: "process up" is /health, "models warm" is this endpoint
+    
+    Returns 503 until the warm-up task has loaded every model. In
+    fast-start mode models load on first use, so the service reports
+    ready immediately.
+    """
+    ready = app.state.models_warm or config.FAST_START
+    if not ready:
+        response.status_code = 503
+    
+    return {
+        "status": "ready" if ready else "warming",
+        "fast_start": config.FAST_START,
+        "models_warm": app.state.models_warm,
+        "startup_seconds": registry.startup_seconds,
+        "models": registry.status(),
+        "workers": app.state.worker_models
+    }
+
 @app.get("/health")
 async def health_check():
-    """Detailed health check endpoint"""
-    health_status = {
-        "status": "healthy",
-        "checks": {}
+    """
+    Liveness: the process is up and the event loop is responsive
+    
+    Cheap on purpose - the Docker HEALTHCHECK calls this every 30s.
+    Model state is reported by /ready and /health/deep.
+    """
+    return {
+        "status": "alive",
+        "uptime_seconds": round(time.perf_counter() - config.PROCESS_STARTED, 1),
+        "pending_requests": executor.pending
     }
+
+# Last deep-health result, reused for HEALTH_DEEP_CACHE_SECONDS
+_deep_health = {"checked_at": 0.0, "result": None}
+_deep_health_lock = asyncio.Lock()
+
+@app.get("/health/deep")
+async def deep_health_check(response: Response):
+    """
+    Deep diagnostics: cached micro-inference on the loaded models
     
-    # Check spaCy
-    try:
-        import spacy
-        nlp = spacy.load("en_core_web_sm")
-        health_status["checks"]["spacy"] = "✓ Loaded"
-    except Exception as e:
-        health_status["checks"]["spacy"] = f"✗ Error: {str(e)}"
-        health_status["status"] = "degraded"
+    Runs a tiny spaCy + Sentence-BERT inference in a CPU worker and
+    reports per-model latency. Results are cached so frequent probes
+    don't add load; models are never constructed here.
+    """
+    async with _deep_health_lock:
+        age = time.monotonic() - _deep_health["checked_at"]
+        if _deep_health["result"] is None or age > config.HEALTH_DEEP_CACHE_SECONDS:
+            began = time.perf_counter()
+            try:
+                worker = await executor.run_cpu(run_micro_inference)
+            except Exception as e:
+                worker = {"error": str(e), "checks": {}}
+            checks = worker.get("checks", {})
+            checks["gemini"] = {
+                "status": "ok" if os.getenv("GEMINI_API_KEY") or config.LLM_BACKEND == "mock" else "missing_api_key",
+                "backend": config.LLM_BACKEND,
+                "client_loaded": registry.is_loaded("gemini")
+            }
+            if registry.is_loaded("gemini"):
+                checks["gemini"]["client"] = registry.peek("gemini").status()
+            healthy = "error" not in worker and all(
+                c.get("status") in ("ok", "not_loaded") for c in checks.values()
+            )
+            _deep_health["result"] = {
+                "status": "healthy" if healthy else "degraded",
+                "probe_ms": round((time.perf_counter() - began) * 1000, 2),
+                "worker_pid": worker.get("pid"),
+                "checks": checks
+            }
+            _deep_health["checked_at"] = time.monotonic()
+            age = 0.0
     
-    # Check Sentence-BERT
-    try:
-        from sentence_transformers import SentenceTransformer
-        model = SentenceTransformer('paraphrase-MiniLM-L3-v2')
-        health_status["checks"]["sentence_bert"] = "✓ Loaded"
-    except Exception as e:
-        health_status["checks"]["sentence_bert"] = f"✗ Error: {str(e)}"
-        health_status["status"] = "degraded"
+    result = dict(_deep_health["result"], cached=age > 0, age_seconds=round(age, 1))
+    if result["status"] != "healthy":
+        response.status_code = 503
+    return result
+
+@app.get("/cache/stats")
+async def cache_stats():
+    """Hit/miss/eviction counters for the result cache and each stage cache"""
+    return {
+        "result": await executor.run_io(result_cache.stats),
+        "stages": {name: cache.stats() for name, cache in stage_caches.items()}
+    }
+
+def _cache_events():
+    caches = {"result": result_cache.memory, "result_disk": result_cache.disk, **stage_caches}
+    return {
+        (name, event): getattr(cache, event)
+        for name, cache in caches.items() if cache is not None
+        for event in ("hits", "misses", "evictions")
+    }
+
+def _llm_events():
+    client = registry.peek("gemini")
+    if client is None:
+        return {}
+    return {(event,): value for event, value in client.stats.items()}
+
+def _resident_memory():
+    values = {("main",): current_rss_bytes()}
+    for pid, snapshot in metrics.worker_snapshots.items():
+        values[(f"worker-{pid}",)] = snapshot["rss_bytes"]
+    return values
+
+def _model_memory():
+    values = {(name, "main"): size for name, size in registry.load_rss_bytes.items()}
+    for pid, snapshot in metrics.worker_snapshots.items():
+        for name, size in snapshot["model_rss_bytes"].items():
+            values[(name, f"worker-{pid}")] = size
+    return values
+
+# Read at scrape time from state the service already keeps
+metrics.callback("resume_pending_requests", "Requests admitted (running or queued)", (), "gauge",
+                 lambda: {(): executor.pending})
+metrics.callback("resume_pending_requests_limit", "Admission limit before 503", (), "gauge",
+                 lambda: {(): executor.max_pending})
+metrics.callback("resume_executor_in_flight", "Tasks submitted to each pool and not finished", ("pool",), "gauge",
+                 lambda: {(pool,): count for pool, count in executor.in_flight.items()})
+metrics.callback("resume_cache_events_total", "Cache hits, misses and evictions", ("cache", "event"), "counter",
+                 _cache_events)
+metrics.callback("resume_llm_client_events_total", "Gemini client calls, retries, hedges, timeouts", ("event",), "counter",
+                 _llm_events)
+metrics.callback("resume_llm_circuit_open", "1 while the Gemini circuit breaker is not closed", (), "gauge",
+                 lambda: {(): int(registry.peek("gemini").breaker.state != "closed")} if registry.is_loaded("gemini") else {})
+metrics.callback("resume_process_resident_memory_bytes", "Resident memory per process", ("process",), "gauge",
+                 _resident_memory)
+metrics.callback("resume_model_memory_bytes", "Resident memory added while loading each model", ("model", "process"), "gauge",
+                 _model_memory)
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def prometheus_metrics():
+    """Prometheus text exposition of every metric in app/metrics.py"""
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
+async def read_resume_upload(file: UploadFile) -> SpooledUpload:
+    """
+    Validate the file type and spool the upload to a temp file
+    
+    The caller must remove() the returned upload when done.
     
-    # Check Gemini (FIXED for new SDK)
+    Raises:
+        HTTPException: 400 for anything but PDF/DOCX, 413 if too large
+    """
+    # Validate file type
+    if not file.filename.lower().endswith(('.pdf', '.docx')):
+        raise HTTPException(
+            status_code=400,
+            detail="Invalid file type. Only PDF and DOCX files are supported."
+        )
+    
+    # STEP 1: Copy to disk in chunks (hashing as we go), capped at MAX_UPLOAD_MB
     try:
-        from google import genai  # FIXED
-        import os
-        if os.getenv("GEMINI_API_KEY"):
-            health_status["checks"]["gemini"] = "✓ API key configured"
-        else:
-            health_status["checks"]["gemini"] = "✗ API key missing"
-            health_status["status"] = "degraded"
-    except Exception as e:
-        health_status["checks"]["gemini"] = f"✗ Error: {str(e)}"
-        health_status["status"] = "degraded"
+        upload = await spool_upload(file, config.MAX_UPLOAD_MB * 1024 * 1024)
+    except UploadTooLargeError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    # The filename often contains the candidate's name, so it isn't logged
+    log.info("Resume received", extra={"fields": {
+        "bytes": upload.size,
+        "content_type": file.content_type
+    }})
     
-    return health_status
+    return upload
+
+def busy_error() -> HTTPException:
+    """503 returned when the pipeline queue is full"""
+    return HTTPException(
+        status_code=503,
+        detail="Server is busy analyzing other resumes. Please retry shortly.",
+        headers={"Retry-After": str(config.RETRY_AFTER_SECONDS)}
+    )
 
 @app.post("/analyze-resume", response_model=ResumeAnalysisResponse)
 async def analyze_resume(file: UploadFile = File(...)):
@@ -115,116 +350,156 @@ async def analyze_resume(file: UploadFile = File(...)):
     Main endpoint: Analyze uploaded resume
     
     Process Flow:
-    1. Extract text using PyMuPDF/docx2txt
-    2. Extract entities using spaCy NER
-    3. Extract skills using Sentence-BERT
-    4. Analyze with Google Gemini
-    5. Return comprehensive analysis
+    1. Return the cached result if these exact bytes were analysed before
+    2. Extract text using PyMuPDF/docx2txt
+    3. Extract entities using spaCy NER
+    4. Extract skills using Sentence-BERT
+    5. Analyze with Google Gemini
+    6. Cache and return comprehensive analysis
     """
     
     start_time = time.time()
+    upload = None
+    response = None
     
     try:
-        # Validate file type
-        if not file.filename.lower().endswith(('.pdf', '.docx')):
-            raise HTTPException(
-                status_code=400,
-                detail="Invalid file type. Only PDF and DOCX files are supported."
-            )
+        upload = await read_resume_upload(file)
         
-        print(f"\n{'='*60}")
-        print(f"📄 Processing Resume: {file.filename}")
-        print(f"{'='*60}")
+        # Same bytes + same pipeline version = same analysis
+        # Checked before admission so cache hits are never rejected with 503
+        cache_key, cached = await lookup_cached(upload.sha256, start_time)
+        if cached is not None:
+            log.info("Cache hit - returning stored analysis")
+            return cached
         
-        # STEP 1: Read file
-        print("\n[1/5] 📖 Reading uploaded file...")
-        file_bytes = await file.read()
-        file_size_mb = len(file_bytes) / (1024 * 1024)
-        print(f"  ✓ File size: {file_size_mb:.2f} MB")
-        print(f"  ✓ File type: {file.content_type}")
+        # Reserve a pipeline slot (503 when the queue is full)
+        async with executor.admit():
+            async for event in run_pipeline(upload.path, file.filename, cache_key, start_time):
+                if event.stage == "result":
+                    response = event.data
         
-        # STEP 2: Extract text
-        print("\n[2/5] 📝 Extracting text from document...")
-        text = extract_resume_text(file_bytes, file.filename)
-        text_length = len(text)
-        word_count = len(text.split())
-        print(f"  ✓ Extracted {text_length} characters")
-        print(f"  ✓ Word count: {word_count}")
-        
-        if text_length < 100:
+        if response is None:
             raise HTTPException(
-                status_code=400,
-                detail="Resume text too short. Please upload a complete resume."
+                status_code=500,
+                detail="Resume analysis failed: the pipeline finished without a result"
             )
-        
-        # STEP 3: Extract entities
-        print("\n[3/5] 🔍 Extracting entities with spaCy NER...")
-        entities = extract_entities(text)
-        print(f"  ✓ Name: {entities.name or 'Not found'}")
-        print(f"  ✓ Email: {entities.email or 'Not found'}")
-        print(f"  ✓ Phone: {entities.phone or 'Not found'}")
-        print(f"  ✓ Companies: {len(entities.organizations)} found")
-        print(f"  ✓ Locations: {len(entities.locations)} found")
-        
-        # STEP 4: Extract skills
-        print("\n[4/5] 🎯 Extracting skills with Sentence-BERT...")
-        skills = extract_skills(text)
-        print(f"  ✓ Found {len(skills)} skills")
-        if skills:
-            top_skills = [s.skill for s in skills[:5]]
-            print(f"  ✓ Top 5 skills: {', '.join(top_skills)}")
-        
-        # STEP 5: Gemini analysis
-        print("\n[5/5] 🤖 Analyzing with Google Gemini 2.5 Flash Lite...")
-        gemini_analysis = analyze_with_gemini(
-            resume_text=text,
-            extracted_skills=[
-                {"skill": s.skill, "confidence": s.confidence} 
-                for s in skills
-            ],
-            entities=entities.model_dump()
-        )
-        print(f"  ✓ ATS Score: {gemini_analysis.ats_score}/100")
-        if gemini_analysis.career_recommendations:
-            top_role = gemini_analysis.career_recommendations[0].role
-            top_score = gemini_analysis.career_recommendations[0].match_score
-            print(f"  ✓ Top recommendation: {top_role} ({top_score}% match)")
-        
-        # Calculate processing time
-        processing_time = round(time.time() - start_time, 2)
-        print(f"\n{'='*60}")
-        print(f"⏱️  Total processing time: {processing_time} seconds")
-        print(f"{'='*60}\n")
-        
-        # Build response
-        response = ResumeAnalysisResponse(
-            status="success",
-            processing_time=processing_time,
-            extracted_info=entities,
-            skills=skills,
-            analysis=gemini_analysis,
-            technologies_used={
-                "pdf_parser": "PyMuPDF" if file.filename.endswith('.pdf') else "docx2txt",
-                "ner": "spaCy en_core_web_sm v3.7.0",
-                "skill_extraction": "Sentence-BERT paraphrase-MiniLM-L3-v2",
-                "career_analysis": "Google Gemini 2.5 Flash Lite"  # FIXED
-            }
-        )
-        
         return response
     
     except HTTPException:
         raise
     
+    except QueueFullError:
+        raise busy_error()
+    
     except Exception as e:
-        print(f"\n{'='*60}")
-        print(f"❌ ERROR: {str(e)}")
-        print(f"{'='*60}\n")
+        log.exception("Resume analysis failed")
         
         raise HTTPException(
             status_code=500,
             detail=f"Resume analysis failed: {str(e)}"
         )
+    
+    finally:
+        if upload is not None:
+            upload.remove()
+
+@app.post("/analyze-resume/stream")
+async def analyze_resume_stream(request: Request, file: UploadFile = File(...), format: str = "ndjson"):
+    """
+    Streaming variant of /analyze-resume
+    
+    Emits each stage as soon as it's ready, so clients can render partial
+    results while Gemini is still running:
+    text → entities → skills → analysis → result (full response)
+    
+    Failures after the stream has started arrive as an "error" event.
+    
+    Formats:
+    - NDJSON (default): one {"event": ..., "data": ...} object per line
+    - SSE: format=sse or "Accept: text/event-stream"
+    """
+    
+    start_time = time.time()
+    sse = format == "sse" or "text/event-stream" in request.headers.get("accept", "")
+    
+    upload = await read_resume_upload(file)
+    try:
+        cache_key, cached = await lookup_cached(upload.sha256, start_time)
+        if cached is None:
+            # Taken before the response starts so a full queue is still a 503
+            executor.acquire()
+    except QueueFullError:
+        upload.remove()
+        raise busy_error()
+    except BaseException:
+        upload.remove()
+        raise
+    
+    async def body():
+        try:
+            if cached is not None:
+                for event in replay_cached(cached):
+                    yield event.to_sse() if sse else event.to_ndjson()
+                return
+            async for event in run_pipeline(upload.path, file.filename, cache_key, start_time):
+                yield event.to_sse() if sse else event.to_ndjson()
+        except HTTPException as e:
+            event = StageEvent("error", {"status_code": e.status_code, "detail": e.detail})
+            yield event.to_sse() if sse else event.to_ndjson()
+        except Exception as e:
+            log.exception("Resume analysis failed")
+            event = StageEvent("error", {"status_code": 500, "detail": f"Resume analysis failed: {str(e)}"})
+            yield event.to_sse() if sse else event.to_ndjson()
+        finally:
+            upload.remove()
+            if cached is None:
+                executor.release()
+    
+    return StreamingResponse(
+        body(),
+        media_type="text/event-stream" if sse else "application/x-ndjson",
+        # Disable proxy buffering so each event reaches the client immediately
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@app.post("/analyze-resumes/batch")
+async def analyze_resumes_batch(files: List[UploadFile] = File(...), include_analysis: bool = True):
+    """
+    Batch endpoint: analyze many resumes in one request
+    
+    Accepts any mix of PDF, DOCX and ZIP uploads. Resumes are processed
+    in chunks across the worker processes (nlp.pipe + one batched
+    Sentence-BERT encode per chunk) and each result is streamed back as
+    one NDJSON line as soon as it's ready, followed by a summary line.
+    
+    Set include_analysis=false to skip the Gemini step.
+    """
+    try:
+        sources = await collect_sources(files)
+    except (ValueError, zipfile.BadZipFile) as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    if not sources:
+        raise HTTPException(status_code=400, detail="No PDF or DOCX resumes found in upload.")
+    
+    # The whole batch holds one pipeline slot until the stream ends
+    try:
+        executor.acquire()
+    except QueueFullError:
+        raise busy_error()
+    
+    log.info("Batch started", extra={"fields": {"resumes": len(sources)}})
+    
+    async def body():
+        # Uploads stay open until the response is sent (FastAPI closes
+        # form files after the response), so sources can be read lazily
+        try:
+            async for line in stream_batch(sources, include_analysis):
+                yield line
+        finally:
+            executor.release()
+    
+    return StreamingResponse(body(), media_type="application/x-ndjson")
 
 # Run server when executed directly
 if __name__ == "__main__":
@@ -0,0 +1,268 @@
+"""
+Lightweight metrics with Prometheus text exposition (served on /metrics)
+
+- Counter / Histogram: updated on the hot path (a dict update under a lock)
+- Callback metrics: read at scrape time from state that already exists
+  (cache counters, executor queue depth, Gemini client stats, memory), so
+  they cost nothing per request
+
+Worker processes have their own copy of this module. In a worker,
+observations are buffered instead of applied; executors.run_cpu ships the
+buffer back with each task's result and replays it into the parent, so
+/metrics covers work done in every process.
+"""
+
+import bisect
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+# Seconds; covers sub-millisecond similarity up to slow Gemini calls
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+Labels = Tuple[str, ...]
+
+
+def _escape(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: Iterable[str], values: Iterable[Any]) -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, registry: "MetricsRegistry", name: str, help_text: str, labelnames: Tuple[str, ...]):
+        self.registry = registry
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = labelnames
+
+    def _key(self, labels: Dict[str, Any]) -> Labels:
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    def _record(self, labels: Dict[str, Any], value: float) -> None:
+        key = self._key(labels)
+        if self.registry._buffer is not None:
+            self.registry._buffer.append((self.name, key, value))
+        else:
+            with self.registry._lock:
+                self._apply(key, value)
+
+    def _apply(self, key: Labels, value: float) -> None:
+        raise NotImplementedError
+
+    def samples(self) -> List[Tuple[str, Labels, float]]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    """Monotonic count, e.g. requests or fallbacks"""
+
+    kind = "counter"
+
+    def __init__(self, *args):
+        super().__init__(*args)
+        self._values: Dict[Labels, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: Any) -> None:
+        self._record(labels, amount)
+
+    def _apply(self, key: Labels, value: float) -> None:
+        self._values[key] = self._values.get(key, 0.0) + value
+
+    def samples(self) -> List[Tuple[str, Labels, float]]:
+        return [(self.name, key, value) for key, value in self._values.items()]
+
+
+class Histogram(_Metric):
+    """Latency distribution with cumulative buckets, sum and count"""
+
+    kind = "histogram"
+
+    def __init__(self, *args, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        super().__init__(*args)
+        self.buckets = tuple(sorted(buckets)) + (float("inf"),)
+        self._counts: Dict[Labels, List[int]] = {}
+        self._sums: Dict[Labels, float] = {}
+
+    def observe(self, value: float, **labels: Any) -> None:
+        self._record(labels, value)
+
+    def _apply(self, key: Labels, value: float) -> None:
+        counts = self._counts.setdefault(key, [0] * len(self.buckets))
+        counts[bisect.bisect_left(self.buckets, value)] += 1
+        self._sums[key] = self._sums.get(key, 0.0) + value
+
+    def samples(self) -> List[Tuple[str, Labels, float]]:
+        out = []
+        for key, counts in self._counts.items():
+            cumulative = 0
+            for bound, count in zip(self.buckets, counts):
+                cumulative += count
+                out.append((f"{self.name}_bucket", key + (_format_value(bound),), cumulative))
+            out.append((f"{self.name}_sum", key, self._sums[key]))
+            out.append((f"{self.name}_count", key, cumulative))
+        return out
+
+
+class CallbackMetric(_Metric):
+    """Gauge or counter whose values are read from a function at scrape time"""
+
+    def __init__(self, registry, name, help_text, labelnames, kind: str,
+                 collect: Callable[[], Dict[Labels, float]]):
+        super().__init__(registry, name, help_text, labelnames)
+        self.kind = kind
+        self.collect = collect
+
+    def samples(self) -> List[Tuple[str, Labels, float]]:
+        try:
+            values = self.collect()
+        except Exception:
+            return []
+        return [(self.name, tuple(str(v) for v in key), value)
+                for key, value in values.items() if value is not None]
+
+
+class MetricsRegistry:
+    """All metrics of this process, rendered in Prometheus text format"""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+        self._buffer: Optional[List[Tuple[str, Labels, float]]] = None
+        # Last resource snapshot reported by each worker process, by pid
+        self.worker_snapshots: Dict[int, Dict[str, Any]] = {}
+
+    def counter(self, name: str, help_text: str, labelnames: Tuple[str, ...] = ()) -> Counter:
+        return self._add(Counter(self, name, help_text, labelnames))
+
+    def histogram(self, name: str, help_text: str, labelnames: Tuple[str, ...] = (),
+                  buckets: Tuple[float, ...] = DEFAULT_BUCKETS) -> Histogram:
+        return self._add(Histogram(self, name, help_text, labelnames, buckets=buckets))
+
+    def callback(self, name: str, help_text: str, labelnames: Tuple[str, ...], kind: str,
+                 collect: Callable[[], Dict[Labels, float]]) -> CallbackMetric:
+        """Register a gauge/counter computed by collect() on each scrape"""
+        return self._add(CallbackMetric(self, name, help_text, labelnames, kind, collect))
+
+    def _add(self, metric: _Metric) -> Any:
+        self._metrics[metric.name] = metric
+        return metric
+
+    # -- worker processes -------------------------------------------------
+
+    def buffer_observations(self) -> None:
+        """Switch this process to buffering (called in CPU workers)"""
+        self._buffer = []
+
+    def drain(self) -> List[Tuple[str, Labels, float]]:
+        """Take the buffered observations (empty outside workers)"""
+        if self._buffer is None:
+            return []
+        observations, self._buffer = self._buffer, []
+        return observations
+
+    def replay(self, observations: List[Tuple[str, Labels, float]]) -> None:
+        """Apply observations drained in a worker process"""
+        if not observations:
+            return
+        with self._lock:
+            for name, key, value in observations:
+                metric = self._metrics.get(name)
+                if metric is not None:
+                    metric._apply(tuple(key), value)
+
+    # -- exposition -------------------------------------------------------
+
+    def render(self) -> str:
+        lines = []
+        for metric in list(self._metrics.values()):
+            if isinstance(metric, CallbackMetric):
+                samples = metric.samples()  # reads its own state, no lock needed
+            else:
+                with self._lock:
+                    samples = metric.samples()
+            lines.append(f"# HELP {metric.name} {metric.help_text}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            for sample_name, key, value in samples:
+                names = metric.labelnames + (("le",) if sample_name.endswith("_bucket") else ())
+                lines.append(f"{sample_name}{_format_labels(names, key)} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+def current_rss_bytes() -> Optional[int]:
+    """Resident memory of this process (Linux /proc; None elsewhere)"""
+    try:
+        with open("/proc/self/statm", "rb") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+
+
+# One registry per process
+metrics = MetricsRegistry()
+
+STAGE_SECONDS = metrics.histogram(
+    "resume_stage_seconds",
+    "Compute time per step: parse, ner, encode, similarity, gemini",
+    ("stage",)
+)
+STAGE_WALL_SECONDS = metrics.histogram(
+    "resume_stage_wall_seconds",
+    "Wall time per pipeline stage including executor queueing",
+    ("stage",)
+)
+REQUEST_SECONDS = metrics.histogram(
+    "resume_http_request_seconds",
+    "HTTP request latency (until response headers for streams)",
+    ("path",)
+)
+REQUESTS = metrics.counter(
+    "resume_http_requests_total",
+    "HTTP requests by path and status code",
+    ("path", "status")
+)
+ERRORS = metrics.counter(
+    "resume_errors_total",
+    "Pipeline failures by stage",
+    ("stage",)
+)
+FALLBACKS = metrics.counter(
+    "resume_gemini_fallbacks_total",
+    "Rule-based analyses served instead of Gemini, by reason",
+    ("reason",)
+)
+
+SKILL_CHUNKS = metrics.counter(
+    "resume_skill_chunks_total",
+    "Resume chunks by outcome: embedded, settled by the skill lexicon, or dropped before SBERT (by reason)",
+    ("outcome",)
+)
+
+NER_PATH = metrics.counter(
+    "resume_ner_path_total",
+    "Resumes whose entities came from the rule layer alone or needed the spaCy model",
+    ("path",)
+)
+
+
+@contextmanager
+def time_stage(stage: str):
+    """Observe the block's duration in resume_stage_seconds"""
+    began = time.perf_counter()
+    try:
+        yield
+    finally:
+        STAGE_SECONDS.observe(time.perf_counter() - began, stage=stage)
@@ -0,0 +1,107 @@
+"""
+Lazy model registry
+Models are loaded on first use (or by a warm-up task), not at import time
+
+Each model module registers a loader under a name:
+- "spacy"          → app/ner_extractor.py
+- "sentence_bert"  → app/skill_matcher.py
+- "skill_catalog"  → app/skill_matcher.py (skill DB + embeddings + index)
+- "gemini"         → app/gemini_analyzer.py
+
+registry.get(name) loads the model once per process (thread-safe) and
+records how long it took, so readiness and startup time can be reported.
+"""
+
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, Optional
+
+from app import config
+from app.metrics import current_rss_bytes
+
+
+class ModelRegistry:
+    """Named, lazily-loaded singletons with load timings"""
+
+    def __init__(self):
+        self._loaders: Dict[str, Callable[[], Any]] = {}
+        self._locks: Dict[str, threading.Lock] = {}
+        self._models: Dict[str, Any] = {}
+        self.load_seconds: Dict[str, float] = {}
+        # Resident memory growth while each model loaded (approximate size)
+        self.load_rss_bytes: Dict[str, int] = {}
+        self.errors: Dict[str, str] = {}
+        # Seconds from process start until warm-up finished (None = not yet)
+        self.startup_seconds: Optional[float] = None
+
+    def register(self, name: str, loader: Callable[[], Any]) -> None:
+        """Register a zero-argument loader (called at most once per process)"""
+        self._loaders[name] = loader
+        self._locks.setdefault(name, threading.Lock())
+
+    def get(self, name: str) -> Any:
+        """
+        Return the model, loading it on first use
+
+        Raises:
+            KeyError: If no loader is registered under this name
+        """
+        model = self._models.get(name)
+        if model is not None:
+            return model
+
+        with self._locks[name]:
+            # Another thread may have finished loading while we waited
+            if name not in self._models:
+                began = time.perf_counter()
+                rss_before = current_rss_bytes()
+                try:
+                    self._models[name] = self._loaders[name]()
+                except Exception as e:
+                    self.errors[name] = str(e)
+                    raise
+                self.load_seconds[name] = round(time.perf_counter() - began, 3)
+                rss_after = current_rss_bytes()
+                if rss_before is not None and rss_after is not None:
+                    self.load_rss_bytes[name] = max(0, rss_after - rss_before)
+                self.errors.pop(name, None)
+        return self._models[name]
+
+    def peek(self, name: str) -> Any:
+        """Return the model if already loaded, without triggering a load"""
+        return self._models.get(name)
+
+    def is_loaded(self, name: str) -> bool:
+        return name in self._models
+
+    def warm_up(self, names: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+        """
+        Load the given models (default: all registered) and report status
+
+        Failures are recorded in status() instead of raised, so one broken
+        model doesn't stop the others from warming.
+        """
+        for name in list(names or self._loaders):
+            try:
+                self.get(name)
+            except Exception:
+                pass
+        if self.startup_seconds is None:
+            self.startup_seconds = round(time.perf_counter() - config.PROCESS_STARTED, 3)
+        return self.status()
+
+    def status(self) -> Dict[str, Any]:
+        """Per-model load state, suitable for a JSON response"""
+        return {
+            name: {
+                "loaded": name in self._models,
+                "load_seconds": self.load_seconds.get(name),
+                "rss_delta_bytes": self.load_rss_bytes.get(name),
+                "error": self.errors.get(name)
+            }
+            for name in self._loaders
+        }
+
+
+# One registry per process
+registry = ModelRegistry()
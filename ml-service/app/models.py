@@ -14,6 +14,8 @@ class ExtractedEntity(BaseModel):
     name: Optional[str] = None
     email: Optional[str] = None
     phone: Optional[str] = None
+    linkedin: Optional[str] = None
+    github: Optional[str] = None
     organizations: List[str] = []
     locations: List[str] = []
     dates: List[str] = []
@@ -26,6 +28,18 @@ class Skill(BaseModel):
     skill: str                  # Skill name (e.g., "Python")
     confidence: float           # Similarity score (0.0 to 1.0)
     context: str               # Where in resume it was found
+    source: str = "semantic"   # Tier that found it: "lexicon" (exact) or "semantic" (SBERT)
+
+
+class ResumeSection(BaseModel):
+    """
+    Resume section found by layout-aware PDF extraction (ML_PDF_LAYOUT)
+    """
+    kind: str                  # header, summary, experience, skills, projects, education, ...
+    title: str                 # Heading as written (empty for the header)
+    page: int                  # 0-based page the section starts on
+    bbox: List[float]          # [x0, y0, x1, y1] in PDF points on that page
+    characters: int            # Length of the section text
 
 
 class CareerRecommendation(BaseModel):
@@ -58,6 +72,7 @@ class GeminiAnalysis(BaseModel):
     quick_wins: List[str]
     salary_prediction: SalaryPrediction
     summary: str
+    is_fallback: bool = False     # Rule-based fallback, Gemini unavailable
 
 
 class ResumeAnalysisResponse(BaseModel):
@@ -70,3 +85,21 @@ class ResumeAnalysisResponse(BaseModel):
     skills: List[Skill]
     analysis: GeminiAnalysis      # Changed from GPTAnalysis
     technologies_used: Dict[str, str]
+    cache_hit: bool = False       # Served from the result cache
+    stage_timings: Dict[str, float] = {}  # Seconds per stage (+ "critical_path")
+    critical_path: List[str] = []         # Slowest dependency chain of stages
+    sections: List[ResumeSection] = []    # Layout sections (PDFs, layout mode only)
+
+
+class BatchResumeResult(BaseModel):
+    """
+    One line of the /analyze-resumes/batch NDJSON stream
+    """
+    index: int                    # Position in the upload (zip members in archive order)
+    filename: str
+    status: str                   # "success" or "error"
+    error: Optional[str] = None
+    processing_time: float = 0.0  # Seconds from batch start until this result
+    extracted_info: Optional[ExtractedEntity] = None
+    skills: List[Skill] = []
+    analysis: Optional[GeminiAnalysis] = None
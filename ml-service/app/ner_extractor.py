@@ -2,68 +2,144 @@
 Named Entity Recognition using spaCy
 Extracts structured information from unstructured resume text
 Filters out noise and validates extracted entities
+
+Only doc.ents is ever read, so the pipeline is loaded trimmed: the
+tagger, parser, attribute ruler and lemmatizer are excluded (the parser
+alone is a large share of per-document cost), and so is the shared
+tok2vec when ner doesn't listen to it (en_core_web_sm's ner has its own).
+NER also only sees the sections that hold names, employers, places and
+dates - skill and project lists just produce false ORG/GPE hits.
+
+A rule layer (entity_rules.py) runs first: an EntityRuler built from
+gazetteers and patterns, plus the name from the header. When it is
+confident, the statistical model is skipped for that resume.
+
+Benchmark against the full pipeline with ner_benchmark.py.
 """
 
-import spacy
-import re
-from typing import Dict, List
+from collections import deque
+from typing import Deque, Iterable, Iterator, List, Tuple
+from app import config
+from app.chunker import select_sections
+from app.contact import scan_contact
+from app.entity_rules import RULER_NAME, add_entity_ruler, header_name, resume_rules, rules_confident
 from app.models import ExtractedEntity
+from app.model_registry import registry
+from app.metrics import NER_PATH, time_stage
+from app.logging_config import get_logger
 
-# Load spaCy English model (small, fast, CPU-friendly)
-try:
-    nlp = spacy.load("en_core_web_sm")
-    print("✓ spaCy model loaded successfully")
-except OSError:
-    print("⚠  Downloading spaCy model...")
-    import os
-    os.system("python -m spacy download en_core_web_sm")
-    nlp = spacy.load("en_core_web_sm")
 
+log = get_logger("ner")
 
-def extract_email(text: str) -> str:
+SPACY_MODEL = "en_core_web_sm"
+
+# Components extract_entities never reads
+UNUSED_COMPONENTS = ("tagger", "parser", "senter", "attribute_ruler", "lemmatizer")
+
+# Resume sections NER runs on (see chunker.py for section detection)
+NER_SECTIONS = ("header", "summary", "experience", "education", "certifications", "achievements", "other")
+
+
+def load_spacy_pipeline(full: bool = False, rules: bool = False):
     """
-    Extract email address using regex pattern
-    
-    Pattern matches: username@domain.com
-    Handles dots, underscores, hyphens in username
+    Load the spaCy model, trimmed to what NER needs unless full=True
     
     Args:
-        text: Full resume text
+        full: Load every component (the benchmark's baseline)
+        rules: Add the resume EntityRuler before "ner" (see entity_rules.py)
         
     Returns:
-        First email found, or None
+        spaCy Language object
+        
+    Raises:
+        RuntimeError: If the model isn't installed. It is installed at
+            build time (Dockerfile / setup), never from a request.
     """
-    email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-    emails = re.findall(email_pattern, text)
-    return emails[0] if emails else None
+    import spacy
+    exclude = [] if full else list(UNUSED_COMPONENTS)
+    try:
+        nlp = spacy.load(SPACY_MODEL, exclude=exclude)
+    except OSError as e:
+        log.error("spaCy model not installed", extra={"fields": {"model": SPACY_MODEL}})
+        raise RuntimeError(
+            f"spaCy model {SPACY_MODEL} is not installed: run `python -m spacy download {SPACY_MODEL}`"
+        ) from e
+    
+    # The shared tok2vec only feeds listeners; drop it if ner isn't one
+    if not full and "tok2vec" in nlp.pipe_names and not nlp.get_pipe("tok2vec").listening_components:
+        nlp.remove_pipe("tok2vec")
+    if rules:
+        add_entity_ruler(nlp)
+    return nlp
 
 
-def extract_phone(text: str) -> str:
+def _load_spacy():
+    """Load spaCy English model (small, fast, CPU-friendly) on first use"""
+    nlp = load_spacy_pipeline(full=config.NER_FULL_PIPELINE, rules=config.NER_RULES)
+    log.info("spaCy model loaded", extra={"fields": {"model": SPACY_MODEL, "components": nlp.pipe_names}})
+    return nlp
+
+
+registry.register("spacy", _load_spacy)
+
+
+def ner_text(text: str) -> str:
     """
-    Extract Indian phone number using regex
+    The part of the resume NER runs on
     
-    Handles formats:
-    - +91-9876543210
-    - +919876543210
-    - 9876543210
-    
-    Args:
-        text: Full resume text
-        
-    Returns:
-        First phone number found, or None
+    Sections in NER_SECTIONS only, capped at ML_NER_MAX_CHARS (cut at a
+    line break). The full text when ML_NER_FULL_PIPELINE is set.
     """
-    phone_patterns = [
-        r'\+91[\-\s]?[6-9]\d{9}',  # +91-9876543210 or +91 9876543210
-        r'\b[6-9]\d{9}\b',          # 9876543210
-    ]
-    
-    for pattern in phone_patterns:
-        phones = re.findall(pattern, text)
-        if phones:
-            return phones[0]
+    if config.NER_FULL_PIPELINE:
+        return text
+    selected = select_sections(text, NER_SECTIONS) or text
+    if config.NER_MAX_CHARS and len(selected) > config.NER_MAX_CHARS:
+        cut = selected[:config.NER_MAX_CHARS]
+        selected = cut.rsplit("\n", 1)[0] if "\n" in cut else cut
+    return selected
+
+
+def extract_email(text: str) -> str:
+    """
+    First email address in the text, or None (see contact.scan_contact)
+    """
+    return scan_contact(text).email
+
+
+def extract_phone(text: str) -> str:
+    """
+    First phone number in the text, or None (see contact.scan_contact)
     
-    return None
+    Handles Indian and international formats:
+    - +91-9876543210, +91 98765 43210, 9876543210
+    - +1 (415) 555-2671, +44 20 7946 0958
+    """
+    return scan_contact(text).phone
+
+
+# Filter sets, built once (not per call)
+
+# PROGRAMS, not organizations
+PROGRAM_KEYWORDS = (
+    'google summer', 'summer of code', 'gsoc',
+    'mlh fellowship', 'github campus expert',
+    'microsoft learn', 'hackathon', 'competition',
+    'program', 'fellowship', 'internship program'
+)
+
+# Generic section headers
+GENERIC_TERMS = frozenset({
+    'education', 'skills', 'experience', 'projects', 'work experience',
+    'professional experience', 'technical skills', 'achievements',
+    'certifications', 'summary', 'objective', 'references', 'profile',
+    'contact', 'about', 'interests', 'hobbies', 'personal', 'work'
+})
+
+# Not part of a person's name (e.g., "Google Summer")
+INSTITUTION_WORDS = frozenset({'university', 'college', 'school', 'institute'})
+
+# Generic words spaCy tags as DATE
+DATE_NOISE = frozenset({'present', 'current', 'ongoing', 'now'})
 
 
 def is_valid_organization(org: str, email: str = None) -> bool:
@@ -74,44 +150,32 @@ def is_valid_organization(org: str, email: str = None) -> bool:
     - Email addresses  
     - Generic section headers
     - Programs/fellowships/competitions (not actual orgs)
-    - Common resume noise
+    - Common resume noise, skill names
     """
     org = org.strip()
+    lowered = org.lower()
     
     # Filter email-related text
-    if '@' in org or '.com' in org.lower() or '.in' in org.lower():
+    if '@' in org or '.com' in lowered or '.in' in lowered:
         return False
     
-    if email and org.lower() in email.lower():
+    if email and lowered in email.lower():
         return False
     
     # Filter PROGRAMS, not organizations
-    program_keywords = {
-        'google summer', 'summer of code', 'gsoc',
-        'mlh fellowship', 'github campus expert',
-        'microsoft learn', 'hackathon', 'competition',
-        'program', 'fellowship', 'internship program'
-    }
-    if any(keyword in org.lower() for keyword in program_keywords):
+    if any(keyword in lowered for keyword in PROGRAM_KEYWORDS):
         return False
     
     # Filter generic section headers
-    generic_terms = {
-        'education', 'skills', 'experience', 'projects', 'work experience',
-        'professional experience', 'technical skills', 'achievements',
-        'certifications', 'summary', 'objective', 'references', 'profile',
-        'contact', 'about', 'interests', 'hobbies', 'personal', 'work'
-    }
-    if org.lower() in generic_terms:
+    if lowered in GENERIC_TERMS or lowered in resume_rules().headings:
         return False
     
     # Filter too short
     if len(org) < 3:
         return False
     
-    # Filter tech terms
-    tech_noise = {'html', 'css', 'js', 'api', 'sql', 'aws', 'gcp', 'node', 'react'}
-    if org.lower() in tech_noise:
+    # Filter tech terms (skills database + aliases)
+    if lowered in resume_rules().tech_terms:
         return False
     
     return True
@@ -123,7 +187,7 @@ def extract_entities(text: str) -> ExtractedEntity:
     
     Combines:
     1. spaCy NER for names, organizations, locations, dates
-    2. Regex for email and phone (more reliable)
+    2. One regex pass for email, phone, LinkedIn, GitHub (more reliable)
     3. Validation to filter out noise
     
     Args:
@@ -133,15 +197,140 @@ def extract_entities(text: str) -> ExtractedEntity:
         ExtractedEntity object with validated information
     """
     
-    # Process text with spaCy NLP pipeline
-    doc = nlp(text)
+    # Process the relevant sections with the (trimmed) spaCy pipeline
+    nlp = registry.get("spacy")
+    with time_stage("ner"):
+        return entities_from_doc(ner_doc(nlp, ner_text(text)), text)
+
+
+def ner_doc(nlp, text: str):
+    """
+    Entities for one text: rules first, the statistical model if needed
+    
+    The EntityRuler runs alone on the tokenized text; if that already
+    gives a confident result (see entity_rules.rules_confident) the rest
+    of the pipeline is skipped.
+    """
+    doc = _rules_only(nlp, text)
+    if doc is not None:
+        return doc
+    NER_PATH.inc(path="model")
+    return nlp(text)
+
+
+def _rules_only(nlp, text: str):
+    """The rule-only Doc if it's confident, else None"""
+    if RULER_NAME not in nlp.pipe_names:
+        return None
+    doc = nlp.get_pipe(RULER_NAME)(nlp.make_doc(text))
+    if not rules_confident(doc, text):
+        return None
+    NER_PATH.inc(path="rules")
+    return doc
+
+
+def extract_entities_batch(texts: Iterable[str], n_process: int = 1, batch_size: int = 32) -> List[ExtractedEntity]:
+    """
+    Extract entities for many resumes with nlp.pipe
+    
+    spaCy batches documents internally, which is much cheaper per resume
+    than calling nlp() once per text. Output order matches input order.
+    
+    Args:
+        texts: Resume texts
+        n_process: spaCy worker processes (1 = in this process)
+        batch_size: Documents spaCy processes per batch
+        
+    Returns:
+        One ExtractedEntity per input text
+    """
+    with time_stage("ner_batch"):
+        return list(iter_entities(texts, n_process=n_process, batch_size=batch_size))
+
+
+def iter_entities(texts: Iterable[str], n_process: int = 1, batch_size: int = 32) -> Iterator[ExtractedEntity]:
+    """
+    Stream entities for any number of resumes, in input order
+    
+    texts is consumed lazily. Resumes the rules settle are answered
+    without the model; the rest go through one nlp.pipe, so spaCy's
+    worker processes start once, not per batch. Memory stays bounded:
+    nlp.pipe only reads a few batches ahead, and a long run of
+    rule-only resumes is flushed every batch_size texts.
+    
+    Args:
+        texts: Resume texts (a list, or a generator for large archives)
+        n_process: spaCy worker processes (1 = in this process)
+        batch_size: Documents spaCy processes per batch
+        
+    Yields:
+        One ExtractedEntity per input text
+    """
+    nlp = registry.get("spacy")
+    n_process = max(1, n_process)
+    flush_every = max(1, batch_size)
+    # Input-order queue: ("rules", entities), ("model", text) or ("flush", None)
+    queued: Deque[Tuple[str, object]] = deque()
+    
+    def model_inputs() -> Iterator[str]:
+        settled = 0
+        for text in texts:
+            selected = ner_text(text)
+            doc = _rules_only(nlp, selected)
+            if doc is not None:
+                queued.append(("rules", entities_from_doc(doc, text)))
+                settled += 1
+                # An empty doc lets the consumer below drain the queue
+                if settled >= flush_every:
+                    queued.append(("flush", None))
+                    settled = 0
+                    yield ""
+                continue
+            NER_PATH.inc(path="model")
+            queued.append(("model", text))
+            settled = 0
+            yield selected
+    
+    for doc in nlp.pipe(model_inputs(), n_process=n_process, batch_size=batch_size):
+        # Results queued ahead of this doc are ready, in order
+        while True:
+            kind, value = queued.popleft()
+            if kind == "rules":
+                yield value
+                continue
+            if kind == "model":
+                yield entities_from_doc(doc, value)
+            break
+    # Rule-only results after the last model input
+    while queued:
+        yield queued.popleft()[1]
+
+
+def entities_from_doc(doc, text: str) -> ExtractedEntity:
+    """
+    Build the validated ExtractedEntity from a processed spaCy Doc
+    
+    Args:
+        doc: spaCy Doc for the resume (or the part of it NER ran on)
+        text: The full resume text (for the name and contact details)
+        
+    Returns:
+        ExtractedEntity object with validated information
+    """
     
     # Initialize empty entity object
     entities = ExtractedEntity()
     
-    # Extract email and phone first (needed for validation)
-    entities.email = extract_email(text)
-    entities.phone = extract_phone(text)
+    # Contact details in one regex pass (email is needed for validation)
+    contact = scan_contact(text)
+    entities.email = contact.email
+    entities.phone = contact.phone
+    entities.linkedin = contact.linkedin
+    entities.github = contact.github
+    
+    # The first header line is usually the name; faster and more reliable than PERSON
+    entities.name = header_name(text)
+    tech_terms = resume_rules().tech_terms
     
     # Use sets to avoid duplicates
     seen_orgs = set()
@@ -157,7 +346,7 @@ def extract_entities(text: str) -> ExtractedEntity:
             name_parts = ent.text.split()
             if len(name_parts) >= 2:  # Ensure full name
                 # Avoid common mistakes (e.g., "Google Summer")
-                if not any(word.lower() in ['university', 'college', 'school', 'institute'] for word in name_parts):
+                if not any(word.lower() in INSTITUTION_WORDS for word in name_parts):
                     entities.name = ent.text.strip()
         
         # Extract organizations with validation
@@ -175,7 +364,6 @@ def extract_entities(text: str) -> ExtractedEntity:
             loc = ent.text.strip()
             
             # Filter out tech terms mistaken as locations
-            tech_terms = {'linkedin', 'github', 'tailwindcss', 'nodejs', 'reactjs'}
             if loc and loc.lower() not in tech_terms:
                 if loc not in seen_locs:
                     entities.locations.append(loc)
@@ -188,7 +376,7 @@ def extract_entities(text: str) -> ExtractedEntity:
             # Filter out noise dates
             if date and len(date) > 3:  # Skip "Q1", "FY", etc.
                 # Skip generic words
-                if not date.lower() in ['present', 'current', 'ongoing', 'now']:
+                if not date.lower() in DATE_NOISE:
                     if date not in seen_dates:
                         entities.dates.append(date)
                         seen_dates.add(date)
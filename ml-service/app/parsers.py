@@ -1,14 +1,91 @@
 """
 Document parsing module
 Extracts text from PDF and DOCX files
+
+Every parser takes either the file's bytes or a path to it. Uploads are
+spooled to disk (app/uploads.py) and opened by path, so the worker
+process reads the file itself instead of receiving a pickled copy.
 """
 
 import fitz  # PyMuPDF - for PDF parsing
 import docx2txt  # For DOCX parsing
 import io
+from dataclasses import dataclass
+from typing import List, Optional, Tuple, Union
+
+from app import config
+from app.metrics import time_stage
+
+
+# Raw file content or a filesystem path
+FileSource = Union[bytes, str]
+
 
+@dataclass
+class PdfPages:
+    """Text of a range of pages, plus the document's total page count"""
+    page_count: int
+    texts: List[str]
 
-def extract_text_from_pdf(file_bytes: bytes) -> str:
+
+def _open_pdf(source: FileSource):
+    # Open by path when we have one (PyMuPDF reads it directly)
+    if isinstance(source, str):
+        return fitz.open(source, filetype="pdf")
+    return fitz.open(stream=source, filetype="pdf")
+
+
+def extract_pdf_pages(source: FileSource, start: int = 0, stop: Optional[int] = None) -> PdfPages:
+    """
+    Extract the text of pages [start, stop) of a PDF
+    
+    Used directly for page-parallel extraction: the pipeline reads the
+    first range, learns the page count, and extracts the remaining
+    ranges in other worker processes at the same time.
+    
+    Args:
+        source: PDF file as bytes, or its path
+        start: First page (0-based)
+        stop: Page after the last one (None = up to PDF_MAX_PAGES)
+        
+    Returns:
+        PdfPages with one string per page in the range
+        
+    Raises:
+        Exception: If PDF parsing fails
+    """
+    try:
+        with time_stage("parse"):
+            doc = _open_pdf(source)
+            try:
+                page_count = doc.page_count
+                stop = min(page_count, config.PDF_MAX_PAGES if stop is None else stop)
+                texts = [doc[page_num].get_text() for page_num in range(start, stop)]
+            finally:
+                # Close document to free memory
+                doc.close()
+        return PdfPages(page_count=page_count, texts=texts)
+    
+    except Exception as e:
+        raise Exception(f"PDF parsing error: {str(e)}")
+
+
+def join_pages(texts: List[str]) -> Tuple[str, List[Tuple[int, int]]]:
+    """
+    Join page texts into the document text
+    
+    Returns:
+        (text, [(start, end) offsets of each page within text])
+    """
+    spans = []
+    offset = 0
+    for page_text in texts:
+        spans.append((offset, offset + len(page_text)))
+        offset += len(page_text) + 1  # the "\n" between pages
+    return "\n".join(texts), spans
+
+
+def extract_text_from_pdf(source: FileSource) -> str:
     """
     Extract text from PDF using PyMuPDF library
     
@@ -18,8 +95,11 @@ def extract_text_from_pdf(file_bytes: bytes) -> str:
     - Good Unicode support
     - Works with complex layouts
     
+    Pages are collected in a list and joined once, and only the first
+    PDF_MAX_PAGES pages are read (resumes are rarely more than a few).
+    
     Args:
-        file_bytes: PDF file as bytes
+        source: PDF file as bytes, or its path
         
     Returns:
         Extracted text as string
@@ -27,27 +107,11 @@ def extract_text_from_pdf(file_bytes: bytes) -> str:
     Raises:
         Exception: If PDF parsing fails
     """
-    try:
-        # Open PDF from bytes (not from file path)
-        doc = fitz.open(stream=file_bytes, filetype="pdf")
-        text = ""
-        
-        # Iterate through all pages
-        for page_num, page in enumerate(doc):
-            # Extract text from current page
-            page_text = page.get_text()
-            text += page_text + "\n"
-        
-        # Close document to free memory
-        doc.close()
-        
-        return text.strip()
-    
-    except Exception as e:
-        raise Exception(f"PDF parsing error: {str(e)}")
+    text, _ = join_pages(extract_pdf_pages(source).texts)
+    return text.strip()
 
 
-def extract_text_from_docx(file_bytes: bytes) -> str:
+def extract_text_from_docx(source: FileSource) -> str:
     """
     Extract text from DOCX using docx2txt library
     
@@ -55,7 +119,7 @@ def extract_text_from_docx(file_bytes: bytes) -> str:
     Handles tables, headers, footers automatically
     
     Args:
-        file_bytes: DOCX file as bytes
+        source: DOCX file as bytes, or its path
         
     Returns:
         Extracted text as string
@@ -64,8 +128,8 @@ def extract_text_from_docx(file_bytes: bytes) -> str:
         Exception: If DOCX parsing fails
     """
     try:
-        # docx2txt needs file-like object, not raw bytes
-        file_stream = io.BytesIO(file_bytes)
+        # docx2txt takes a path or a file-like object, not raw bytes
+        file_stream = source if isinstance(source, str) else io.BytesIO(source)
         
         # Process DOCX and extract all text
         text = docx2txt.process(file_stream)
@@ -76,13 +140,13 @@ def extract_text_from_docx(file_bytes: bytes) -> str:
         raise Exception(f"DOCX parsing error: {str(e)}")
 
 
-def extract_resume_text(file_bytes: bytes, filename: str) -> str:
+def extract_resume_text(source: FileSource, filename: str) -> str:
     """
     Main router function - decides which parser to use
     based on file extension
     
     Args:
-        file_bytes: File content as bytes
+        source: File content as bytes, or a path to the file
         filename: Original filename with extension
         
     Returns:
@@ -94,10 +158,11 @@ def extract_resume_text(file_bytes: bytes, filename: str) -> str:
     filename_lower = filename.lower()
     
     if filename_lower.endswith('.pdf'):
-        return extract_text_from_pdf(file_bytes)
+        return extract_text_from_pdf(source)
     
     elif filename_lower.endswith('.docx'):
-        return extract_text_from_docx(file_bytes)
+        with time_stage("parse"):
+            return extract_text_from_docx(source)
     
     else:
         raise ValueError(
@@ -0,0 +1,338 @@
+"""
+Resume analysis pipeline
+Cache-aware stages shared by the single, streaming and batch endpoints
+
+run_pipeline() is an async generator that yields a StageEvent as soon as
+each stage finishes (text stats, entities, skills, Gemini analysis) and
+finally the full response. /analyze-resume just waits for the last event;
+/analyze-resume/stream forwards every event to the client as it arrives.
+
+Stages form a dependency graph (see stage_graph.py):
+
+    text ─┬─ entities ─────────────────────┐
+          └─ skills ── prompt ── analysis ─┴─ response
+
+NER runs concurrently with skill matching and the Gemini call, so
+wall-clock approaches parse + max(NER, SBERT + Gemini) instead of the sum.
+"""
+
+import asyncio
+import json
+import time
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple
+
+from fastapi import HTTPException
+
+from app import config
+from app.cache import result_cache, stage_caches, sha256_hex, text_hash
+from app.executors import executor
+from app.gemini_analyzer import build_prompt, generate_analysis, prompt_skills
+from app.layout import LayoutSection, extract_pdf_layout, group_sections, layout_text, sections_text
+from app.logging_config import get_logger
+from app.metrics import ERRORS, STAGE_WALL_SECONDS
+from app.models import ExtractedEntity, GeminiAnalysis, ResumeAnalysisResponse, ResumeSection, Skill
+from app.ner_extractor import extract_entities
+from app.parsers import extract_pdf_pages, extract_resume_text, join_pages
+from app.skill_matcher import extract_skills
+from app.stage_graph import Stage, StageGraph
+
+
+log = get_logger("pipeline")
+
+
+@dataclass
+class StageEvent:
+    """
+    One pipeline milestone
+
+    stage is one of "text", "entities", "skills", "analysis", "result"
+    (the full ResumeAnalysisResponse) or "error".
+    """
+    stage: str
+    data: Any
+
+    def payload(self) -> Any:
+        """JSON-ready data (pydantic models dumped to dicts)"""
+        if hasattr(self.data, "model_dump"):
+            return self.data.model_dump()
+        if isinstance(self.data, list):
+            return [item.model_dump() if hasattr(item, "model_dump") else item for item in self.data]
+        return self.data
+
+    def to_ndjson(self) -> str:
+        return json.dumps({"event": self.stage, "data": self.payload()}, ensure_ascii=False) + "\n"
+
+    def to_sse(self) -> str:
+        return f"event: {self.stage}\ndata: {json.dumps(self.payload(), ensure_ascii=False)}\n\n"
+
+
+async def lookup_cached(digest: str, start_time: float) -> Tuple[str, Optional[ResumeAnalysisResponse]]:
+    """
+    Check the result cache for these exact bytes
+
+    Args:
+        digest: SHA-256 hex digest of the uploaded file
+        start_time: Request start (time.time()) for processing_time
+
+    Returns:
+        (cache key, cached response with cache_hit set, or None)
+    """
+    cache_key = result_cache.key_for(digest)
+    cached = await executor.run_io(result_cache.get, cache_key)
+    if cached is None:
+        return cache_key, None
+    response = ResumeAnalysisResponse.model_validate_json(cached)
+    response.cache_hit = True
+    response.processing_time = round(time.time() - start_time, 2)
+    return cache_key, response
+
+
+@dataclass
+class PromptJob:
+    """Prepared Gemini request and its cache key"""
+    prompt: str
+    skills_list: List[str]
+    resume_text: str
+    key: str
+
+
+def prepare_prompt(text: str, skills: List[Skill]) -> PromptJob:
+    """Build the Gemini prompt; its hash is the Gemini stage-cache key"""
+    skills_list = prompt_skills([{"skill": s.skill, "confidence": s.confidence} for s in skills])
+    prompt = build_prompt(text, skills_list)
+    return PromptJob(prompt, skills_list, text, sha256_hex(prompt.encode("utf-8")))
+
+
+async def gemini_for_prompt(job: PromptJob) -> GeminiAnalysis:
+    """
+    Career analysis with Gemini, memoized on the prompt
+
+    The call is async on the shared client, so no thread is held while
+    waiting on the network. Fallback results are not cached, so the next
+    request retries Gemini.
+    """
+    analysis = stage_caches["gemini"].get(job.key)
+    if analysis is None:
+        analysis = await generate_analysis(job.prompt, job.skills_list, job.resume_text)
+        if not analysis.is_fallback:
+            stage_caches["gemini"].set(job.key, analysis)
+    return analysis
+
+
+async def gemini_stage(text: str, skills: List[Skill], entities: ExtractedEntity) -> GeminiAnalysis:
+    """Prompt prep + Gemini in one step (used by the batch endpoint)"""
+    return await gemini_for_prompt(prepare_prompt(text, skills))
+
+
+async def extract_text(file_path: str, filename: str) -> str:
+    """
+    Extract the resume text, page-parallel for long PDFs
+    
+    The first PDF_CHUNK_PAGES pages are read in one worker task, which
+    also reports the page count. A typical resume is done at that point;
+    longer PDFs have their remaining page ranges (up to PDF_MAX_PAGES)
+    extracted concurrently across the CPU workers.
+    """
+    if not filename.lower().endswith('.pdf'):
+        return await executor.run_cpu(extract_resume_text, file_path, filename)
+    
+    ranges = await read_pdf_ranges(extract_pdf_pages, file_path)
+    text, _ = join_pages([page for pages in ranges for page in pages.texts])
+    return text.strip()
+
+
+async def extract_layout(file_path: str) -> Tuple[str, List[LayoutSection]]:
+    """
+    Layout mode: the PDF's text and its typed sections (see layout.py)
+    
+    Blocks are extracted page-parallel like extract_text; sections are
+    grouped here, since a section can continue across a page break.
+    """
+    ranges = await read_pdf_ranges(extract_pdf_layout, file_path)
+    blocks = [block for layout in ranges for block in layout.blocks]
+    return layout_text(blocks), group_sections(blocks)
+
+
+async def read_pdf_ranges(extract: Callable, file_path: str, stop: Optional[int] = None) -> List[Any]:
+    """
+    Run extract(file_path, start, stop) over PDF_CHUNK_PAGES-page ranges
+    
+    The first range also reports the page count; the remaining ranges
+    then run concurrently across the CPU workers. Every range, the first
+    included, ends at or before min(stop, PDF_MAX_PAGES). Results are
+    returned in page order.
+    """
+    chunk = max(1, config.PDF_CHUNK_PAGES)
+    limit = config.PDF_MAX_PAGES if stop is None else min(stop, config.PDF_MAX_PAGES)
+    first = await executor.run_cpu(extract, file_path, 0, min(chunk, limit))
+    last = min(first.page_count, limit)
+    rest = await asyncio.gather(*(
+        executor.run_cpu(extract, file_path, start, min(start + chunk, last))
+        for start in range(chunk, last, chunk)
+    ))
+    return [first] + list(rest)
+
+
+def replay_cached(response: ResumeAnalysisResponse) -> List[StageEvent]:
+    """The events a streaming client would have seen for a cached result"""
+    return [
+        StageEvent("entities", response.extracted_info),
+        StageEvent("skills", response.skills),
+        StageEvent("analysis", response.analysis),
+        StageEvent("result", response)
+    ]
+
+
+async def run_pipeline(file_path: str, filename: str, cache_key: str,
+                       start_time: float) -> AsyncIterator[StageEvent]:
+    """
+    Run the stage graph, yielding each result as soon as it's ready
+
+    The caller must hold a pipeline slot (executor.admit/acquire) and
+    keep file_path (the spooled upload) until the generator finishes.
+
+    Raises:
+        HTTPException: 400 if the extracted text is too short
+    """
+    # Stage caches: identical text (even from different bytes) skips NER and SBERT
+    text_keys: Dict[str, str] = {}
+    sections: List[LayoutSection] = []
+    layout_mode = config.PDF_LAYOUT and filename.lower().endswith('.pdf')
+
+    async def text_stage() -> str:
+        # STEP 2: Extract text
+        if layout_mode:
+            text, found = await extract_layout(file_path)
+            sections.extend(found)
+        else:
+            text = await extract_text(file_path, filename)
+        if len(text) < 100:
+            raise HTTPException(
+                status_code=400,
+                detail="Resume text too short. Please upload a complete resume."
+            )
+        text_keys["text"] = text_hash(text)
+        return text
+
+    async def entities_stage(text: str) -> ExtractedEntity:
+        # STEP 3: Extract entities
+        entities = stage_caches["entities"].get(text_keys["text"])
+        if entities is None:
+            entities = await executor.run_cpu(extract_entities, text)
+            stage_caches["entities"].set(text_keys["text"], entities)
+        return entities
+
+    async def skills_stage(text: str) -> List[Skill]:
+        # STEP 4: Extract skills
+        # Layout mode embeds only the relevant sections (falls back to the
+        # whole text when no section headings were recognised)
+        skills_text = sections_text(sections) if sections else text
+        if len(skills_text) < 100:
+            skills_text = text
+        key = text_keys["text"] if skills_text is text else text_hash(skills_text)
+        skills = stage_caches["skills"].get(key)
+        if skills is None:
+            skills = await executor.run_cpu(extract_skills, skills_text)
+            stage_caches["skills"].set(key, skills)
+        return skills
+
+    async def prompt_stage(text: str, skills: List[Skill]) -> PromptJob:
+        return prepare_prompt(text, skills)
+
+    async def analysis_stage(prompt: PromptJob) -> GeminiAnalysis:
+        # STEP 5: Gemini analysis
+        return await gemini_for_prompt(prompt)
+
+    graph = StageGraph([
+        Stage("text", text_stage),
+        Stage("entities", entities_stage, ("text",)),
+        Stage("skills", skills_stage, ("text",)),
+        Stage("prompt", prompt_stage, ("text", "skills")),
+        Stage("analysis", analysis_stage, ("prompt",))
+    ])
+
+    results: Dict[str, Any] = {}
+    try:
+        async for name, result in graph.run():
+            results[name] = result
+            if name == "text":
+                word_count = len(result.split())
+                stats = {"characters": len(result), "words": word_count}
+                if layout_mode:
+                    stats["sections"] = [section.kind for section in sections]
+                log.info("Text extracted", extra={"fields": stats})
+                yield StageEvent("text", stats)
+            elif name == "entities":
+                # Only whether contact details were found - never the values
+                log.info("Entities extracted", extra={"fields": {
+                    "has_name": result.name is not None,
+                    "has_email": result.email is not None,
+                    "has_phone": result.phone is not None,
+                    "organizations": len(result.organizations),
+                    "locations": len(result.locations)
+                }})
+                yield StageEvent("entities", result)
+            elif name == "skills":
+                log.info("Skills matched", extra={"fields": {
+                    "count": len(result),
+                    "top": [s.skill for s in result[:5]]
+                }})
+                yield StageEvent("skills", result)
+            elif name == "analysis":
+                log.info("Career analysis ready", extra={"fields": {
+                    "ats_score": result.ats_score,
+                    "fallback": result.is_fallback,
+                    "top_role": result.career_recommendations[0].role if result.career_recommendations else None
+                }})
+                yield StageEvent("analysis", result)
+    except Exception:
+        ERRORS.inc(stage=graph.failed or "pipeline")
+        raise
+
+    entities, skills, gemini_analysis = results["entities"], results["skills"], results["analysis"]
+    critical_path, critical_seconds = graph.critical_path()
+    stage_timings = graph.timings.durations()
+    for name, seconds in stage_timings.items():
+        STAGE_WALL_SECONDS.observe(seconds, stage=name)
+    stage_timings["critical_path"] = critical_seconds
+    
+    # Calculate processing time
+    processing_time = round(time.time() - start_time, 2)
+    log.info("Resume analyzed", extra={"fields": {
+        "processing_time": processing_time,
+        "critical_path": critical_path,
+        "stage_timings": stage_timings
+    }})
+    
+    # Build response
+    response = ResumeAnalysisResponse(
+        status="success",
+        processing_time=processing_time,
+        extracted_info=entities,
+        skills=skills,
+        analysis=gemini_analysis,
+        technologies_used={
+            "pdf_parser": "PyMuPDF" if filename.endswith('.pdf') else "docx2txt",
+            "ner": "spaCy en_core_web_sm v3.7.0",
+            "skill_extraction": ("Skill lexicon + " if config.SKILL_LEXICON else "") + "Sentence-BERT paraphrase-MiniLM-L3-v2",
+            "career_analysis": "Google Gemini 2.5 Flash Lite" if config.LLM_BACKEND != "mock" else "Mock LLM backend"
+        },
+        stage_timings=stage_timings,
+        critical_path=critical_path,
+        sections=[
+            ResumeSection(
+                kind=section.kind,
+                title=section.title,
+                page=section.page,
+                bbox=list(section.bbox),
+                characters=len(section.text)
+            )
+            for section in sections
+        ]
+    )
+    
+    if not gemini_analysis.is_fallback:
+        await executor.run_io(result_cache.set, cache_key, response.model_dump_json().encode("utf-8"))
+    
+    yield StageEvent("result", response)
@@ -0,0 +1,291 @@
+"""
+Nearest-neighbour index over skill embeddings
+Lets the skill vocabulary grow to tens of thousands of skills and aliases
+
+Backends:
+- exact: brute-force dot product against every skill (the reference)
+- ivf:   inverted-file index built with spherical k-means in pure NumPy;
+         each query only scans the n_probe closest clusters
+- hnsw:  graph index from the optional `hnswlib` package
+
+All backends expect L2-normalised float32 embeddings, so the inner
+product is the cosine similarity. Every index measures its recall@k
+against the exact scan when it is built (`index.recall`); an index below
+the recall floor is widened (IVF probes more clusters) or replaced by the
+exact scan, so a poor index never silently drops skills.
+"""
+
+import numpy as np
+from typing import Optional, Tuple
+
+from app.logging_config import get_logger
+
+
+log = get_logger("skills")
+
+
+class SkillIndex:
+    """
+    Common interface for skill nearest-neighbour search
+
+    search() returns (scores, ids), both shaped [queries, k] and sorted
+    by descending score. Rows with fewer than k candidates are padded
+    with score -inf and id -1.
+    """
+
+    name = "base"
+
+    def __init__(self, embeddings: np.ndarray):
+        self.embeddings = embeddings
+        self.size = embeddings.shape[0]
+        self.recall: Optional[float] = None
+
+    def search(self, queries: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        raise NotImplementedError
+
+
+def _top_k_rows(scores: np.ndarray, ids: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Sorted top-k per row of a dense score matrix (argpartition + small sort)"""
+    k = min(k, scores.shape[1])
+    if k < scores.shape[1]:
+        part = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    else:
+        part = np.broadcast_to(np.arange(scores.shape[1]), scores.shape)
+    part_scores = np.take_along_axis(scores, part, axis=1)
+    order = np.argsort(-part_scores, axis=1, kind="stable")
+    top = np.take_along_axis(part, order, axis=1)
+    return np.take_along_axis(scores, top, axis=1), ids[top]
+
+
+def _pad(scores: np.ndarray, ids: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Pad [queries, n < k] results to k columns with score -inf and id -1"""
+    missing = k - scores.shape[1]
+    if missing <= 0:
+        return scores, ids
+    rows = scores.shape[0]
+    return (np.hstack([scores, np.full((rows, missing), -np.inf, dtype=scores.dtype)]),
+            np.hstack([ids, np.full((rows, missing), -1, dtype=ids.dtype)]))
+
+
+class ExactSkillIndex(SkillIndex):
+    """Brute-force scan: one [queries x skills] matrix product"""
+
+    name = "exact"
+
+    def __init__(self, embeddings: np.ndarray):
+        super().__init__(embeddings)
+        self._ids = np.arange(self.size)
+        self.recall = 1.0
+
+    def search(self, queries: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        scores = queries @ self.embeddings.T
+        return _pad(*_top_k_rows(scores, self._ids, k), k)
+
+
+class IVFSkillIndex(SkillIndex):
+    """
+    Inverted-file index (IVF) with spherical k-means in NumPy
+
+    Args:
+        embeddings: Normalised skill embeddings [skills, dim]
+        n_lists: Number of clusters (default ~sqrt(skills))
+        n_probe: Clusters scanned per query (more = higher recall)
+        iterations: k-means iterations
+        seed: RNG seed so every worker builds the same index
+    """
+
+    name = "ivf"
+
+    def __init__(self, embeddings: np.ndarray, n_lists: Optional[int] = None,
+                 n_probe: int = 8, iterations: int = 10, seed: int = 0):
+        super().__init__(embeddings)
+        self.n_lists = max(1, min(n_lists or int(np.sqrt(self.size)), self.size))
+        self.n_probe = max(1, min(n_probe, self.n_lists))
+        self.centroids, assignments = self._kmeans(iterations, seed)
+
+        # Skill ids grouped by cluster
+        order = np.argsort(assignments, kind="stable")
+        bounds = np.searchsorted(assignments[order], np.arange(self.n_lists + 1))
+        self.lists = [order[bounds[c]:bounds[c + 1]] for c in range(self.n_lists)]
+
+    def _kmeans(self, iterations: int, seed: int) -> Tuple[np.ndarray, np.ndarray]:
+        rng = np.random.default_rng(seed)
+        start = rng.choice(self.size, self.n_lists, replace=False)
+        centroids = np.array(self.embeddings[start], dtype=np.float32)
+        assignments = np.zeros(self.size, dtype=np.int64)
+
+        for _ in range(iterations):
+            assignments = np.argmax(self.embeddings @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, assignments, self.embeddings)
+            norms = np.linalg.norm(sums, axis=1, keepdims=True)
+            # Empty clusters keep their previous centroid
+            filled = norms[:, 0] > 0
+            centroids[filled] = sums[filled] / norms[filled]
+
+        assignments = np.argmax(self.embeddings @ centroids.T, axis=1)
+        return centroids, assignments
+
+    def search(self, queries: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        n = queries.shape[0]
+        out_scores = np.full((n, k), -np.inf, dtype=np.float32)
+        out_ids = np.full((n, k), -1, dtype=np.int64)
+
+        # Closest clusters for every query in one product
+        probes = np.argpartition(-(queries @ self.centroids.T), self.n_probe - 1, axis=1)[:, :self.n_probe]
+
+        for q in range(n):
+            candidates = np.concatenate([self.lists[c] for c in probes[q]])
+            if candidates.size == 0:
+                continue
+            scores = self.embeddings[candidates] @ queries[q]
+            top_scores, top_ids = _top_k_rows(scores[None, :], candidates, k)
+            out_scores[q, :top_scores.shape[1]] = top_scores[0]
+            out_ids[q, :top_ids.shape[1]] = top_ids[0]
+
+        return out_scores, out_ids
+
+
+class HNSWSkillIndex(SkillIndex):
+    """
+    Hierarchical navigable small-world graph via `hnswlib` (optional)
+
+    Raises:
+        ImportError: If hnswlib is not installed
+    """
+
+    name = "hnsw"
+
+    def __init__(self, embeddings: np.ndarray, ef_construction: int = 200,
+                 m: int = 16, ef_search: int = 64):
+        import hnswlib
+
+        super().__init__(embeddings)
+        self.ef_search = ef_search
+        self._index = hnswlib.Index(space="ip", dim=embeddings.shape[1])
+        self._index.init_index(max_elements=self.size, ef_construction=ef_construction, M=m)
+        self._index.add_items(np.asarray(embeddings), np.arange(self.size))
+
+    def search(self, queries: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        found = min(k, self.size)
+        self._index.set_ef(max(self.ef_search, found))
+        ids, distances = self._index.knn_query(queries, k=found)
+        # hnswlib "ip" distance is 1 - inner product
+        return _pad((1.0 - distances).astype(np.float32), ids.astype(np.int64), k)
+
+
+def measure_recall(index: SkillIndex, exact: SkillIndex, queries: np.ndarray, k: int = 10) -> float:
+    """
+    Recall@k of an index against the exact scan
+
+    Args:
+        index: Index under test
+        exact: Reference ExactSkillIndex over the same embeddings
+        queries: Normalised query embeddings
+        k: Neighbours compared per query
+
+    Returns:
+        Fraction of true top-k neighbours the index also returned
+    """
+    _, true_ids = exact.search(queries, k)
+    _, found_ids = index.search(queries, k)
+    hits = sum(
+        len(np.intersect1d(t[t >= 0], f[f >= 0], assume_unique=True))
+        for t, f in zip(true_ids, found_ids)
+    )
+    return hits / max(1, int((true_ids >= 0).sum()))
+
+
+def sample_queries(embeddings: np.ndarray, n: int = 256, seed: int = 0) -> np.ndarray:
+    """
+    Synthetic queries for recall checks
+
+    Resume sentences usually mention several skills, so each query is
+    the normalised mix of two random skill embeddings.
+    """
+    rng = np.random.default_rng(seed)
+    a = embeddings[rng.integers(0, embeddings.shape[0], n)]
+    b = embeddings[rng.integers(0, embeddings.shape[0], n)]
+    mixed = a + b
+    return (mixed / np.linalg.norm(mixed, axis=1, keepdims=True)).astype(np.float32)
+
+
+# Below this size an exact scan is already cheap
+AUTO_EXACT_MAX_SKILLS = 5000
+
+
+def build_skill_index(embeddings: np.ndarray, backend: str = "auto", n_probe: int = 8,
+                      recall_k: int = 10, min_recall: float = 0.0) -> SkillIndex:
+    """
+    Build the configured index and record its recall against exact search
+
+    If recall is below min_recall, an IVF index doubles n_probe until it
+    reaches the floor; once it would scan half the clusters (no faster
+    than the exact scan) or for other backends, the exact index is
+    returned instead, with a warning.
+
+    Args:
+        embeddings: Normalised float32 skill embeddings
+        backend: "auto", "exact", "ivf" or "hnsw"
+        n_probe: Clusters scanned per query for the IVF backend
+        recall_k: k used for the recall measurement
+        min_recall: Lowest acceptable recall@recall_k
+
+    Returns:
+        SkillIndex with .recall filled in
+    """
+    backend = backend.lower()
+    if backend == "auto":
+        backend = "exact" if embeddings.shape[0] <= AUTO_EXACT_MAX_SKILLS else "ivf"
+
+    exact = ExactSkillIndex(embeddings)
+    if backend == "exact":
+        return exact
+
+    if backend == "hnsw":
+        try:
+            index = HNSWSkillIndex(embeddings)
+        except ImportError:
+            log.warning("hnswlib not installed, falling back to IVF skill index")
+            index = IVFSkillIndex(embeddings, n_probe=n_probe)
+    elif backend == "ivf":
+        index = IVFSkillIndex(embeddings, n_probe=n_probe)
+    else:
+        raise ValueError(f"Unknown skill index backend: {backend}")
+
+    queries = sample_queries(embeddings)
+    index.recall = measure_recall(index, exact, queries, k=recall_k)
+    if isinstance(index, IVFSkillIndex):
+        while index.recall < min_recall and index.n_probe * 2 <= index.n_lists // 2:
+            index.n_probe *= 2
+            index.recall = measure_recall(index, exact, queries, k=recall_k)
+
+    if index.recall < min_recall:
+        log.warning("Skill index recall below the floor, using the exact scan", extra={"fields": {
+            "backend": index.name, "recall": round(index.recall, 3), "min_recall": min_recall
+        }})
+        return exact
+    return index
+
+
+if __name__ == "__main__":
+    # Recall/latency report on random data: python -m app.skill_index [skills]
+    import sys
+    import time
+
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    rng = np.random.default_rng(42)
+    data = rng.standard_normal((size, 384)).astype(np.float32)
+    data /= np.linalg.norm(data, axis=1, keepdims=True)
+    queries = sample_queries(data, n=200)
+
+    reference = ExactSkillIndex(data)
+    for name in ("exact", "ivf", "hnsw"):
+        built = time.perf_counter()
+        index = build_skill_index(data, backend=name)
+        built = time.perf_counter() - built
+        began = time.perf_counter()
+        index.search(queries, 25)
+        per_query_ms = (time.perf_counter() - began) * 1000 / len(queries)
+        recall = measure_recall(index, reference, queries, k=10)
+        print(f"{index.name:>5}: build {built:6.2f}s  search {per_query_ms:7.3f} ms/query  recall@10 {recall:.3f}")
@@ -0,0 +1,222 @@
+"""
+Exact skill lexicon: the fast tier of skill matching
+
+Most skills in skills_db.json are written the same way on every resume
+("Python", "Redis", "Docker"). Confirming those by embedding similarity
+is wasted work: a token trie compiled from the skill names (plus
+aliases and spelling variants) finds them in one pass over the text.
+
+- Matching is on normalized tokens: case-insensitive, and "Node.js",
+  "nodejs" and "node js" are the same skill
+- Leftmost-longest: "React Native" wins over "React"
+- Names that are also everyday words ("Go", "Swift", "Express",
+  "Chef", ...) only count inside skill lists, where they can't be prose;
+  one-letter names ("C", "R") must also match case
+
+skill_matcher.py runs this first; Sentence-BERT then only embeds chunks
+with text left over that the lexicon could not account for.
+"""
+
+import re
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+
+# Extra spellings for skills in the database (only used if the skill exists)
+ALIASES: Dict[str, Tuple[str, ...]] = {
+    "JavaScript": ("js", "es6", "ecmascript", "vanilla js"),
+    "Kubernetes": ("k8s",),
+    "PostgreSQL": ("postgres", "postgre sql"),
+    "MongoDB": ("mongo", "mongo db"),
+    "Go": ("golang",),
+    "Google Cloud": ("gcp", "google cloud platform"),
+    "AWS": ("amazon web services",),
+    "Scikit-learn": ("sklearn", "scikit learn"),
+    "Hugging Face": ("huggingface", "hugging face transformers"),
+    "Tailwind CSS": ("tailwind", "tailwindcss"),
+    "Material UI": ("mui", "material-ui"),
+    "REST API": ("rest apis", "restful api", "restful apis", "restful", "rest services"),
+    "Vue.js": ("vue",),
+    "Angular": ("angularjs", "angular.js"),
+    "ELK Stack": ("elk",),
+    "Ruby on Rails": ("rails", "ror"),
+    "Spring Boot": ("springboot",),
+    "Elasticsearch": ("elastic search",),
+    "Kafka": ("apache kafka",),
+    "Airflow": ("apache airflow",),
+    "OpenAI API": ("openai",),
+    "PyTorch": ("torch",),
+    "Power BI": ("powerbi",),
+    "D3.js": ("d3",),
+    "Microservices": ("microservice", "micro services", "micro-services"),
+    "WebSockets": ("websocket", "web sockets", "socket.io"),
+    "Smart Contracts": ("smart contract",),
+    "Data Structures": ("data structure", "dsa"),
+    "Algorithms": ("algorithm",),
+    "Shell Scripting": ("shell script", "shell scripts"),
+    "CI/CD": ("ci cd", "cicd", "continuous integration"),
+    "Machine Learning": ("machine-learning",),
+    "Deep Learning": ("deep-learning",),
+    "NLP": ("natural language processing",),
+    "Computer Vision": ("computer-vision",),
+    "GitHub Actions": ("gh actions",),
+    "Google Gemini": ("gemini api",),
+    "LLaMA": ("llama 2", "llama2", "llama 3", "llama3"),
+    "Apache Spark": ("spark", "pyspark"),
+    "Apache Hadoop": ("hadoop",),
+    "Apache Flink": ("flink",),
+    "Jinja2": ("jinja",),
+    "Weights & Biases": ("wandb", "weights and biases"),
+}
+
+# Lowercase names that are also common words: accepted only in skill lists
+AMBIGUOUS = frozenset({
+    # one letter
+    "c", "r",
+    # languages
+    "go", "rust", "ruby", "swift", "dart", "julia", "groovy", "elixir", "ada",
+    # frameworks, libraries and tools
+    "express", "bootstrap", "sass", "less", "lit", "emotion", "remix", "astro", "ionic", "electron", "bun",
+    "unity", "phoenix", "rocket", "gin", "fiber", "koa", "hapi", "meteor", "stencil", "ghost", "sanity",
+    "pug", "mustache", "handlebars", "parcel", "rollup", "babel", "prettier", "husky", "recoil", "drizzle",
+    "pandas", "mocha", "chai", "cypress", "playwright", "puppeteer", "selenium", "swagger", "drone",
+    "truffle", "hardhat", "foundry", "alchemy", "whisper", "yolo", "bert", "ray", "chroma", "pinecone",
+    "superset", "tableau", "testing",
+    # infrastructure
+    "apache", "chef", "puppet", "vault", "consul", "nomad", "envoy", "helm", "flux", "tilt", "rancher",
+    "render", "railway", "cosmos", "polygon", "avalanche", "the graph",
+    # aliases
+    "js", "d3", "elk", "mui", "ror", "rails", "torch", "spark", "jinja", "algorithm", "algorithms",
+})
+
+# A chunk counts as a skill list when it has at least this many separators
+LIST_SEPARATORS = 2
+_SEPARATOR = re.compile(r"[,|;/•·]")
+
+# Tokens: words with internal . - / + # (c++, node.js, ci/cd, scikit-learn, f#)
+_TOKEN = re.compile(r"[A-Za-z0-9][A-Za-z0-9+#]*(?:[./\-&][A-Za-z0-9+#]+)*|&")
+_INNER_PUNCT = re.compile(r"[./\-]")
+
+# Words that don't count as unexplained text when deciding what to embed
+_FILLER = frozenset({
+    "and", "or", "with", "in", "of", "the", "a", "an", "to", "for", "using", "on", "at", "&",
+    "languages", "language", "frameworks", "framework", "libraries", "library", "tools", "tool",
+    "databases", "database", "technologies", "technology", "skills", "skill", "platforms", "platform",
+    "cloud", "devops", "web", "frontend", "backend", "other", "familiar", "proficient", "basic",
+    "intermediate", "advanced", "etc", "also",
+})
+
+_END = "\0"
+
+
+@dataclass
+class LexiconHit:
+    """One exact skill mention"""
+    skill: int            # Index into the lexicon's skill names
+    start: int            # Character offsets of the mention in the chunk
+    end: int
+
+
+def _tokens(text: str) -> List[Tuple[str, int, int]]:
+    return [(m.group(), m.start(), m.end()) for m in _TOKEN.finditer(text)]
+
+
+def _variants(phrase: str) -> List[Tuple[str, ...]]:
+    """Token sequences a phrase may appear as: as written, joined, split"""
+    tokens = [t.lower() for t, _, _ in _tokens(phrase)]
+    if not tokens:
+        return []
+    variants = {tuple(tokens)}
+    joined = tuple(_INNER_PUNCT.sub("", t) for t in tokens)
+    variants.add(joined)
+    split = tuple(part for t in tokens for part in _INNER_PUNCT.split(t) if part)
+    if len(split) > 1:
+        variants.add(split)
+    return [v for v in variants if all(v)]
+
+
+class SkillLexicon:
+    """
+    Token trie over skill names and aliases
+
+    Args:
+        skills: Canonical skill names; hits refer to them by index
+        aliases: Extra spellings per canonical name (default ALIASES)
+    """
+
+    def __init__(self, skills: Sequence[str], aliases: Optional[Dict[str, Tuple[str, ...]]] = None):
+        self.skills = list(skills)
+        self._trie: Dict[str, dict] = {}
+        index = {name: i for i, name in enumerate(self.skills)}
+        for i, name in enumerate(self.skills):
+            self._add(name, i)
+        for name, spellings in (ALIASES if aliases is None else aliases).items():
+            if name in index:
+                for spelling in spellings:
+                    self._add(spelling, index[name])
+
+    def __len__(self) -> int:
+        return len(self.skills)
+
+    def _add(self, phrase: str, skill: int) -> None:
+        for variant in _variants(phrase):
+            node = self._trie
+            for token in variant:
+                node = node.setdefault(token, {})
+            # First registration wins ("React" before the "react" variant of "React.js")
+            node.setdefault(_END, (skill, phrase.lower() in AMBIGUOUS))
+
+    def scan(self, text: str, skill_list: bool = False) -> List[LexiconHit]:
+        """
+        All skill mentions in text, leftmost-longest, non-overlapping
+
+        Args:
+            text: One resume chunk
+            skill_list: The chunk is known to be a skill list (skills
+                section); otherwise it is one if it has LIST_SEPARATORS
+                separators
+
+        Returns:
+            Hits in text order
+        """
+        tokens = _tokens(text)
+        lowered = [t.lower() for t, _, _ in tokens]
+        in_list = skill_list or len(_SEPARATOR.findall(text)) >= LIST_SEPARATORS
+        hits = []
+        i = 0
+        while i < len(tokens):
+            node, best = self._trie, None
+            for j in range(i, len(tokens)):
+                node = node.get(lowered[j])
+                if node is None:
+                    break
+                if _END in node:
+                    best = (j, node[_END])
+            if best is None:
+                i += 1
+                continue
+            j, (skill, ambiguous) = best
+            if self._accept(tokens[i:j + 1], skill, ambiguous, in_list):
+                hits.append(LexiconHit(skill, tokens[i][1], tokens[j][2]))
+            i = j + 1
+        return hits
+
+    def _accept(self, tokens: List[Tuple[str, int, int]], skill: int, ambiguous: bool, in_list: bool) -> bool:
+        if not ambiguous:
+            return True
+        if not in_list:
+            return False
+        name = self.skills[skill]
+        # "C" / "R" must be written exactly; "c" and "r" are too common
+        return len(name) > 1 or tokens[0][0] == name
+
+
+def unexplained_words(text: str, hits: List[LexiconHit]) -> int:
+    """Words in text outside the hits, ignoring list filler ("Languages", "and", ...)"""
+    kept, last = [], 0
+    for hit in hits:
+        kept.append(text[last:hit.start])
+        last = hit.end
+    kept.append(text[last:])
+    words = [t.lower() for t, _, _ in _tokens(" ".join(kept))]
+    return sum(1 for w in words if w not in _FILLER and not w.isdigit())
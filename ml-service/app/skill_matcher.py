@@ -4,122 +4,326 @@ Skill extraction using Sentence-BERT (Semantic matching)
 This is NOT simple keyword matching!
 It understands context and semantics.
 
+Two tiers: exact skill names are found first by a compiled lexicon
+(skill_lexicon.py, microseconds per chunk); only chunks with text the
+lexicon can't account for are embedded. Each Skill says which tier
+found it (source="lexicon" or "semantic").
+
 Example:
 - "experienced with React framework" → matches "React" skill
 - "built apps using reactjs" → matches "React" skill
 - "worked with spring" → matches "Spring" (not the season)
 """
 
-from sentence_transformers import SentenceTransformer, util
 import json
-import torch
-from typing import List
+import os
+import numpy as np
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
 from app.models import Skill
+from app.skill_index import SkillIndex, build_skill_index
+from app.embedding_cache import load_or_build_embeddings
+from app.model_registry import registry
+from app.chunker import Chunks, chunk_resume
+from app.skill_lexicon import SkillLexicon, unexplained_words
+from app.metrics import SKILL_CHUNKS, time_stage
+from app.logging_config import get_logger
+from app import config
+
 
+log = get_logger("skills")
 
-# Load Sentence-BERT model (done once at startup)
+# Sentence-BERT model (loaded on first use via the model registry)
 # paraphrase-MiniLM-L3-v2 is chosen because:
 # - Small size (60 MB)
 # - Fast inference on CPU
 # - Good accuracy for short texts
 # - Works without GPU
-print("📥 Loading Sentence-BERT model (paraphrase-MiniLM-L3-v2)...")
-model = SentenceTransformer('paraphrase-MiniLM-L3-v2')
-print("✓ Sentence-BERT model loaded successfully")
+MODEL_NAME = 'paraphrase-MiniLM-L3-v2'
 
 
-# Load skills database from JSON file
-with open('skills_db.json', 'r') as f:
-    SKILLS_DB = json.load(f)
+def _load_sentence_bert():
+    """Load the Sentence-BERT model"""
+    from sentence_transformers import SentenceTransformer
+    log.info("Loading Sentence-BERT model", extra={"fields": {"model": MODEL_NAME}})
+    model = SentenceTransformer(MODEL_NAME)
+    log.info("Sentence-BERT model loaded", extra={"fields": {"model": MODEL_NAME}})
+    return model
 
-print(f"📚 Loaded {len(SKILLS_DB)} skills from database")
 
+@dataclass
+class SkillCatalog:
+    """Skill names with their embeddings and nearest-neighbour index"""
+    skills: List[str]
+    embeddings: np.ndarray
+    index: SkillIndex
+    lexicon: Optional[SkillLexicon] = None
 
-# Pre-compute embeddings for all skills (done once)
-# Embeddings are vector representations of text in high-dimensional space
-# Similar meanings = similar vectors
-print(f"🔢 Computing embeddings for {len(SKILLS_DB)} skills...")
-skills_embeddings = model.encode(SKILLS_DB, convert_to_tensor=True)
-print("✓ Skill embeddings ready!")
+
+def _load_skill_catalog() -> SkillCatalog:
+    """Load the skills database and its (cached) embeddings and index"""
+    # Load skills database from JSON file
+    with open(config.SKILLS_DB_PATH, 'r') as f:
+        skills = json.load(f)
+    
+    log.info("Skills database loaded", extra={"fields": {"skills": len(skills)}})
+    
+    # Pre-compute embeddings for all skills (done once, then cached on disk)
+    # Embeddings are vector representations of text in high-dimensional space
+    # Similar meanings = similar vectors
+    # Stored normalised (float32), so cosine similarity is a plain dot product
+    # The cache is a read-only mmap shared by all worker processes
+    # Sentence-BERT is only loaded here if the cache has to be rebuilt
+    embeddings = load_or_build_embeddings(
+        MODEL_NAME,
+        skills,
+        cache_dir=os.path.dirname(os.path.abspath(config.SKILLS_DB_PATH)),
+        encode=lambda names: registry.get("sentence_bert").encode(names, normalize_embeddings=True)
+    )
+    
+    # Nearest-neighbour index over the skills (exact scan or ANN, see skill_index.py)
+    index = build_skill_index(
+        embeddings,
+        backend=config.SKILL_INDEX_BACKEND,
+        n_probe=config.SKILL_INDEX_NPROBE,
+        min_recall=config.SKILL_INDEX_MIN_RECALL
+    )
+    log.info("Skill index ready", extra={"fields": {
+        "backend": index.name,
+        "n_probe": getattr(index, "n_probe", None),
+        "recall_at_10": round(index.recall, 3)
+    }})
+    
+    # Exact-match tier over the same names (hits use the same indices)
+    lexicon = SkillLexicon(skills) if config.SKILL_LEXICON else None
+    
+    return SkillCatalog(skills=skills, embeddings=embeddings, index=index, lexicon=lexicon)
 
 
-def extract_skills(resume_text: str, threshold: float = 0.55) -> List[Skill]:
+registry.register("sentence_bert", _load_sentence_bert)
+registry.register("skill_catalog", _load_skill_catalog)
+
+
+# Candidates fetched per sentence. Keeping this >= top_k means the exact
+# backend returns the same top skills as a full sentences x skills scan.
+SEARCH_K = 50
+
+# A chunk the lexicon matched is still embedded if at least this many of
+# its words are unexplained (prose around the names may hold more skills)
+SEMANTIC_MIN_WORDS = 3
+
+
+def extract_skills(resume_text: str, threshold: float = 0.55, top_k: int = 25) -> List[Skill]:
     """
     Extract skills from resume using semantic similarity matching
     
     Process:
-    1. Split resume into sentences/phrases (chunks)
-    2. Convert each chunk to embedding vector
-    3. Calculate cosine similarity with all skill embeddings
-    4. Keep skills with similarity > threshold (0.55 = 55% match)
-    5. Return top 25 skills sorted by confidence
+    1. Split resume into section-aware chunks (see chunker.py)
+    2. Find exact skill names with the lexicon (confidence 1.0)
+    3. Convert each remaining chunk to embedding vector
+    4. Look up the nearest skills for all sentences in the skill index
+    5. Keep skills with similarity > threshold (0.55 = 55% match)
+    6. Per skill, keep the best-matching sentence as context
+    7. Return top 25 skills: exact hits first, then by confidence
     
     Args:
         resume_text: Full resume text
         threshold: Minimum similarity score (0.55 is balanced)
+        top_k: Maximum number of skills to return
         
     Returns:
         List of Skill objects with confidence scores
     """
     
-    # Split resume into meaningful chunks
-    # Better than word-by-word because we need context
-    sentences = []
-    
-    # Replace newlines with periods and split by periods
-    temp_sentences = resume_text.replace('\n', '. ').split('. ')
-    
-    # Filter sentences: not too short, not too long
-    for sent in temp_sentences:
-        sent = sent.strip()
-        # Keep sentences between 10 and 500 characters
-        if len(sent) > 10 and len(sent) < 500:
-            sentences.append(sent)
+    chunks = split_chunks(resume_text)
     
     # If no valid sentences found, return empty list
-    if not sentences:
-        print("⚠️  No valid text chunks found in resume")
+    if not chunks.chunks:
+        log.warning("No valid text chunks found in resume")
         return []
     
-    print(f"📝 Analyzing {len(sentences)} text sections from resume...")
+    catalog = registry.get("skill_catalog")
+    exact, sentences = _lexicon_pass(catalog, chunks)
+    if not sentences or len(exact) >= top_k:
+        return exact[:top_k]
     
-    # Convert all resume sentences to embeddings
+    # Convert the remaining resume sentences to embeddings
     # This is where the ML magic happens!
-    resume_embeddings = model.encode(sentences, convert_to_tensor=True)
+    model = registry.get("sentence_bert")
+    SKILL_CHUNKS.inc(len(sentences), outcome="embedded")
+    with time_stage("encode"):
+        resume_embeddings = model.encode(sentences, normalize_embeddings=True).astype(np.float32)
     
-    # Dictionary to store matched skills (avoid duplicates)
-    matched_skills = {}
-    
-    # Compare each resume sentence with all skills
-    for idx, (sentence, sent_emb) in enumerate(zip(sentences, resume_embeddings)):
+    with time_stage("similarity"):
+        # Nearest skills for every sentence in one call: [sentences, k]
+        scores, skill_ids = catalog.index.search(resume_embeddings, max(SEARCH_K, top_k))
         
-        # Calculate cosine similarity between sentence and all skills
-        # Returns tensor of similarity scores (one per skill)
-        similarities = util.cos_sim(sent_emb, skills_embeddings)[0]
+        skills_list, matched = _select_skills(
+            catalog, sentences, scores, skill_ids, threshold, top_k - len(exact), _skill_ids(catalog, exact)
+        )
+    
+    log.debug("Skills above threshold", extra={"fields": {
+        "matched": matched,
+        "exact": len(exact),
+        "threshold": threshold
+    }})
+    
+    return exact + skills_list
+
+
+def extract_skills_batch(resume_texts: List[str], threshold: float = 0.55, top_k: int = 25,
+                         batch_size: int = 64) -> List[List[Skill]]:
+    """
+    Extract skills for many resumes with a single batched encode
+    
+    Sentences from every resume are encoded together in one
+    model.encode call and searched in one index call, then split back
+    per resume. Same results as calling extract_skills on each text.
+    
+    Args:
+        resume_texts: Resume texts
+        threshold: Minimum similarity score
+        top_k: Maximum number of skills per resume
+        batch_size: Sentence-BERT encode batch size
         
-        # Check each skill's similarity score
-        for skill_idx, score in enumerate(similarities):
-            score_value = float(score)  # Convert tensor to float
-            
-            # If similarity exceeds threshold, it's a match!
-            if score_value > threshold:
-                skill_name = SKILLS_DB[skill_idx]
-                
-                # Keep highest confidence match if skill already found
-                if skill_name not in matched_skills or score_value > matched_skills[skill_name]["confidence"]:
-                    matched_skills[skill_name] = {
-                        "skill": skill_name,
-                        "confidence": score_value,
-                        "context": sentence[:150]  # First 150 chars of context
-                    }
-    
-    # Convert dictionary to list of Skill objects
-    skills_list = [Skill(**data) for data in matched_skills.values()]
-    
-    # Sort by confidence (highest first)
-    skills_list.sort(key=lambda x: x.confidence, reverse=True)
-    
-    print(f"✓ Found {len(skills_list)} skills with confidence > {threshold}")
-    
-    # Return top 25 skills
-    return skills_list[:25]
+    Returns:
+        One list of Skill objects per input text, in input order
+    """
+    catalog = registry.get("skill_catalog")
+    passes = [_lexicon_pass(catalog, split_chunks(text)) for text in resume_texts]
+    exact_per_resume = [exact for exact, _ in passes]
+    # Resumes already filled by exact hits skip the encode entirely
+    per_resume = [sentences if len(exact) < top_k else [] for exact, sentences in passes]
+    all_sentences = [sent for sentences in per_resume for sent in sentences]
+    if not all_sentences:
+        return [exact[:top_k] for exact in exact_per_resume]
+    
+    model = registry.get("sentence_bert")
+    SKILL_CHUNKS.inc(len(all_sentences), outcome="embedded")
+    with time_stage("encode_batch"):
+        embeddings = model.encode(all_sentences, batch_size=batch_size, normalize_embeddings=True).astype(np.float32)
+    with time_stage("similarity_batch"):
+        all_scores, all_ids = catalog.index.search(embeddings, max(SEARCH_K, top_k))
+    
+    results = []
+    offset = 0
+    for sentences, exact in zip(per_resume, exact_per_resume):
+        end = offset + len(sentences)
+        if sentences:
+            skills_list, _ = _select_skills(
+                catalog, sentences, all_scores[offset:end], all_ids[offset:end],
+                threshold, top_k - len(exact), _skill_ids(catalog, exact)
+            )
+        else:
+            skills_list = []
+        results.append((exact + skills_list)[:top_k])
+        offset = end
+    
+    return results
+
+
+def split_chunks(resume_text: str) -> Chunks:
+    """
+    Split resume into meaningful chunks
+    Better than word-by-word because we need context
+    
+    Section-aware (see chunker.py): contact header and education are
+    skipped, wrapped lines are merged per bullet, junk and duplicate
+    chunks are dropped and the count is capped at ML_SKILL_MAX_CHUNKS.
+    """
+    result = chunk_resume(resume_text)
+    _report_chunks(result)
+    return result
+
+
+def _lexicon_pass(catalog: SkillCatalog, chunks: Chunks) -> Tuple[List[Skill], List[str]]:
+    """
+    Exact tier: skills named verbatim, and the chunks still worth embedding
+    
+    A chunk goes on to Sentence-BERT if the lexicon found nothing in it,
+    or if SEMANTIC_MIN_WORDS or more of its words are unexplained.
+    
+    Returns:
+        (exact skills in document order, chunks to embed)
+    """
+    if catalog.lexicon is None:
+        return [], chunks.chunks
+    
+    with time_stage("lexicon"):
+        found: Dict[int, str] = {}
+        pending = []
+        for chunk, section in zip(chunks.chunks, chunks.sections):
+            hits = catalog.lexicon.scan(chunk, skill_list=section == "skills")
+            for hit in hits:
+                found.setdefault(hit.skill, chunk)
+            if not hits or unexplained_words(chunk, hits) >= SEMANTIC_MIN_WORDS:
+                pending.append(chunk)
+    
+    SKILL_CHUNKS.inc(len(chunks.chunks) - len(pending), outcome="lexicon")
+    exact = [
+        Skill(skill=catalog.skills[idx], confidence=1.0, context=chunk[:150], source="lexicon")
+        for idx, chunk in found.items()
+    ]
+    return exact, pending
+
+
+def _skill_ids(catalog: SkillCatalog, skills: List[Skill]) -> np.ndarray:
+    """Catalog indices of already-found skills (excluded from the semantic tier)"""
+    names = {s.skill for s in skills}
+    return np.array([i for i, name in enumerate(catalog.skills) if name in names], dtype=np.int64)
+
+
+def _report_chunks(result: Chunks) -> None:
+    """Count dropped chunks on /metrics and in the debug log"""
+    for reason, count in result.dropped.items():
+        SKILL_CHUNKS.inc(count, outcome=reason)
+    log.debug("Resume chunked", extra={"fields": {
+        "chunks": len(result.chunks),
+        "dropped": result.dropped_total,
+        "dropped_by_reason": result.dropped
+    }})
+
+
+def _select_skills(catalog: SkillCatalog, sentences: List[str], scores: np.ndarray,
+                   skill_ids: np.ndarray, threshold: float, top_k: int,
+                   exclude: Optional[np.ndarray] = None):
+    """
+    Turn per-sentence index hits into the final skill list
+    
+    Args:
+        exclude: Catalog indices to skip (skills the lexicon already found)
+    
+    Returns:
+        (top skills sorted by confidence, number of skills above threshold)
+    """
+    # Flatten the candidates and apply the threshold as a mask
+    sent_ids = np.repeat(np.arange(len(sentences)), scores.shape[1])
+    scores, skill_ids = scores.ravel(), skill_ids.ravel()
+    mask = (scores > threshold) & (skill_ids >= 0)
+    if exclude is not None and len(exclude):
+        mask &= ~np.isin(skill_ids, exclude)
+    scores, skill_ids, sent_ids = scores[mask], skill_ids[mask], sent_ids[mask]
+    
+    # Best sentence for each skill: sort by score, keep first occurrence per skill
+    order = np.argsort(-scores, kind="stable")
+    _, first = np.unique(skill_ids[order], return_index=True)
+    best = order[first]
+    
+    # Top skills by confidence, highest first
+    best = best[np.argsort(-scores[best], kind="stable")][:top_k]
+    
+    # Only the final k rows cross back into Python
+    skills_list = [
+        Skill(
+            skill=catalog.skills[skill_idx],
+            confidence=score,
+            context=sentences[sent_idx][:150]  # First 150 chars of context
+        )
+        for skill_idx, score, sent_idx in zip(
+            skill_ids[best].tolist(),
+            scores[best].tolist(),
+            sent_ids[best].tolist()
+        )
+    ]
+    
+    return skills_list, len(first)
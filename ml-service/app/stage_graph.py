@@ -0,0 +1,144 @@
+"""
+Tiny dependency-graph runner for pipeline stages
+
+Each stage is an async function that receives the results of its
+dependencies as keyword arguments. Stages start as soon as their
+dependencies finish, so independent stages (NER and skill matching)
+run concurrently on the executor. Start/end times are recorded per
+stage so the critical path can be reported.
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple
+
+
+@dataclass
+class Stage:
+    """A node in the graph: fn(**{dep: result}) -> result"""
+    name: str
+    fn: Callable[..., Awaitable[Any]]
+    deps: Tuple[str, ...] = ()
+
+
+@dataclass
+class StageTimings:
+    """When each stage ran, relative to the start of the graph"""
+    started: Dict[str, float] = field(default_factory=dict)
+    finished: Dict[str, float] = field(default_factory=dict)
+
+    def durations(self) -> Dict[str, float]:
+        return {
+            name: round(self.finished[name] - self.started[name], 3)
+            for name in self.finished
+        }
+
+
+class StageGraph:
+    """
+    Runs stages in dependency order with maximum concurrency
+
+    Args:
+        stages: Stages in any order; deps must name other stages
+
+    Raises:
+        ValueError: On unknown dependencies or cycles
+    """
+
+    def __init__(self, stages: List[Stage]):
+        self.stages = {stage.name: stage for stage in stages}
+        for stage in stages:
+            for dep in stage.deps:
+                if dep not in self.stages:
+                    raise ValueError(f"Stage {stage.name} depends on unknown stage {dep}")
+        self._check_acyclic()
+        self.timings = StageTimings()
+        # Name of the stage that raised, if any
+        self.failed: Optional[str] = None
+
+    def _check_acyclic(self) -> None:
+        done, visiting = set(), set()
+
+        def visit(name: str) -> None:
+            if name in done:
+                return
+            if name in visiting:
+                raise ValueError(f"Cycle in stage graph at {name}")
+            visiting.add(name)
+            for dep in self.stages[name].deps:
+                visit(dep)
+            visiting.discard(name)
+            done.add(name)
+
+        for name in self.stages:
+            visit(name)
+
+    async def run(self) -> AsyncIterator[Tuple[str, Any]]:
+        """
+        Execute the graph, yielding (stage name, result) as each finishes
+
+        If a stage raises, the remaining stages are cancelled and the
+        exception propagates to the caller.
+        """
+        origin = time.perf_counter()
+        results: Dict[str, Any] = {}
+        running: Dict[asyncio.Task, str] = {}
+        pending = dict(self.stages)
+
+        def launch_ready() -> None:
+            for name, stage in list(pending.items()):
+                if all(dep in results for dep in stage.deps):
+                    del pending[name]
+                    self.timings.started[name] = time.perf_counter() - origin
+                    task = asyncio.create_task(stage.fn(**{dep: results[dep] for dep in stage.deps}))
+                    running[task] = name
+
+        try:
+            launch_ready()
+            while running:
+                done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                finished = []
+                for task in done:
+                    name = running.pop(task)
+                    if task.exception() is not None:
+                        self.failed = name
+                    results[name] = task.result()
+                    self.timings.finished[name] = time.perf_counter() - origin
+                    finished.append(name)
+                # Dependents start before the consumer sees the result, so a
+                # slow consumer (a streaming client) never delays them
+                launch_ready()
+                for name in finished:
+                    yield name, results[name]
+        finally:
+            tasks = list(running)
+            for task in tasks:
+                task.cancel()
+            # Wait for the cancellations so no stage outlives the graph
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    def critical_path(self) -> Tuple[List[str], float]:
+        """
+        Longest dependency chain by measured time
+
+        Walks back from the last stage to finish, each step following the
+        dependency that finished last (the one the stage waited on).
+
+        Returns:
+            (stage names from first to last, seconds along that chain)
+        """
+        finished = self.timings.finished
+        if not finished:
+            return [], 0.0
+
+        path = [max(finished, key=finished.get)]
+        while True:
+            deps = [dep for dep in self.stages[path[-1]].deps if dep in finished]
+            if not deps:
+                break
+            path.append(max(deps, key=finished.get))
+        path.reverse()
+
+        durations = self.timings.durations()
+        return path, round(sum(durations[name] for name in path), 3)
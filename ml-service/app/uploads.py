@@ -0,0 +1,166 @@
+"""
+Upload handling
+Size limits enforced while the body arrives, uploads spooled to disk
+
+- UploadLimitMiddleware rejects oversized requests with 413 before the
+  multipart body is parsed: from Content-Length when the client sends it,
+  otherwise as soon as the received bytes pass the limit
+- spool_upload() copies the upload to a temp file in fixed-size chunks,
+  hashing as it goes, so the resume is never held in memory as one bytes
+  object; the parsers open the file by path in the worker process
+
+The copy is a second write of the body. Starlette has already spooled
+the part into a SpooledTemporaryFile, in memory up to 1 MB and then in
+an anonymous temp file. That file has no path on Linux (O_TMPFILE, or
+unlinked), so a worker process can't open it, and it can't be linked
+into place. Hashing needs a full read of the body anyway. The extra
+cost is one sequential write of at most ML_MAX_UPLOAD_MB, about 5-10 ms
+for 10 MB on local disk.
+"""
+
+import hashlib
+import os
+import tempfile
+from dataclasses import dataclass
+from typing import BinaryIO, Dict
+
+from fastapi import UploadFile
+
+from app import config
+from app.executors import executor
+
+
+# Bytes read per chunk while spooling and hashing
+CHUNK_SIZE = 1024 * 1024
+
+
+class UploadTooLargeError(Exception):
+    """The upload exceeded the configured size limit (HTTP 413)"""
+
+    def __init__(self, max_bytes: int):
+        super().__init__(f"Upload exceeds the {max_bytes // (1024 * 1024)} MB limit")
+        self.max_bytes = max_bytes
+
+
+@dataclass
+class SpooledUpload:
+    """A resume copied to a temp file; remove() deletes it"""
+    path: str
+    filename: str
+    size: int
+    sha256: str
+
+    def remove(self) -> None:
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
+
+
+def _spool(source: BinaryIO, suffix: str, max_bytes: int) -> tuple:
+    """Copy a file object to a temp file in chunks (blocking; run on a thread)"""
+    digest = hashlib.sha256()
+    size = 0
+    fd, path = tempfile.mkstemp(suffix=suffix, dir=config.UPLOAD_TMP_DIR or None)
+    try:
+        with os.fdopen(fd, "wb") as out:
+            source.seek(0)
+            while True:
+                chunk = source.read(CHUNK_SIZE)
+                if not chunk:
+                    break
+                size += len(chunk)
+                if size > max_bytes:
+                    raise UploadTooLargeError(max_bytes)
+                digest.update(chunk)
+                out.write(chunk)
+    except BaseException:
+        os.remove(path)
+        raise
+    return path, size, digest.hexdigest()
+
+
+async def spool_upload(file: UploadFile, max_bytes: int) -> SpooledUpload:
+    """
+    Copy an upload to a temp file, enforcing max_bytes
+
+    Raises:
+        UploadTooLargeError: If the file is larger than max_bytes
+    """
+    suffix = os.path.splitext(file.filename or "")[1].lower()
+    path, size, sha256 = await executor.run_io(_spool, file.file, suffix, max_bytes)
+    return SpooledUpload(path=path, filename=file.filename, size=size, sha256=sha256)
+
+
+class UploadLimitMiddleware:
+    """
+    ASGI middleware capping request body size per path
+
+    Args:
+        app: The ASGI app to wrap
+        limits: Path -> maximum body size in bytes
+    """
+
+    def __init__(self, app, limits: Dict[str, int]):
+        self.app = app
+        self.limits = limits
+
+    async def __call__(self, scope, receive, send):
+        max_bytes = self.limits.get(scope.get("path")) if scope["type"] == "http" else None
+        if max_bytes is None:
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope.get("headers") or [])
+        try:
+            declared = int(headers.get(b"content-length", b"0"))
+        except ValueError:
+            declared = 0
+        if declared > max_bytes:
+            await self._reject(send, max_bytes)
+            return
+
+        received = 0
+        state = {"exceeded": False, "started": False, "rejected": False}
+
+        async def limited_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > max_bytes:
+                    state["exceeded"] = True
+                    raise UploadTooLargeError(max_bytes)
+            return message
+
+        async def reject():
+            state["started"] = state["rejected"] = True
+            await self._reject(send, max_bytes)
+
+        async def guarded_send(message):
+            if state["rejected"]:
+                return
+            if state["exceeded"] and not state["started"]:
+                # The app turned our error into its own 400/500: send 413 instead
+                await reject()
+                return
+            if message["type"] == "http.response.start":
+                state["started"] = True
+            await send(message)
+
+        try:
+            await self.app(scope, limited_receive, guarded_send)
+        except Exception:
+            if not state["exceeded"] or state["started"]:
+                raise
+            await reject()
+
+    @staticmethod
+    async def _reject(send, max_bytes: int) -> None:
+        body = f'{{"detail":"Upload exceeds the {max_bytes // (1024 * 1024)} MB limit"}}'.encode()
+        await send({
+            "type": "http.response.start",
+            "status": 413,
+            "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())]
+        })
+        await send({"type": "http.response.body", "body": body})
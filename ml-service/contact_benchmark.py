@@ -0,0 +1,122 @@
+"""
+Contact extraction microbenchmark: single-pass scanner vs the old regexes
+Times app/contact.scan_contact against the previous findall-based
+extract_email + extract_phone on ordinary resumes and on pathological
+inputs (long runs that make naive patterns rescan or backtrack)
+
+    python contact_benchmark.py                 # default sizes
+    python contact_benchmark.py --size 200000 --repeat 5 --json
+
+The old version is kept here (legacy_contact) only as the baseline.
+"""
+
+import argparse
+import json
+import random
+import re
+import statistics
+import time
+from typing import Callable, Dict, List, Tuple
+
+from app.contact import scan_contact
+
+
+def legacy_contact(text: str) -> Tuple[str, str]:
+    """extract_email + extract_phone as they were: findall per pattern"""
+    emails = re.findall(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b', text)
+    phone = None
+    for pattern in (r'\+91[\-\s]?[6-9]\d{9}', r'\b[6-9]\d{9}\b'):
+        phones = re.findall(pattern, text)
+        if phones:
+            phone = phones[0]
+            break
+    return (emails[0] if emails else None), phone
+
+
+def cases(size: int, seed: int) -> Dict[str, str]:
+    """Inputs of roughly `size` characters each"""
+    from loadtest import synthetic_resume
+
+    rng = random.Random(seed)
+    with open("skills_db.json", "r", encoding="utf-8") as f:
+        skills = json.load(f)
+    resume = synthetic_resume(0, skills, rng)
+    filler = "\n".join(synthetic_resume(i, skills, rng).split("\n", 2)[2] for i in range(1, 200))
+    return {
+        # Typical: contact details in the header
+        "resume": resume,
+        # Contact details after a long body (the whole text must be scanned)
+        "contact_at_end": filler[:size] + "\nreach me: a.b@example.com, +44 20 7946 0958",
+        # No contact details at all: both versions scan everything
+        "no_contact": filler[:size],
+        # Runs that a pattern can start matching at every position
+        "letters": "a" * size,
+        "digits": "9" * size,
+        "spaced_digits": "9 " * (size // 2),
+        "dotted_words": "a." * (size // 2) + "@",
+        "at_signs": "a@" * (size // 2),
+        "dashed_domain": "x@" + "a-" * (size // 2),
+        "plus_signs": "+9" * (size // 2),
+        "url_prefixes": "github.com/" * (size // 11),
+    }
+
+
+def time_call(func: Callable[[str], object], text: str, repeat: int) -> float:
+    """Best of `repeat` runs, in milliseconds"""
+    best = float("inf")
+    for _ in range(repeat):
+        began = time.perf_counter()
+        func(text)
+        best = min(best, time.perf_counter() - began)
+    return best * 1000
+
+
+def run(size: int, repeat: int, seed: int) -> Dict:
+    results: List[Dict] = []
+    for name, text in cases(size, seed).items():
+        legacy_ms = time_call(legacy_contact, text, repeat)
+        scanner_ms = time_call(scan_contact, text, repeat)
+        found = scan_contact(text)
+        results.append({
+            "case": name,
+            "characters": len(text),
+            "legacy_ms": round(legacy_ms, 3),
+            "scanner_ms": round(scanner_ms, 3),
+            "speedup": round(legacy_ms / max(scanner_ms, 1e-9), 2),
+            "found": [field for field, value in vars(found).items() if value]
+        })
+    return {
+        "repeat": repeat,
+        "cases": results,
+        "geomean_speedup": round(statistics.geometric_mean(r["speedup"] for r in results), 2)
+    }
+
+
+def print_report(report: Dict) -> None:
+    print(f"\n{'='*78}")
+    print(f"🧪 Contact extraction, best of {report['repeat']} runs")
+    print(f"\n{'case':<16}{'chars':>9}{'legacy ms':>12}{'scanner ms':>12}{'speedup':>9}   found")
+    for r in report["cases"]:
+        print(f"{r['case']:<16}{r['characters']:>9}{r['legacy_ms']:>12.3f}{r['scanner_ms']:>12.3f}"
+              f"{r['speedup']:>8.2f}x   {', '.join(r['found']) or '-'}")
+    print(f"\n⚡ Geometric mean speedup: {report['geomean_speedup']}x")
+    print(f"{'='*78}\n")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the single-pass contact scanner")
+    parser.add_argument("--size", type=int, default=100000, help="Characters per generated input")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args()
+
+    report = run(args.size, args.repeat, args.seed)
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report)
+
+
+if __name__ == "__main__":
+    main()
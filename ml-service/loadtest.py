@@ -0,0 +1,233 @@
+"""
+Load test for the ML service
+Drives /analyze-resume with synthetic PDF/DOCX resumes and reports
+throughput plus p50/p95/p99 latency overall and per pipeline stage
+
+Run the service with the mock LLM backend for an offline benchmark:
+
+    ML_LLM_BACKEND=mock ML_MOCK_LLM_LATENCY_MS=800 uvicorn app.main:app
+    python loadtest.py --requests 200 --concurrency 8
+
+Every synthetic resume is unique, so the result and stage caches miss;
+use --repeat to send each resume twice and measure cache hits too.
+"""
+
+import argparse
+import asyncio
+import io
+import json
+import math
+import random
+import time
+import zipfile
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+import fitz  # PyMuPDF
+import httpx
+
+
+FIRST_NAMES = ["Aarav", "Priya", "Rohan", "Ananya", "Vikram", "Sneha", "Arjun", "Kavya", "Rahul", "Meera"]
+LAST_NAMES = ["Sharma", "Patel", "Iyer", "Gupta", "Reddy", "Nair", "Kumar", "Joshi", "Mehta", "Das"]
+COMPANIES = ["Infosys", "Flipkart", "Razorpay", "Zomato", "Swiggy", "TCS", "Freshworks", "Postman"]
+CITIES = ["Bengaluru", "Pune", "Hyderabad", "Chennai", "Mumbai", "Delhi"]
+
+
+def synthetic_resume(index: int, skills: List[str], rng: random.Random) -> str:
+    """Plain-text resume; the index makes every one unique"""
+    first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+    picked = rng.sample(skills, min(len(skills), 12))
+    jobs = rng.sample(COMPANIES, 2)
+    lines = [
+        f"{first} {last}",
+        f"{first.lower()}.{last.lower()}{index}@example.com | +91 98{rng.randint(10000000, 99999999)} | {rng.choice(CITIES)}",
+        "",
+        "SUMMARY",
+        f"Software engineer (#{index}) with {rng.randint(1, 8)} years of experience building products with "
+        f"{', '.join(picked[:4])}.",
+        "",
+        "SKILLS",
+        ", ".join(picked),
+        "",
+        "EXPERIENCE",
+    ]
+    for company in jobs:
+        lines += [
+            f"Software Engineer, {company} ({rng.randint(2016, 2021)} - {rng.randint(2022, 2025)})",
+            f"- Built services in {rng.choice(picked)} handling {rng.randint(1, 50)}k requests per minute",
+            f"- Reduced latency by {rng.randint(10, 60)}% using {rng.choice(picked)}",
+            f"- Led a team of {rng.randint(2, 8)} engineers delivering {rng.choice(picked)} features",
+        ]
+    lines += [
+        "",
+        "EDUCATION",
+        f"B.Tech in Computer Science, {rng.choice(['IIT Bombay', 'NIT Trichy', 'BITS Pilani', 'VIT Vellore'])}",
+    ]
+    return "\n".join(lines)
+
+
+def to_pdf(text: str) -> bytes:
+    doc = fitz.open()
+    page = doc.new_page()
+    y = 60
+    for line in text.splitlines():
+        page.insert_text((50, y), line, fontsize=10)
+        y += 14
+    data = doc.tobytes()
+    doc.close()
+    return data
+
+
+def to_docx(text: str) -> bytes:
+    """Minimal WordprocessingML package (enough for docx2txt)"""
+    def escape(s: str) -> str:
+        return s.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+
+    paragraphs = "".join(
+        f'<w:p><w:r><w:t xml:space="preserve">{escape(line)}</w:t></w:r></w:p>'
+        for line in text.splitlines()
+    )
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as z:
+        z.writestr("[Content_Types].xml",
+                   '<?xml version="1.0" encoding="UTF-8"?>'
+                   '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+                   '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+                   '<Default Extension="xml" ContentType="application/xml"/>'
+                   '<Override PartName="/word/document.xml" ContentType="application/'
+                   'vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>'
+                   '</Types>')
+        z.writestr("_rels/.rels",
+                   '<?xml version="1.0" encoding="UTF-8"?>'
+                   '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+                   '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/'
+                   'relationships/officeDocument" Target="word/document.xml"/>'
+                   '</Relationships>')
+        z.writestr("word/document.xml",
+                   '<?xml version="1.0" encoding="UTF-8"?>'
+                   '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">'
+                   f'<w:body>{paragraphs}</w:body></w:document>')
+    return buffer.getvalue()
+
+
+def build_corpus(count: int, docx_ratio: float, skills_db: str, seed: int) -> List[Tuple[str, bytes]]:
+    """(filename, bytes) pairs, roughly docx_ratio of them DOCX"""
+    rng = random.Random(seed)
+    with open(skills_db, "r", encoding="utf-8") as f:
+        skills = json.load(f)
+    corpus = []
+    for i in range(count):
+        text = synthetic_resume(i, skills, rng)
+        if rng.random() < docx_ratio:
+            corpus.append((f"resume_{i}.docx", to_docx(text)))
+        else:
+            corpus.append((f"resume_{i}.pdf", to_pdf(text)))
+    return corpus
+
+
+def percentile(values: List[float], p: float) -> Optional[float]:
+    """Nearest-rank percentile"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, math.ceil(p / 100 * len(ordered)) - 1))
+    return ordered[rank]
+
+
+async def run(url: str, corpus: List[Tuple[str, bytes]], concurrency: int, timeout: float) -> Dict:
+    latencies: List[float] = []
+    stages: Dict[str, List[float]] = {}
+    statuses: Counter = Counter()
+    cache_hits = 0
+    queue: asyncio.Queue = asyncio.Queue()
+    for item in corpus:
+        queue.put_nowait(item)
+
+    async def worker(client: httpx.AsyncClient) -> None:
+        nonlocal cache_hits
+        while not queue.empty():
+            filename, data = queue.get_nowait()
+            began = time.perf_counter()
+            try:
+                response = await client.post("/analyze-resume", files={"file": (filename, data)})
+            except httpx.HTTPError as e:
+                statuses[type(e).__name__] += 1
+                continue
+            latencies.append(time.perf_counter() - began)
+            statuses[response.status_code] += 1
+            if response.status_code != 200:
+                continue
+            body = response.json()
+            cache_hits += bool(body.get("cache_hit"))
+            for stage, seconds in (body.get("stage_timings") or {}).items():
+                stages.setdefault(stage, []).append(seconds)
+
+    began = time.perf_counter()
+    async with httpx.AsyncClient(base_url=url, timeout=timeout) as client:
+        await asyncio.gather(*(worker(client) for _ in range(concurrency)))
+    elapsed = time.perf_counter() - began
+
+    ok = statuses.get(200, 0)
+    return {
+        "requests": len(corpus),
+        "elapsed_seconds": round(elapsed, 2),
+        "throughput_rps": round(ok / elapsed, 2) if elapsed else 0.0,
+        "statuses": {str(k): v for k, v in statuses.items()},
+        "cache_hits": cache_hits,
+        "latency": summarize(latencies),
+        "stages": {stage: summarize(values) for stage, values in sorted(stages.items())}
+    }
+
+
+def summarize(values: List[float]) -> Dict[str, Optional[float]]:
+    def r(v):
+        return None if v is None else round(v, 3)
+    return {
+        "count": len(values),
+        "p50": r(percentile(values, 50)),
+        "p95": r(percentile(values, 95)),
+        "p99": r(percentile(values, 99))
+    }
+
+
+def print_report(report: Dict) -> None:
+    print(f"\n{'='*60}")
+    print(f"📊 {report['requests']} requests in {report['elapsed_seconds']}s "
+          f"→ {report['throughput_rps']} successful req/s")
+    print(f"   Status codes: {report['statuses']}   Cache hits: {report['cache_hits']}")
+    print(f"\n{'':<16}{'count':>8}{'p50':>10}{'p95':>10}{'p99':>10}")
+    rows = [("total", report["latency"])] + list(report["stages"].items())
+    for name, s in rows:
+        cells = [f"{s[p]:>10.3f}" if s[p] is not None else f"{'-':>10}" for p in ("p50", "p95", "p99")]
+        print(f"{name:<16}{s['count']:>8}{''.join(cells)}")
+    print(f"{'='*60}\n")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Load test /analyze-resume")
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--requests", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--docx-ratio", type=float, default=0.3, help="Fraction of DOCX uploads")
+    parser.add_argument("--repeat", action="store_true", help="Send every resume twice (cache hits)")
+    parser.add_argument("--timeout", type=float, default=120.0, help="Per-request timeout in seconds")
+    parser.add_argument("--skills-db", default="skills_db.json")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args()
+
+    print(f"🧪 Generating {args.requests} synthetic resumes...")
+    corpus = build_corpus(args.requests, args.docx_ratio, args.skills_db, args.seed)
+    if args.repeat:
+        corpus = corpus + corpus
+
+    print(f"🚀 Sending {len(corpus)} requests to {args.url} ({args.concurrency} concurrent)")
+    report = asyncio.run(run(args.url, corpus, args.concurrency, args.timeout))
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report)
+
+
+if __name__ == "__main__":
+    main()
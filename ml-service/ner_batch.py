@@ -0,0 +1,88 @@
+"""
+Offline NER over many resumes: one JSON line of entities per file
+Streams files through ner_extractor.iter_entities (nlp.pipe), so memory
+stays flat however many resumes there are and output order matches the
+order files are listed
+
+    python ner_batch.py resumes/ -o entities.jsonl --n-process 4
+    python ner_batch.py a.pdf b.docx c.txt --batch-size 64
+
+Files that can't be read are reported on stderr and skipped.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from collections import deque
+from typing import Deque, Iterator, List, Tuple
+
+from app import config
+from app.ner_extractor import iter_entities
+from app.parsers import extract_resume_text
+
+
+SUPPORTED_EXTENSIONS = (".pdf", ".docx", ".txt")
+
+
+def iter_files(paths: List[str]) -> Iterator[str]:
+    """Resume files under paths (directories are walked in sorted order)"""
+    for path in paths:
+        if not os.path.isdir(path):
+            yield path
+            continue
+        for root, dirs, names in os.walk(path):
+            dirs.sort()
+            for name in sorted(names):
+                if name.lower().endswith(SUPPORTED_EXTENSIONS):
+                    yield os.path.join(root, name)
+
+
+def iter_texts(files: Iterator[str]) -> Iterator[Tuple[str, str]]:
+    """(path, text) per readable file"""
+    for path in files:
+        try:
+            if path.lower().endswith(".txt"):
+                with open(path, "r", encoding="utf-8") as f:
+                    text = f.read()
+            else:
+                text = extract_resume_text(path, path)
+        except Exception as e:
+            print(f"⚠  {path}: {e}", file=sys.stderr)
+            continue
+        yield path, text
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Extract entities from resume files with nlp.pipe")
+    parser.add_argument("paths", nargs="+", help="Resume files or directories (.pdf, .docx, .txt)")
+    parser.add_argument("-o", "--output", help="JSONL file to write (default: stdout)")
+    parser.add_argument("--n-process", type=int, default=1, help="spaCy worker processes")
+    parser.add_argument("--batch-size", type=int, default=config.NER_BATCH_SIZE)
+    args = parser.parse_args()
+
+    # iter_entities pulls texts lazily and answers in order: paths queue up between the two
+    paths: Deque[str] = deque()
+
+    def texts() -> Iterator[str]:
+        for path, text in iter_texts(iter_files(args.paths)):
+            paths.append(path)
+            yield text
+
+    out = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+    began = time.perf_counter()
+    count = 0
+    try:
+        for entities in iter_entities(texts(), n_process=args.n_process, batch_size=args.batch_size):
+            out.write(json.dumps({"file": paths.popleft(), "entities": entities.model_dump()}) + "\n")
+            count += 1
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    elapsed = time.perf_counter() - began
+    print(f"✓ {count} resumes in {elapsed:.1f}s ({count / max(elapsed, 1e-9):.1f}/s)", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
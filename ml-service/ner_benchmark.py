@@ -0,0 +1,197 @@
+"""
+NER benchmark: trimmed pipeline vs the full en_core_web_sm pipeline
+Compares per-resume latency and how closely the trimmed pipeline's
+entities match the full pipeline's (taken as the reference)
+
+    python ner_benchmark.py resumes/            # PDF/DOCX/TXT files or directories
+    python ner_benchmark.py --synthetic 200     # generated resumes (see loadtest.py)
+
+"full" runs every component on the whole text (the old behaviour);
+"trimmed" is what the service runs: the rule layer, then NER-only
+components on the sections NER needs when the rules aren't confident
+(app/ner_extractor.py, app/entity_rules.py).
+
+"Skip path" scores only the resumes where the rules were confident and
+the model was skipped: the rule-only entities against the full
+pipeline, next to what the trimmed model would have returned for the
+same resumes. Recall should match; if it drops, rules_confident is
+skipping the model on resumes the rules don't cover.
+"""
+
+import argparse
+import json
+import os
+import random
+import statistics
+import time
+from typing import Dict, List, Set, Tuple
+
+from app import config
+from app.entity_rules import RULER_NAME, rules_confident
+from app.ner_extractor import entities_from_doc, load_spacy_pipeline, ner_doc, ner_text
+from app.models import ExtractedEntity
+from app.parsers import extract_resume_text
+
+
+def load_texts(paths: List[str]) -> List[str]:
+    """Resume texts from files and directories (.pdf, .docx, .txt)"""
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files += sorted(os.path.join(path, name) for name in os.listdir(path))
+        else:
+            files.append(path)
+    texts = []
+    for path in files:
+        name = path.lower()
+        if name.endswith((".pdf", ".docx")):
+            texts.append(extract_resume_text(path, path))
+        elif name.endswith(".txt"):
+            with open(path, "r", encoding="utf-8") as f:
+                texts.append(f.read())
+    return texts
+
+
+def synthetic_texts(count: int, skills_db: str, seed: int) -> List[str]:
+    from loadtest import synthetic_resume
+
+    rng = random.Random(seed)
+    with open(skills_db, "r", encoding="utf-8") as f:
+        skills = json.load(f)
+    return [synthetic_resume(i, skills, rng) for i in range(count)]
+
+
+def time_pipeline(run, texts: List[str]) -> List[float]:
+    """Seconds per document, one call each (as the service does)"""
+    seconds = []
+    for text in texts:
+        began = time.perf_counter()
+        run(text)
+        seconds.append(time.perf_counter() - began)
+    return seconds
+
+
+def overlap(reference: Set[str], candidate: Set[str]) -> Dict[str, float]:
+    """Precision/recall of candidate against reference (1.0 when both are empty)"""
+    hits = len(reference & candidate)
+    return {
+        "precision": hits / len(candidate) if candidate else float(not reference),
+        "recall": hits / len(reference) if reference else float(not candidate)
+    }
+
+
+FIELDS = ("organizations", "locations", "dates")
+
+
+def field_quality(pairs: List[Tuple[ExtractedEntity, ExtractedEntity]]) -> Dict[str, Dict[str, float]]:
+    """Mean precision/recall per field over (reference, candidate) pairs (None when empty)"""
+    quality = {}
+    for field in FIELDS:
+        scores = [overlap(set(getattr(ref, field)), set(getattr(cand, field))) for ref, cand in pairs]
+        quality[field] = {
+            metric: round(statistics.mean(s[metric] for s in scores), 3) if scores else None
+            for metric in ("precision", "recall")
+        }
+    return quality
+
+
+def skipped_model(nlp, text: str) -> bool:
+    """Whether ner_doc takes the rule-only path for this (already selected) text"""
+    if RULER_NAME not in nlp.pipe_names:
+        return False
+    return rules_confident(nlp.get_pipe(RULER_NAME)(nlp.make_doc(text)), text)
+
+
+def compare(full_nlp, trimmed_nlp, texts: List[str]) -> Dict:
+    trimmed_inputs = [ner_text(text) for text in texts]
+
+    # Warm both pipelines before timing
+    full_nlp("warm up")
+    trimmed_nlp("warm up")
+    full_seconds = time_pipeline(full_nlp, texts)
+    trimmed_seconds = time_pipeline(lambda text: ner_doc(trimmed_nlp, text), trimmed_inputs)
+
+    names_equal = 0
+    pairs, rule_pairs, model_pairs = [], [], []
+    for text, trimmed_input in zip(texts, trimmed_inputs):
+        reference = entities_from_doc(full_nlp(text), text)
+        candidate = entities_from_doc(ner_doc(trimmed_nlp, trimmed_input), text)
+        names_equal += reference.name == candidate.name
+        pairs.append((reference, candidate))
+        if skipped_model(trimmed_nlp, trimmed_input):
+            # What the model would have given on the same resume
+            rule_pairs.append((reference, candidate))
+            model_pairs.append((reference, entities_from_doc(trimmed_nlp(trimmed_input), text)))
+
+    def latency(values: List[float]) -> Dict[str, float]:
+        ordered = sorted(values)
+        return {
+            "mean_ms": round(statistics.mean(values) * 1000, 2),
+            "p50_ms": round(ordered[len(ordered) // 2] * 1000, 2),
+            "p95_ms": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1000, 2)
+        }
+
+    return {
+        "documents": len(texts),
+        "components": {"full": full_nlp.pipe_names, "trimmed": trimmed_nlp.pipe_names},
+        "characters": {"full": sum(map(len, texts)), "trimmed": sum(map(len, trimmed_inputs))},
+        "latency": {"full": latency(full_seconds), "trimmed": latency(trimmed_seconds)},
+        "speedup": round(sum(full_seconds) / max(sum(trimmed_seconds), 1e-9), 2),
+        "quality": {"name_agreement": round(names_equal / len(texts), 3), **field_quality(pairs)},
+        "skip_path": {
+            "documents": len(rule_pairs),
+            "rules": field_quality(rule_pairs),
+            "model": field_quality(model_pairs)
+        }
+    }
+
+
+def print_report(report: Dict) -> None:
+    print(f"\n{'='*60}")
+    print(f"🧪 {report['documents']} resumes")
+    print(f"   full:    {', '.join(report['components']['full'])}")
+    print(f"   trimmed: {', '.join(report['components']['trimmed'])}")
+    print(f"   characters processed: {report['characters']['full']} → {report['characters']['trimmed']}")
+    print(f"\n{'':<10}{'mean ms':>10}{'p50 ms':>10}{'p95 ms':>10}")
+    for name in ("full", "trimmed"):
+        s = report["latency"][name]
+        print(f"{name:<10}{s['mean_ms']:>10.2f}{s['p50_ms']:>10.2f}{s['p95_ms']:>10.2f}")
+    print(f"\n⚡ Speedup: {report['speedup']}x")
+    quality = report["quality"]
+    print(f"\n🎯 Trimmed vs full: name agreement {quality['name_agreement']:.1%}")
+    for field in FIELDS:
+        print(f"   {field:<14} precision {quality[field]['precision']:.3f}  recall {quality[field]['recall']:.3f}")
+    skip = report["skip_path"]
+    print(f"\n⏭️  Skip path: model skipped on {skip['documents']}/{report['documents']} resumes")
+    if skip["documents"]:
+        print(f"   {'recall':<14} {'rules':>8} {'model':>8}")
+        for field in FIELDS:
+            print(f"   {field:<14} {skip['rules'][field]['recall']:>8.3f} {skip['model'][field]['recall']:>8.3f}")
+    print(f"{'='*60}\n")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the trimmed NER pipeline against the full one")
+    parser.add_argument("paths", nargs="*", help="Resume files or directories (.pdf, .docx, .txt)")
+    parser.add_argument("--synthetic", type=int, default=0, help="Also generate this many resumes")
+    parser.add_argument("--skills-db", default="skills_db.json")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args()
+
+    texts = load_texts(args.paths)
+    if args.synthetic:
+        texts += synthetic_texts(args.synthetic, args.skills_db, args.seed)
+    if not texts:
+        parser.error("no resumes: pass files/directories or --synthetic N")
+
+    print("📥 Loading full and trimmed spaCy pipelines...")
+    report = compare(load_spacy_pipeline(full=True), load_spacy_pipeline(full=False, rules=config.NER_RULES), texts)
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,388 @@
+"""
+Offline bulk re-processing of the resume archive
+Re-runs parsing, NER and skill matching over every resume in directories
+and archives, for when skills_db.json, the models or the pipeline change
+
+    python reprocess.py archive/ resumes-2023.zip -o results.jsonl --workers 4
+    python reprocess.py archive/ -o results/ --format parquet   # needs pyarrow
+    python reprocess.py archive/ -o results.jsonl --retry-failed  # re-run earlier errors
+
+- Inputs: directories (walked in sorted order), .pdf/.docx files, and
+  .zip / .tar(.gz) archives of them, read lazily
+- Chunks of resumes run on a process pool; each chunk is parsed, NER'd
+  (nlp.pipe) and encoded together, like the batch endpoint
+- Results are written as each chunk finishes: one JSON line per resume,
+  or one Parquet part file per chunk (written whole, then renamed into
+  place)
+- The output is the checkpoint: re-running the same command skips every
+  resume already processed successfully, so a crash or Ctrl-C loses at
+  most the chunks in flight. Resumes that failed are skipped too but
+  reported; --retry-failed runs them again. Output is append-only, so a
+  retried resume has more than one record: the last one wins
+- Records carry the pipeline version; resuming into output from a
+  different version is refused (use --restart or a new output)
+
+Gemini analysis is not re-run here; it is per request and billed.
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import tarfile
+import time
+import zipfile
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterator, List, Set, Tuple
+
+from app import config
+from app.cache import pipeline_version
+
+
+SUPPORTED_EXTENSIONS = (".pdf", ".docx")
+ARCHIVE_EXTENSIONS = (".zip", ".tar", ".tar.gz", ".tgz")
+
+# Separates an archive path from a member name in record keys
+MEMBER_SEPARATOR = "!"
+
+
+@dataclass
+class Source:
+    """One resume: its record key, and how to get its bytes or path"""
+    key: str
+    filename: str
+    load: Callable[[], Any]
+
+
+# Inputs
+
+def _member_source(archive_path: str, member: str, read: Callable[[], bytes]) -> Source:
+    return Source(key=f"{archive_path}{MEMBER_SEPARATOR}{member}", filename=member, load=read)
+
+
+def _zip_sources(path: str, max_bytes: int) -> Iterator[Source]:
+    archive = zipfile.ZipFile(path)
+    for info in archive.infolist():
+        if info.is_dir() or not info.filename.lower().endswith(SUPPORTED_EXTENSIONS):
+            continue
+        if info.file_size > max_bytes:
+            print(f"⚠  {path}{MEMBER_SEPARATOR}{info.filename}: larger than {config.BATCH_MAX_FILE_MB} MB, skipped",
+                  file=sys.stderr)
+            continue
+        yield _member_source(path, info.filename, lambda info=info: archive.read(info))
+
+
+def _tar_sources(path: str, max_bytes: int) -> Iterator[Source]:
+    archive = tarfile.open(path)
+    # Archive order: compressed tars can only be read front to back cheaply
+    for member in archive.getmembers():
+        if not member.isfile() or not member.name.lower().endswith(SUPPORTED_EXTENSIONS):
+            continue
+        if member.size > max_bytes:
+            print(f"⚠  {path}{MEMBER_SEPARATOR}{member.name}: larger than {config.BATCH_MAX_FILE_MB} MB, skipped",
+                  file=sys.stderr)
+            continue
+        yield _member_source(path, member.name, lambda member=member: archive.extractfile(member).read())
+
+
+def _file_sources(path: str, max_bytes: int) -> Iterator[Source]:
+    name = path.lower()
+    if name.endswith(".zip"):
+        yield from _zip_sources(path, max_bytes)
+    elif name.endswith(ARCHIVE_EXTENSIONS):
+        yield from _tar_sources(path, max_bytes)
+    elif name.endswith(SUPPORTED_EXTENSIONS):
+        # Workers open plain files themselves; only the path is sent
+        yield Source(key=path, filename=path, load=lambda: path)
+
+
+def iter_sources(paths: List[str]) -> Iterator[Source]:
+    """Every resume under paths, in a stable order (archive members in archive order)"""
+    max_bytes = config.BATCH_MAX_FILE_MB * 1024 * 1024
+    for path in paths:
+        if not os.path.isdir(path):
+            yield from _file_sources(path, max_bytes)
+            continue
+        for root, dirs, names in os.walk(path):
+            dirs.sort()
+            for name in sorted(names):
+                yield from _file_sources(os.path.join(root, name), max_bytes)
+
+
+# Worker side
+
+def _init_worker() -> None:
+    """Load spaCy, Sentence-BERT and the skill catalog once per worker"""
+    import app.ner_extractor  # noqa: F401
+    import app.skill_matcher  # noqa: F401
+    from app.executors import CPU_MODELS
+    from app.model_registry import registry
+
+    registry.warm_up(CPU_MODELS)
+
+
+def process_chunk(items: List[Tuple[str, str, Any]], version: str) -> List[Dict[str, Any]]:
+    """
+    extract_resume_text -> extract_entities -> extract_skills for a chunk
+
+    Args:
+        items: (key, filename, path or bytes) per resume
+        version: Pipeline version stamped on every record
+
+    Returns:
+        One record per item, in input order
+    """
+    from app.ner_extractor import extract_entities_batch
+    from app.parsers import extract_resume_text
+    from app.skill_matcher import extract_skills_batch
+
+    records, texts = [], []
+    for key, filename, source in items:
+        record = {"file": key, "pipeline_version": version, "error": None, "characters": 0,
+                  "entities": None, "skills": []}
+        try:
+            text = extract_resume_text(source, filename)
+            record["characters"] = len(text)
+            if len(text) < 100:
+                record["error"] = "Resume text too short"
+        except Exception as e:
+            text, record["error"] = "", str(e)
+        records.append(record)
+        texts.append(text)
+
+    ok = [i for i, record in enumerate(records) if record["error"] is None]
+    if ok:
+        ok_texts = [texts[i] for i in ok]
+        # One process per worker already; spaCy stays in-process
+        entities = extract_entities_batch(ok_texts, n_process=1, batch_size=config.NER_BATCH_SIZE)
+        skills = extract_skills_batch(ok_texts)
+        for i, entity, skill_list in zip(ok, entities, skills):
+            records[i]["entities"] = entity.model_dump()
+            records[i]["skills"] = [skill.model_dump() for skill in skill_list]
+    return records
+
+
+# Output (doubles as the checkpoint)
+
+class JsonlOutput:
+    """Appends one JSON line per record; a torn last line is dropped on resume"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = None
+
+    def existing(self) -> List[Dict[str, Any]]:
+        """Records already written (and truncate a partially written tail)"""
+        if not os.path.exists(self.path):
+            return []
+        records, good_bytes = [], 0
+        with open(self.path, "rb") as f:
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break
+                try:
+                    records.append(json.loads(line))
+                except ValueError:
+                    break
+                good_bytes += len(line)
+        if good_bytes < os.path.getsize(self.path):
+            with open(self.path, "r+b") as f:
+                f.truncate(good_bytes)
+        return records
+
+    def open(self, restart: bool) -> None:
+        self._file = open(self.path, "w" if restart else "a", encoding="utf-8")
+
+    def write(self, records: List[Dict[str, Any]]) -> None:
+        for record in records:
+            self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+
+
+class ParquetOutput:
+    """
+    A directory of Parquet part files, one per finished chunk
+
+    Each part is written whole then renamed, so every part on disk is
+    complete and nothing written is lost on a crash; parts are read back
+    in name order. Entities and skills are stored as JSON strings so the
+    schema stays flat.
+    """
+
+    COLUMNS = ("file", "pipeline_version", "error", "characters", "entities", "skills")
+
+    def __init__(self, path: str):
+        try:
+            import pyarrow  # noqa: F401
+            import pyarrow.parquet  # noqa: F401
+        except ImportError:
+            raise SystemExit("Parquet output needs pyarrow: pip install pyarrow (or use --format jsonl)")
+        self.path = path
+        self._next_part = 0
+
+    def _parts(self) -> List[str]:
+        if not os.path.isdir(self.path):
+            return []
+        return sorted(name for name in os.listdir(self.path) if name.startswith("part-") and name.endswith(".parquet"))
+
+    def existing(self) -> List[Dict[str, Any]]:
+        import pyarrow.parquet as pq
+
+        records = []
+        for name in self._parts():
+            table = pq.read_table(os.path.join(self.path, name), columns=["file", "pipeline_version", "error"])
+            records += table.to_pylist()
+        return records
+
+    def open(self, restart: bool) -> None:
+        os.makedirs(self.path, exist_ok=True)
+        for name in os.listdir(self.path):
+            # Leftovers of a part that was being written when the run died
+            if name.endswith(".tmp") or (restart and name.startswith("part-")):
+                os.remove(os.path.join(self.path, name))
+        parts = self._parts()
+        self._next_part = int(parts[-1][5:10]) + 1 if parts else 0
+
+    def write(self, records: List[Dict[str, Any]]) -> None:
+        if not records:
+            return
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        columns = {name: [] for name in self.COLUMNS}
+        for record in records:
+            for name in self.COLUMNS:
+                value = record[name]
+                columns[name].append(json.dumps(value, ensure_ascii=False) if name in ("entities", "skills") else value)
+        final = os.path.join(self.path, f"part-{self._next_part:05d}.parquet")
+        pq.write_table(pa.table(columns), final + ".tmp")
+        os.replace(final + ".tmp", final)
+        self._next_part += 1
+
+    def close(self) -> None:
+        pass
+
+
+# Driver
+
+def latest_records(records: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """The last record per resume key (later records supersede retried ones)"""
+    return {record["file"]: record for record in records}
+
+
+def _chunks(sources: Iterator[Source], skip: Set[str], size: int) -> Iterator[List[Source]]:
+    chunk: List[Source] = []
+    for source in sources:
+        if source.key in skip:
+            continue
+        chunk.append(source)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _load(chunk: List[Source]) -> Tuple[List[Tuple[str, str, Any]], List[Dict[str, Any]]]:
+    """Read a chunk's archive members; unreadable ones become error records"""
+    items, failed = [], []
+    for source in chunk:
+        try:
+            items.append((source.key, source.filename, source.load()))
+        except Exception as e:
+            failed.append({"file": source.key, "error": str(e)})
+    return items, failed
+
+
+def run(args: argparse.Namespace) -> Dict[str, Any]:
+    version = pipeline_version()
+    output = ParquetOutput(args.output) if args.format == "parquet" else JsonlOutput(args.output)
+
+    done: Set[str] = set()
+    failed: Set[str] = set()
+    if not args.restart:
+        existing = output.existing()
+        versions = {record.get("pipeline_version") for record in existing} - {version}
+        if versions:
+            raise SystemExit(f"{args.output} holds results of pipeline version {', '.join(sorted(map(str, versions)))}, "
+                             f"not {version}: pass --restart or choose a new output")
+        for key, record in latest_records(existing).items():
+            (failed if record.get("error") else done).add(key)
+        if done or failed:
+            print(f"↻ Resuming: {len(done)} resumes done and {len(failed)} failed in {args.output}", file=sys.stderr)
+        if failed and not args.retry_failed:
+            print(f"   skipping the {len(failed)} failed resumes; pass --retry-failed to run them again",
+                  file=sys.stderr)
+    output.open(args.restart)
+
+    skip = done if args.retry_failed else done | failed
+    stats = {"pipeline_version": version, "skipped": len(done), "skipped_failed": len(skip) - len(done),
+             "processed": 0, "errors": 0}
+    began = time.perf_counter()
+
+    def finish(records: List[Dict[str, Any]]) -> None:
+        output.write(records)
+        stats["processed"] += len(records)
+        stats["errors"] += sum(1 for record in records if record["error"])
+        rate = stats["processed"] / max(time.perf_counter() - began, 1e-9)
+        print(f"   {stats['processed']} done ({stats['errors']} errors), {rate:.1f} resumes/s", file=sys.stderr)
+
+    # spawn, not fork: forking after torch has started threads can deadlock (see executors.py)
+    pool = ProcessPoolExecutor(max_workers=args.workers, mp_context=multiprocessing.get_context("spawn"),
+                               initializer=_init_worker)
+    in_flight: Set[Future] = set()
+    try:
+        for chunk in _chunks(iter_sources(args.paths), skip, args.chunk_size):
+            # Only a few chunks are read ahead, however large the archive
+            while len(in_flight) >= args.workers * 2:
+                finished, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    finish(future.result())
+            items, chunk_failed = _load(chunk)
+            if chunk_failed:
+                finish([{"pipeline_version": version, "characters": 0, "entities": None, "skills": [], **record}
+                        for record in chunk_failed])
+            if items:
+                in_flight.add(pool.submit(process_chunk, items, version))
+        for future in wait(in_flight).done:
+            finish(future.result())
+        in_flight = set()
+    except KeyboardInterrupt:
+        print("\n⏹  Interrupted; finished resumes are saved, re-run the same command to continue", file=sys.stderr)
+    finally:
+        pool.shutdown(wait=not in_flight, cancel_futures=True)
+        output.close()
+
+    stats["seconds"] = round(time.perf_counter() - began, 2)
+    return stats
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Re-run parsing, NER and skill matching over a resume archive")
+    parser.add_argument("paths", nargs="+", help="Directories, .pdf/.docx files, or .zip/.tar(.gz) archives")
+    parser.add_argument("-o", "--output", required=True,
+                        help="JSONL file, or a directory of part files for --format parquet")
+    parser.add_argument("--format", choices=("jsonl", "parquet"), default="jsonl")
+    parser.add_argument("--workers", type=int, default=max(1, config.CPU_WORKERS),
+                        help="Worker processes (each loads the models once)")
+    parser.add_argument("--chunk-size", type=int, default=config.BATCH_CHUNK_SIZE,
+                        help="Resumes per worker task")
+    parser.add_argument("--restart", action="store_true", help="Discard existing output instead of resuming")
+    parser.add_argument("--retry-failed", action="store_true",
+                        help="When resuming, run the resumes whose last record is an error again")
+    args = parser.parse_args()
+
+    print(f"📥 Re-processing with {args.workers} workers (pipeline version {pipeline_version()})", file=sys.stderr)
+    stats = run(args)
+    print(f"✓ {json.dumps(stats)}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
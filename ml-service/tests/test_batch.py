@@ -0,0 +1,105 @@
+"""Batch endpoint streaming: results, summary, the Gemini concurrency cap and early close"""
+
+import asyncio
+import json
+
+import pytest
+
+from app import batch, config
+from app.batch import BatchSource, stream_batch
+
+
+class FakeExecutor:
+    """Runs "CPU" work inline: every resume parses to a fixed text"""
+    cpu_workers = 2
+
+    async def run_cpu(self, fn, items):
+        return [{"text": "resume text", "entities": None, "skills": [], "error": None} for _ in items]
+
+
+def sources(count):
+    async def read():
+        return b"%PDF"
+    return [BatchSource(index=i, filename=f"r{i}.pdf", read=read) for i in range(count)]
+
+
+async def collect(stream):
+    return [json.loads(line) async for line in stream]
+
+
+@pytest.fixture
+def llm_calls(monkeypatch):
+    """Replace gemini_stage; records the most calls seen in flight at once"""
+    state = {"running": 0, "peak": 0, "calls": 0}
+
+    async def fake_gemini_stage(text, skills, entities):
+        state["running"] += 1
+        state["calls"] += 1
+        state["peak"] = max(state["peak"], state["running"])
+        await asyncio.sleep(0.01)
+        state["running"] -= 1
+        return None
+
+    monkeypatch.setattr(batch, "executor", FakeExecutor())
+    monkeypatch.setattr(batch, "gemini_stage", fake_gemini_stage)
+    monkeypatch.setattr(config, "BATCH_CHUNK_SIZE", 50)
+    return state
+
+
+def test_llm_calls_are_bounded(llm_calls, monkeypatch):
+    monkeypatch.setattr(config, "BATCH_LLM_CONCURRENCY", 3)
+    lines = asyncio.run(collect(stream_batch(sources(40), include_analysis=True)))
+
+    assert llm_calls["calls"] == 40
+    assert llm_calls["peak"] == 3
+    assert lines[-1]["status"] == "done"
+    assert lines[-1]["succeeded"] == 40
+    assert sorted(line["index"] for line in lines[:-1]) == list(range(40))
+
+
+def test_no_llm_calls_without_analysis(llm_calls):
+    lines = asyncio.run(collect(stream_batch(sources(5), include_analysis=False)))
+
+    assert llm_calls["calls"] == 0
+    assert all(line["status"] == "success" for line in lines[:-1])
+
+
+def test_parse_errors_are_reported_per_resume(llm_calls, monkeypatch):
+    class FailingExecutor(FakeExecutor):
+        async def run_cpu(self, fn, items):
+            return [{"text": "", "entities": None, "skills": [], "error": "Resume text too short"} for _ in items]
+
+    monkeypatch.setattr(batch, "executor", FailingExecutor())
+    lines = asyncio.run(collect(stream_batch(sources(3), include_analysis=True)))
+
+    assert [line["error"] for line in lines[:-1]] == ["Resume text too short"] * 3
+    assert lines[-1]["failed"] == 3
+    assert llm_calls["calls"] == 0
+
+
+def test_closing_the_stream_early_leaves_no_pending_tasks(llm_calls, monkeypatch):
+    cancelled = []
+
+    async def slow_gemini_stage(text, skills, entities):
+        llm_calls["calls"] += 1
+        try:
+            # The first resume answers at once, the rest are still running
+            await asyncio.sleep(0 if llm_calls["calls"] == 1 else 10)
+        except asyncio.CancelledError:
+            cancelled.append(llm_calls["calls"])
+            raise
+
+    async def first_line_then_close():
+        stream = stream_batch(sources(8), include_analysis=True)
+        line = json.loads(await stream.__anext__())
+        await stream.aclose()
+        return line, asyncio.all_tasks() - {asyncio.current_task()}
+
+    monkeypatch.setattr(batch, "gemini_stage", slow_gemini_stage)
+    monkeypatch.setattr(config, "BATCH_CHUNK_SIZE", 1)
+    monkeypatch.setattr(config, "BATCH_LLM_CONCURRENCY", 8)
+    line, pending = asyncio.run(first_line_then_close())
+
+    assert line["status"] == "success"
+    assert pending == set()
+    assert cancelled and len(cancelled) == llm_calls["calls"] - 1
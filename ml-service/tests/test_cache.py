@@ -0,0 +1,126 @@
+"""Result and stage caches: LRU/TTL, SQLite eviction, two tiers, cache keys"""
+
+import pytest
+
+from app import cache, config
+from app.cache import LRUCache, ResultCache, SQLiteCache, pipeline_version, text_hash
+
+
+class Clock:
+    """Stands in for the time module inside app.cache"""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+    def time(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(cache, "time", clock)
+    return clock
+
+
+def test_lru_evicts_the_least_recently_used():
+    lru = LRUCache(max_entries=2)
+    lru.set("a", 1)
+    lru.set("b", 2)
+    assert lru.get("a") == 1
+    lru.set("c", 3)
+
+    assert lru.get("b") is None
+    assert (lru.get("a"), lru.get("c")) == (1, 3)
+    assert lru.stats() == {"entries": 2, "max_entries": 2, "hits": 3, "misses": 1, "evictions": 1}
+
+
+def test_lru_entries_expire(clock):
+    lru = LRUCache(max_entries=2, ttl_seconds=10)
+    lru.set("a", 1)
+    clock.now += 9
+    assert lru.get("a") == 1
+    clock.now += 2
+    assert lru.get("a") is None
+    assert lru.stats()["entries"] == 0
+
+
+def test_lru_with_no_room_stores_nothing():
+    lru = LRUCache(max_entries=0)
+    lru.set("a", 1)
+    assert lru.get("a") is None
+
+
+def test_sqlite_expires_and_evicts_by_size(tmp_path, clock):
+    disk = SQLiteCache(str(tmp_path / "cache.db"), ttl_seconds=100, max_bytes=10)
+    disk.set("a", b"12345")
+    clock.now += 1
+    disk.set("b", b"12345")
+    clock.now += 1
+    assert disk.get("a") == b"12345"  # a is now the most recently used
+    clock.now += 1
+    disk.set("c", b"12345")
+
+    assert disk.get("b") is None
+    assert disk.get("a") == disk.get("c") == b"12345"
+    assert disk.stats()["bytes"] == 10
+
+    clock.now += 101
+    assert disk.get("a") is None
+
+
+def test_sqlite_survives_reopening(tmp_path):
+    path = str(tmp_path / "cache.db")
+    SQLiteCache(path, ttl_seconds=100, max_bytes=1000).set("a", b"value")
+    assert SQLiteCache(path, ttl_seconds=100, max_bytes=1000).get("a") == b"value"
+
+
+def test_result_cache_promotes_disk_hits_to_memory(tmp_path):
+    disk = SQLiteCache(str(tmp_path / "cache.db"), ttl_seconds=100, max_bytes=1000)
+    disk.set("v1:abc", b"{}")
+    results = ResultCache("v1", LRUCache(4), disk)
+
+    assert results.key_for("abc") == "v1:abc"
+    assert results.get("v1:abc") == b"{}"
+    assert results.memory.get("v1:abc") == b"{}"
+    assert results.get("v1:missing") is None
+
+
+def test_result_cache_without_disk(tmp_path):
+    results = ResultCache("v1", LRUCache(4))
+    results.set("k", b"x")
+    assert results.get("k") == b"x"
+    assert results.stats()["disk"] is None
+
+
+def test_text_hash_ignores_spacing_but_not_case():
+    assert text_hash("Priya  Sharma\t\nPython ,  Go \r\n") == text_hash("Priya Sharma\nPython , Go")
+    # Composed and decomposed accents (NFC)
+    assert text_hash("Cafe\u0301") == text_hash("Caf\u00e9")
+    assert text_hash("python") != text_hash("Python")
+
+
+def test_text_hash_keeps_line_breaks():
+    # One line or two reads differently to the chunker, sections and header name
+    assert text_hash("John Doe\nPython Java") != text_hash("John Doe Python Java")
+    assert text_hash("Skills\nPython\n\nGo") != text_hash("Skills\nPython\nGo")
+
+
+def test_pipeline_version_tracks_flags_and_the_skills_db(tmp_path, monkeypatch):
+    skills = tmp_path / "skills.json"
+    skills.write_text('["Python"]', encoding="utf-8")
+    monkeypatch.setattr(config, "SKILLS_DB_PATH", str(skills))
+    base = pipeline_version()
+    assert pipeline_version() == base
+
+    for flag, value in (("PDF_LAYOUT", True), ("SKILL_LEXICON", False), ("NER_FULL_PIPELINE", True),
+                        ("NER_RULES", False), ("PIPELINE_VERSION", "other")):
+        with monkeypatch.context() as m:
+            m.setattr(config, flag, value)
+            assert pipeline_version() != base, flag
+
+    skills.write_text('["Python", "Go"]', encoding="utf-8")
+    assert pipeline_version() != base
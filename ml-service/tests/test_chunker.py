@@ -0,0 +1,69 @@
+"""Section-aware chunking: dropped sections, junk, skills lines and the cap"""
+
+from app.chunker import chunk_resume, select_sections
+
+
+RESUME = """Jane Doe
+jane@example.com | +91 98765 43210
+
+Skills
+Python
+Go
+SQL
+Machine Learning, Deep Learning
+
+Experience
+Built data pipelines in Spark and
+Airflow for the analytics team.
+- Led migration to Kubernetes
+Jan 2020 - Present
+
+Education
+B.Tech Computer Science, 2019
+"""
+
+
+def test_single_word_skill_lines_are_kept():
+    result = chunk_resume(RESUME, max_chunks=0)
+    skills = [chunk for chunk, kind in zip(result.chunks, result.sections) if kind == "skills"]
+    assert skills == ["Python", "Go", "SQL", "Machine Learning, Deep Learning"]
+
+
+def test_short_lines_outside_skills_are_still_dropped():
+    result = chunk_resume("Summary\nPython\nGo\n\nProjects\nGo", max_chunks=0)
+    assert result.chunks == []
+    # "Python Go" (wrapped lines merged) and "Go"
+    assert result.dropped["length"] == 2
+
+
+def test_header_education_and_dates_are_dropped():
+    result = chunk_resume(RESUME, max_chunks=0)
+    assert not any("jane@example.com" in chunk or "B.Tech" in chunk for chunk in result.chunks)
+    assert result.dropped["section"] >= 3
+    assert result.dropped["junk"] >= 1
+
+
+def test_wrapped_lines_merge_and_bullets_split():
+    result = chunk_resume(RESUME, max_chunks=0)
+    experience = [chunk for chunk, kind in zip(result.chunks, result.sections) if kind == "experience"]
+    assert experience == [
+        "Built data pipelines in Spark and Airflow for the analytics team.",
+        "Led migration to Kubernetes"
+    ]
+
+
+def test_duplicates_are_dropped():
+    result = chunk_resume("Skills\nPython\npython\n PYTHON ", max_chunks=0)
+    assert result.chunks == ["Python"]
+    assert result.dropped["duplicate"] == 2
+
+
+def test_cap_prefers_skills_then_keeps_document_order():
+    text = "Summary\nI enjoy building reliable backend systems.\n\nSkills\nPython\nGo\nRust"
+    result = chunk_resume(text, max_chunks=2)
+    assert result.chunks == ["Python", "Go"]
+    assert result.dropped["cap"] == 2
+
+
+def test_select_sections():
+    assert select_sections(RESUME, ["education"]) == "B.Tech Computer Science, 2019"
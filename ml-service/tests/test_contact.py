@@ -0,0 +1,78 @@
+"""Single-pass contact scanner: formats, dates that look like phones, slow inputs"""
+
+import time
+
+import pytest
+
+from app.contact import Contact, scan_contact
+
+
+@pytest.mark.parametrize("text, phone", [
+    ("+44 20 7946 0958", "+44 20 7946 0958"),
+    ("+1 (415) 555-2671", "+1 (415) 555-2671"),
+    ("+91-98765 43210", "+91-98765 43210"),
+    ("098765 43210", "098765 43210"),
+    ("Mobile: 9876543210.", "9876543210"),
+    ("+1 (415) 555-0132 Jan 2021", "+1 (415) 555-0132"),
+])
+def test_phone_formats(text, phone):
+    assert scan_contact(text).phone == phone
+
+
+@pytest.mark.parametrize("text, phone", [
+    ("Phone: 9876543210 2021", "9876543210"),
+    ("Tel 98765 43210 - 2021", "98765 43210"),
+    ("2021 9876543210", "9876543210"),
+])
+def test_phone_stops_before_a_year(text, phone):
+    assert scan_contact(text).phone == phone
+
+
+@pytest.mark.parametrize("text", [
+    "Employee since 01.2019 - 12.2022",
+    "2019 - 2022 2023",
+    "2018 2019 2020 2021",
+    "Order 12345",
+    "Ref 1234567890123456789",
+])
+def test_dates_and_ids_are_not_phones(text):
+    assert scan_contact(text).phone is None
+
+
+def test_all_fields_in_one_pass():
+    text = (
+        "Priya Sharma\n"
+        "priya.sharma+jobs@mail.example.co.in | +91 98765 43210\n"
+        "linkedin.com/in/priya-sharma- | https://github.com/priya-s\n"
+    )
+    assert scan_contact(text) == Contact(
+        email="priya.sharma+jobs@mail.example.co.in",
+        phone="+91 98765 43210",
+        linkedin="https://www.linkedin.com/in/priya-sharma",
+        github="https://github.com/priya-s",
+    )
+
+
+def test_first_match_wins_and_missing_fields_are_none():
+    contact = scan_contact("a@example.com b@example.com")
+    assert contact == Contact(email="a@example.com")
+
+
+def test_urls_inside_other_urls_are_ignored():
+    assert scan_contact("https://example.com/github.com/someone").github is None
+    assert scan_contact("github.com/bad--name").github is None
+
+
+@pytest.mark.parametrize("text", [
+    "a" * 100000,
+    "9" * 100000,
+    "9 " * 50000,
+    "a." * 50000 + "@",
+    "x@" + "a-" * 50000,
+    "+9" * 50000,
+])
+def test_pathological_inputs_stay_linear(text):
+    began = time.perf_counter()
+    scan_contact(text)
+    # The old patterns took tens of seconds on these
+    assert time.perf_counter() - began < 1.0
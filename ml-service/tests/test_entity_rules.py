@@ -0,0 +1,79 @@
+"""Rule layer: header names and when the rules may skip the statistical model"""
+
+import re
+from dataclasses import dataclass
+
+from app.entity_rules import header_name, rules_confident
+
+
+@dataclass
+class Span:
+    label_: str
+    start_char: int
+    end_char: int
+
+
+@dataclass
+class Doc:
+    ents: tuple
+
+
+def labelled(text, **phrases):
+    """A Doc whose ents are every occurrence of each phrase: labelled(text, ORG=[...], DATE=[...])"""
+    ents = [
+        Span(label, m.start(), m.end())
+        for label, values in phrases.items()
+        for value in values
+        for m in re.finditer(re.escape(value), text)
+    ]
+    return Doc(tuple(sorted(ents, key=lambda e: e.start_char)))
+
+
+RESUME = """Priya Sharma
+Bengaluru, India
+Acme Technologies
+Software Engineer, Jan 2021 - Present
+Infosys | Intern | Jun 2019 - Dec 2020
+IIT Bombay
+B.Tech Computer Science, 2015 - 2019
+"""
+
+ORGS = ["Acme Technologies", "Infosys", "IIT Bombay"]
+DATES = ["Jan 2021 - Present", "Jun 2019 - Dec 2020", "2015 - 2019"]
+
+
+def test_header_name():
+    assert header_name(RESUME) == "Priya Sharma"
+    assert header_name("ROHAN K. IYER\nrohan@example.com") == "Rohan K. Iyer"
+    assert header_name("Curriculum Vitae\nSoftware Engineer\nWork Experience") is None
+    assert header_name("Resume\nx\ny\nz\nPriya Sharma") is None
+
+
+def test_confident_when_every_entry_is_covered():
+    doc = labelled(RESUME, ORG=ORGS, GPE=["Bengaluru"], DATE=DATES)
+    assert rules_confident(doc, RESUME)
+
+
+def test_an_entry_without_its_org_runs_the_model():
+    # Infosys is unknown to the rules: its dated line has no ORG near it
+    doc = labelled(RESUME, ORG=["Acme Technologies", "IIT Bombay"], GPE=["Bengaluru"], DATE=DATES)
+    assert not rules_confident(doc, RESUME)
+
+
+def test_an_org_is_not_shared_with_the_previous_entry():
+    text = RESUME.replace("Infosys | Intern |", "Intern |")
+    doc = labelled(text, ORG=ORGS, GPE=["Bengaluru"], DATE=DATES)
+    # Acme is above the Intern line but belongs to the entry before it
+    assert not rules_confident(doc, text)
+
+
+def test_a_year_the_rules_did_not_label_runs_the_model():
+    text = RESUME + "Freelance, Globex Systems, 06/2018\n"
+    doc = labelled(text, ORG=ORGS + ["Globex Systems"], GPE=["Bengaluru"], DATE=DATES)
+    assert not rules_confident(doc, text)
+
+
+def test_missing_name_place_or_org_runs_the_model():
+    assert not rules_confident(labelled(RESUME, ORG=ORGS, DATE=DATES), RESUME)
+    text = RESUME.replace("Priya Sharma", "Software Engineer")
+    assert not rules_confident(labelled(text, ORG=ORGS, GPE=["Bengaluru"], DATE=DATES), text)
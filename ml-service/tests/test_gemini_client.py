@@ -0,0 +1,214 @@
+"""Circuit breaker states and the ResilientClient retry/hedge/cancel policies"""
+
+import asyncio
+
+import pytest
+
+from app import gemini_client
+from app.gemini_client import CircuitBreaker, CircuitOpenError, ResilientClient, is_retryable
+
+
+class Clock:
+    """Stands in for the time module inside gemini_client (asyncio keeps the real one)"""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(gemini_client, "time", clock)
+    return clock
+
+
+class StatusError(Exception):
+    def __init__(self, code):
+        super().__init__(f"HTTP {code}")
+        self.code = code
+
+
+def client(send, breaker=None, **overrides):
+    options = dict(attempt_timeout=1.0, deadline=5.0, max_retries=2, backoff_base=0.0, hedge_after=0.0)
+    options.update(overrides)
+    return ResilientClient(send, breaker=breaker or CircuitBreaker(3, 30.0), **options)
+
+
+def test_breaker_opens_after_consecutive_failures(clock):
+    breaker = CircuitBreaker(failure_threshold=2, cooldown_seconds=10.0)
+    breaker.record_failure()
+    assert breaker.state == "closed"
+    breaker.record_failure()
+    assert breaker.state == "open"
+    assert not breaker.allow()
+
+
+def test_success_resets_the_failure_count(clock):
+    breaker = CircuitBreaker(failure_threshold=2, cooldown_seconds=10.0)
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    assert breaker.state == "closed"
+
+
+def test_half_open_allows_a_single_trial(clock):
+    breaker = CircuitBreaker(failure_threshold=1, cooldown_seconds=10.0)
+    breaker.record_failure()
+    clock.now += 10.0
+    assert breaker.state == "half_open"
+    assert breaker.allow()
+    assert not breaker.allow()
+
+    breaker.record_success()
+    assert breaker.state == "closed"
+    assert breaker.allow()
+
+
+def test_failed_trial_reopens(clock):
+    breaker = CircuitBreaker(failure_threshold=1, cooldown_seconds=10.0)
+    breaker.record_failure()
+    clock.now += 10.0
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == "open"
+
+
+def test_is_retryable():
+    assert is_retryable(asyncio.TimeoutError())
+    assert is_retryable(ConnectionError())
+    assert is_retryable(StatusError(429))
+    assert is_retryable(StatusError(503))
+    assert not is_retryable(StatusError(400))
+    assert not is_retryable(ValueError("bad prompt"))
+
+
+def test_retries_retryable_errors_then_succeeds():
+    calls = []
+
+    async def send(prompt):
+        calls.append(prompt)
+        if len(calls) < 3:
+            raise StatusError(503)
+        return "ok"
+
+    resilient = client(send)
+    assert asyncio.run(resilient.generate("p")) == "ok"
+    assert len(calls) == 3
+    assert resilient.stats["retries"] == 2
+    assert resilient.breaker.failures == 0
+
+
+def test_does_not_retry_client_errors():
+    calls = []
+
+    async def send(prompt):
+        calls.append(prompt)
+        raise StatusError(400)
+
+    resilient = client(send)
+    with pytest.raises(StatusError):
+        asyncio.run(resilient.generate("p"))
+    assert len(calls) == 1
+    assert resilient.breaker.failures == 1
+
+
+def test_attempt_timeout_counts_and_is_retried():
+    calls = []
+
+    async def send(prompt):
+        calls.append(prompt)
+        if len(calls) == 1:
+            await asyncio.sleep(1)
+        return "late ok"
+
+    resilient = client(send, attempt_timeout=0.02)
+    assert asyncio.run(resilient.generate("p")) == "late ok"
+    assert resilient.stats["timeouts"] == 1
+
+
+def test_open_breaker_short_circuits(clock):
+    async def send(prompt):
+        raise AssertionError("upstream must not be called")
+
+    breaker = CircuitBreaker(failure_threshold=1, cooldown_seconds=10.0)
+    breaker.record_failure()
+    resilient = client(send, breaker=breaker)
+    with pytest.raises(CircuitOpenError):
+        asyncio.run(resilient.generate("p"))
+    assert resilient.stats["short_circuited"] == 1
+
+
+def test_hedge_wins_when_primary_is_slow():
+    calls = []
+
+    async def send(prompt):
+        calls.append(prompt)
+        if len(calls) == 1:
+            await asyncio.sleep(1)
+            return "primary"
+        return "backup"
+
+    resilient = client(send, attempt_timeout=0.5, hedge_after=0.02)
+    assert asyncio.run(resilient.generate("p")) == "backup"
+    assert resilient.stats["hedges"] == 1
+    assert resilient.stats["hedge_wins"] == 1
+
+
+def test_cancelled_trial_releases_the_half_open_slot(clock):
+    calls = []
+
+    async def send(prompt):
+        calls.append(prompt)
+        if len(calls) == 1:
+            await asyncio.sleep(10)
+        return "ok"
+
+    breaker = CircuitBreaker(failure_threshold=1, cooldown_seconds=10.0)
+    breaker.record_failure()
+    clock.now += 10.0
+    resilient = client(send, breaker=breaker, attempt_timeout=30.0, deadline=60.0)
+
+    async def scenario():
+        trial = asyncio.create_task(resilient.generate("trial"))
+        await asyncio.sleep(0.01)
+        assert len(calls) == 1
+        trial.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await trial
+        # The next call is the new trial and reaches upstream
+        return await resilient.generate("next")
+
+    assert asyncio.run(scenario()) == "ok"
+    assert calls == ["trial", "next"]
+    assert breaker.state == "closed"
+
+
+def test_cancelled_ordinary_call_does_not_free_another_trial(clock):
+    breaker = CircuitBreaker(failure_threshold=1, cooldown_seconds=10.0)
+
+    async def scenario():
+        running = asyncio.Event()
+
+        async def send(prompt):
+            running.set()
+            await asyncio.sleep(10)
+
+        resilient = client(send, breaker=breaker, attempt_timeout=30.0, deadline=60.0)
+        ordinary = asyncio.create_task(resilient.generate("closed-state call"))
+        await running.wait()
+
+        # Meanwhile the breaker opened, cooled down and handed out its trial
+        breaker.record_failure()
+        clock.now += 10.0
+        assert breaker.allow()
+
+        ordinary.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await ordinary
+        # The trial is still owned by whoever took it
+        assert not breaker.allow()
+
+    asyncio.run(scenario())
@@ -0,0 +1,222 @@
+"""/ready until the models are warm; /health/deep: cached micro-inference that never constructs a model"""
+
+import asyncio
+import json
+import threading
+from dataclasses import dataclass
+from types import SimpleNamespace
+from typing import Any, Dict
+
+import pytest
+
+from app import health, main, model_registry
+from app.executors import executor
+from app.model_registry import ModelRegistry
+
+
+@dataclass
+class Response:
+    status_code: int
+    body: Dict[str, Any]
+
+
+async def get(path):
+    """GET one path straight through the ASGI app (no HTTP client needed)"""
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+        "scheme": "http", "path": path, "raw_path": path.encode(), "root_path": "",
+        "query_string": b"", "client": ("test", 1), "server": ("test", 80), "headers": [],
+    }
+    messages = [{"type": "http.request", "body": b"", "more_body": False}]
+    sent = []
+
+    async def receive():
+        if messages:
+            return messages.pop(0)
+        # Wait like a client that stays connected
+        await asyncio.sleep(3600)
+
+    async def send(message):
+        sent.append(message)
+
+    await main.app(scope, receive, send)
+    start = next(m for m in sent if m["type"] == "http.response.start")
+    body = b"".join(m.get("body", b"") for m in sent if m["type"] == "http.response.body")
+    return Response(status_code=start["status"], body=json.loads(body))
+
+
+class Clock:
+    """Stands in for the time module inside app.main"""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+    def perf_counter(self):
+        return self.now
+
+
+class FakeNlp:
+    def __call__(self, text):
+        return SimpleNamespace(ents=("Priya Sharma", "Infosys", "Bengaluru"))
+
+
+@pytest.fixture
+def models(monkeypatch):
+    """A fresh registry whose loaders record every model they construct"""
+    registry = ModelRegistry()
+    constructed = []
+
+    def loader(name, model):
+        def load():
+            constructed.append(name)
+            return model
+        return load
+
+    registry.register("spacy", loader("spacy", FakeNlp()))
+    registry.register("sentence_bert", loader("sentence_bert", object()))
+    registry.register("skill_catalog", loader("skill_catalog", object()))
+    registry.register("gemini", loader("gemini", object()))
+    for module in (model_registry, health, main):
+        monkeypatch.setattr(module, "registry", registry)
+    return SimpleNamespace(registry=registry, constructed=constructed)
+
+
+@pytest.fixture
+def deep_health(monkeypatch, models):
+    """Run the probe in-process and count how often it runs"""
+    clock = Clock()
+    probes = []
+
+    def run_micro_inference():
+        probes.append(clock.now)
+        return health.run_micro_inference()
+
+    monkeypatch.setattr(main, "time", clock)
+    monkeypatch.setattr(main, "run_micro_inference", run_micro_inference)
+    monkeypatch.setitem(main._deep_health, "result", None)
+    monkeypatch.setitem(main._deep_health, "checked_at", 0.0)
+    monkeypatch.setattr(main.config, "HEALTH_DEEP_CACHE_SECONDS", 60)
+    monkeypatch.setattr(main.config, "LLM_BACKEND", "gemini")
+    monkeypatch.setenv("GEMINI_API_KEY", "test-key")
+    monkeypatch.setattr(executor, "cpu_workers", 0)
+    executor.start()
+    yield SimpleNamespace(clock=clock, probes=probes)
+    executor.shutdown()
+
+
+def test_result_is_reused_within_the_ttl(deep_health):
+    clock = deep_health.clock
+
+    async def probe_at(*offsets):
+        responses = []
+        for offset in offsets:
+            clock.now = 1000.0 + offset
+            responses.append(await get("/health/deep"))
+        return responses
+
+    first, cached, expired = asyncio.run(probe_at(0, 30, 61))
+
+    assert first.status_code == 200
+    assert first.body["cached"] is False
+    assert cached.body["cached"] is True
+    assert cached.body["age_seconds"] == 30.0
+    assert cached.body["checks"] == first.body["checks"]
+    assert expired.body["cached"] is False
+    assert deep_health.probes == [1000.0, 1061.0]
+
+
+def test_models_are_never_constructed(deep_health, models):
+    response = asyncio.run(get("/health/deep"))
+
+    assert response.status_code == 200
+    assert response.body["status"] == "healthy"
+    checks = response.body["checks"]
+    for name in ("spacy", "sentence_bert", "skill_catalog"):
+        assert checks[name] == {"status": "not_loaded"}
+    assert checks["gemini"]["client_loaded"] is False
+    assert models.constructed == []
+
+
+def test_loaded_models_are_probed(deep_health, models):
+    models.registry.get("spacy")
+    models.constructed.clear()
+
+    response = asyncio.run(get("/health/deep"))
+
+    checks = response.body["checks"]
+    assert checks["spacy"]["status"] == "ok"
+    assert checks["spacy"]["entities"] == 3
+    assert checks["sentence_bert"] == {"status": "not_loaded"}
+    assert models.constructed == []
+
+
+def test_degraded_result_is_cached_too(deep_health, monkeypatch):
+    monkeypatch.delenv("GEMINI_API_KEY")
+
+    async def probe_twice():
+        first = await get("/health/deep")
+        deep_health.clock.now += 10
+        return first, await get("/health/deep")
+
+    first, cached = asyncio.run(probe_twice())
+
+    assert first.status_code == cached.status_code == 503
+    assert cached.body["checks"]["gemini"]["status"] == "missing_api_key"
+    assert cached.body["cached"] is True
+    assert len(deep_health.probes) == 1
+
+
+@pytest.fixture
+def release(monkeypatch, models):
+    """The spaCy loader blocks until this event is set, like a model still loading"""
+    release = threading.Event()
+
+    def slow_spacy():
+        release.wait(5)
+        models.constructed.append("spacy")
+        return FakeNlp()
+
+    models.registry.register("spacy", slow_spacy)
+    monkeypatch.setattr(main.config, "FAST_START", False)
+    monkeypatch.setattr(main.app.state, "models_warm", False, raising=False)
+    monkeypatch.setattr(main.app.state, "worker_models", [], raising=False)
+    monkeypatch.setattr(executor, "cpu_workers", 0)
+    executor.start()
+    yield release
+    release.set()
+    executor.shutdown()
+
+
+def test_not_ready_until_the_registry_loads(release, models):
+    async def scenario():
+        before = await get("/ready")
+        warm = asyncio.create_task(main.warm_up_models(main.app))
+        await asyncio.sleep(0.05)
+        during = await get("/ready")
+        release.set()
+        await warm
+        return before, during, await get("/ready")
+
+    before, during, after = asyncio.run(scenario())
+
+    assert before.status_code == during.status_code == 503
+    assert during.body["status"] == "warming"
+    assert during.body["models"]["spacy"]["loaded"] is False
+    assert after.status_code == 200
+    assert after.body["status"] == "ready"
+    assert all(model["loaded"] for model in after.body["models"].values())
+    assert after.body["workers"][0]["spacy"]["loaded"] is True
+
+
+def test_fast_start_is_ready_without_models(release, models, monkeypatch):
+    monkeypatch.setattr(main.config, "FAST_START", True)
+
+    response = asyncio.run(get("/ready"))
+
+    assert response.status_code == 200
+    assert response.body["status"] == "ready"
+    assert response.body["models_warm"] is False
+    assert models.constructed == []
@@ -0,0 +1,124 @@
+"""Layout sections: heading recognition, grouping, section text, a PDF without headings"""
+
+import fitz
+import pytest
+
+from app.layout import LayoutBlock, classify_heading, extract_pdf_layout, group_sections, sections_text
+
+
+def block(text, size=10.0, bold=False, page=0):
+    return LayoutBlock(page=page, bbox=(50.0, 50.0, 300.0, 62.0), text=text, font_size=size, bold=bold)
+
+
+def summary(sections):
+    return [(s.kind, s.title, s.text) for s in sections]
+
+
+@pytest.mark.parametrize("text, kind", [
+    ("Experience", "experience"),
+    ("EXPERIENCE", "experience"),
+    ("experience", "experience"),
+    ("Work Experience:", "experience"),
+    ("  WORK   EXPERIENCE  ", "experience"),
+    ("Technical Skills", "skills"),
+    ("SKILLS.", "skills"),
+    ("— Skills —", "skills"),
+    ("Skills & Tools", "skills"),
+    ("Skills and Abilities", "skills"),
+    ("Honours & Awards", "achievements"),
+    ("Education", "education"),
+    ("Certifications:", "certifications"),
+    ("About Me", "summary"),
+    ("PROFESSIONAL SUMMARY", "summary"),
+    ("Key Projects", "projects"),
+])
+def test_classify_heading(text, kind):
+    assert classify_heading(text) == kind
+
+
+@pytest.mark.parametrize("text", [
+    "Experience with Kafka",
+    "Skills in Python and SQL",
+    "Senior Engineer",
+    "Hobbies",
+    "C++",
+    "",
+    "Skills " + "x" * 40,
+])
+def test_body_lines_are_not_headings(text):
+    assert classify_heading(text) is None
+
+
+@pytest.mark.parametrize("blocks, expected", [
+    # Text before the first heading is the header
+    ([block("Jane Doe", size=18), block("jane@example.com"),
+      block("EXPERIENCE", bold=True), block("Engineer at Acme")],
+     [("header", "", "Jane Doe\njane@example.com"),
+      ("experience", "EXPERIENCE", "Engineer at Acme")]),
+    # A heading and its body in one block; an inline "Skills: ..." line
+    ([block("Experience\nEngineer at Acme"), block("Skills: Python, SQL")],
+     [("experience", "Experience", "Engineer at Acme"),
+      ("skills", "Skills", "Python, SQL")]),
+    # Repeated headings each start their own section
+    ([block("Experience"), block("Engineer at Acme"),
+      block("Skills"), block("Python"),
+      block("Experience"), block("Intern at Initech")],
+     [("experience", "Experience", "Engineer at Acme"),
+      ("skills", "Skills", "Python"),
+      ("experience", "Experience", "Intern at Initech")]),
+    # A styled heading we don't know becomes "other", but not in the header
+    ([block("JANE DOE", bold=True), block("Experience"), block("Engineer at Acme"),
+      block("VOLUNTEERING", bold=True), block("Code club mentor")],
+     [("header", "", "JANE DOE"),
+      ("experience", "Experience", "Engineer at Acme"),
+      ("other", "VOLUNTEERING", "Code club mentor")]),
+    # Bold mixed case is a job title, not a heading; empty headings are dropped
+    ([block("Experience"), block("Senior Engineer", bold=True), block("Acme"), block("Skills")],
+     [("experience", "Experience", "Senior Engineer\nAcme")]),
+    # No headings at all
+    ([block("Jane Doe"), block("Engineer at Acme, Python and SQL")],
+     [("header", "", "Jane Doe\nEngineer at Acme, Python and SQL")]),
+    ([], []),
+])
+def test_group_sections(blocks, expected):
+    assert summary(group_sections(blocks)) == expected
+
+
+@pytest.mark.parametrize("kinds, expected", [
+    (("skills",), "Skills\nPython"),
+    (("experience",), "Experience\nEngineer at Acme\n\nExperience\nIntern at Initech"),
+    (("header", "skills"), "Jane Doe\n\nSkills\nPython"),
+    (("education",), ""),
+])
+def test_sections_text(kinds, expected):
+    sections = group_sections([
+        block("Jane Doe"),
+        block("Experience"), block("Engineer at Acme"),
+        block("Skills"), block("Python"),
+        block("Experience"), block("Intern at Initech"),
+    ])
+    assert sections_text(sections, kinds) == expected
+
+
+def test_sections_text_skips_the_header_by_default():
+    sections = group_sections([block("Jane Doe"), block("Skills"), block("Python")])
+    assert sections_text(sections) == "Skills\nPython"
+
+
+def test_pdf_without_headings():
+    doc = fitz.open()
+    page = doc.new_page()
+    lines = ["Jane Doe", "Engineer at Acme since 2019", "Built data pipelines in Python and SQL"]
+    for i, line in enumerate(lines):
+        page.insert_text((72, 72 + 24 * i), line, fontsize=11)
+    data = doc.tobytes()
+    doc.close()
+
+    layout = extract_pdf_layout(data)
+    sections = group_sections(layout.blocks)
+
+    assert layout.page_count == 1
+    assert [s.kind for s in sections] == ["header"]
+    assert sections[0].text.split("\n") == lines
+    # Nothing to select: the pipeline falls back to the whole text
+    assert sections_text(sections) == ""
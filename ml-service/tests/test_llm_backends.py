@@ -0,0 +1,79 @@
+"""Mock LLM backend: deterministic output, valid analysis JSON, selection through config"""
+
+import asyncio
+
+import pytest
+
+from app import gemini_analyzer
+from app.gemini_analyzer import build_prompt, generate_analysis, parse_analysis
+from app.llm_backends import MockLLMBackend, MockLLMError, mock_response
+from app.model_registry import ModelRegistry
+
+
+SKILLS = ["Python", "FastAPI", "PostgreSQL", "Docker"]
+RESUME = "Backend engineer. Built REST APIs with FastAPI and PostgreSQL, deployed with Docker."
+
+
+def test_mock_response_is_deterministic():
+    prompt = build_prompt(RESUME, SKILLS)
+
+    assert mock_response(prompt) == mock_response(prompt)
+    assert len({mock_response(build_prompt(RESUME, [skill])) for skill in SKILLS}) > 1
+
+
+@pytest.mark.parametrize("skills", [SKILLS, [], ["Solidity"]])
+def test_mock_response_parses(skills):
+    analysis = parse_analysis(mock_response(build_prompt(RESUME, skills)), skills, RESUME)
+
+    assert not analysis.is_fallback
+    assert len(analysis.career_recommendations) == 3
+    assert len({rec.role for rec in analysis.career_recommendations}) == 3
+    assert len(analysis.missing_skills) == 5
+    assert len(analysis.quick_wins) == 3
+    assert analysis.salary_prediction.min < analysis.salary_prediction.max
+    assert 55 <= analysis.ats_score <= 92
+    shown = ", ".join(skills[:3]) or "your core stack"
+    assert all(rec.reasoning.startswith(f"You already use {shown}.") for rec in analysis.career_recommendations)
+
+
+def test_same_seed_same_latencies():
+    first = MockLLMBackend(latency_ms=800, distribution="lognormal", jitter=0.5, seed=7)
+    second = MockLLMBackend(latency_ms=800, distribution="lognormal", jitter=0.5, seed=7)
+
+    assert [first.sample_latency() for _ in range(20)] == [second.sample_latency() for _ in range(20)]
+
+
+def test_generate_returns_the_mock_response():
+    backend = MockLLMBackend(latency_ms=0, distribution="fixed")
+    prompt = build_prompt(RESUME, SKILLS)
+
+    assert asyncio.run(backend.generate(prompt)) == mock_response(prompt)
+
+
+def test_injected_errors():
+    backend = MockLLMBackend(latency_ms=0, distribution="fixed", error_rate=1.0)
+
+    with pytest.raises(MockLLMError) as error:
+        asyncio.run(backend.generate("prompt"))
+    assert error.value.code in (429, 503)
+
+
+def test_unknown_distribution():
+    with pytest.raises(ValueError):
+        MockLLMBackend(distribution="normal")
+
+
+def test_mock_backend_selected_by_config_without_api_key(monkeypatch):
+    monkeypatch.delenv("GEMINI_API_KEY", raising=False)
+    monkeypatch.setattr(gemini_analyzer.config, "LLM_BACKEND", "mock")
+    monkeypatch.setattr(gemini_analyzer.config, "MOCK_LLM_LATENCY_MS", 0.0)
+    monkeypatch.setattr(gemini_analyzer.config, "MOCK_LLM_LATENCY_DIST", "fixed")
+    monkeypatch.setattr(gemini_analyzer.config, "MOCK_LLM_ERROR_RATE", 0.0)
+    registry = ModelRegistry()
+    registry.register("gemini", gemini_analyzer._create_client)
+    monkeypatch.setattr(gemini_analyzer, "registry", registry)
+
+    analysis = asyncio.run(generate_analysis(build_prompt(RESUME, SKILLS), SKILLS, RESUME))
+
+    assert not analysis.is_fallback
+    assert analysis == parse_analysis(mock_response(build_prompt(RESUME, SKILLS)), SKILLS, RESUME)
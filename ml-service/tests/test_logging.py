@@ -0,0 +1,46 @@
+"""Structured logging: PII redaction and per-request sampling"""
+
+import logging
+
+from app.logging_config import RedactingFilter, SamplingFilter, get_logger, redact
+
+
+def record(msg="message", level=logging.INFO, request_id="-", fields=None):
+    rec = logging.LogRecord("ml.test", level, __file__, 1, msg, None, None)
+    rec.request_id = request_id
+    if fields is not None:
+        rec.fields = fields
+    return rec
+
+
+def test_redact_masks_emails_and_phones_but_not_dates():
+    assert redact("mail priya.s@example.com or +91 98765 43210") == "mail [email] or [phone]"
+    assert redact("2019 - 2022, took 1234.5 ms") == "2019 - 2022, took 1234.5 ms"
+
+
+def test_redacting_filter_covers_message_and_fields():
+    rec = record("from a@b.io", fields={"email": "a@b.io", "bytes": 12})
+    RedactingFilter().filter(rec)
+    assert rec.msg == "from [email]"
+    assert rec.fields == {"email": "[email]", "bytes": 12}
+
+
+def test_sampling_keeps_whole_requests_and_every_warning():
+    sampler = SamplingFilter(0.5)
+    ids = [f"req-{i}" for i in range(400)]
+    kept = {rid for rid in ids if sampler.filter(record(request_id=rid))}
+
+    assert 100 < len(kept) < 300
+    # Same decision for every line of a request
+    assert all(sampler.filter(record(request_id=rid)) for rid in kept)
+    assert all(sampler.filter(record(level=logging.WARNING, request_id=rid)) for rid in ids)
+    assert sampler.filter(record())
+
+
+def test_sampling_bounds():
+    assert SamplingFilter(1.0).filter(record(request_id="r"))
+    assert not SamplingFilter(0.0).filter(record(request_id="r"))
+
+
+def test_stage_loggers_live_under_ml():
+    assert get_logger("ner").name == "ml.ner"
@@ -0,0 +1,88 @@
+"""Metrics: exposition format, and observations replayed from worker processes"""
+
+import asyncio
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+from app.executors import PipelineExecutor
+from app.metrics import MetricsRegistry, STAGE_SECONDS, metrics
+
+
+def test_counter_and_histogram_render():
+    registry = MetricsRegistry()
+    requests = registry.counter("requests_total", "Requests", ("path",))
+    latency = registry.histogram("latency_seconds", "Latency", buckets=(0.1, 1.0))
+    requests.inc(path='/a"b')
+    requests.inc(2, path='/a"b')
+    latency.observe(0.05)
+    latency.observe(0.5)
+
+    lines = registry.render().splitlines()
+    assert "# TYPE requests_total counter" in lines
+    assert 'requests_total{path="/a\\"b"} 3' in lines
+    assert 'latency_seconds_bucket{le="0.1"} 1' in lines
+    assert 'latency_seconds_bucket{le="+Inf"} 2' in lines
+    assert "latency_seconds_sum 0.55" in lines
+    assert "latency_seconds_count 2" in lines
+
+
+def test_failing_callbacks_are_skipped():
+    registry = MetricsRegistry()
+    registry.callback("queue_depth", "Depth", (), "gauge", lambda: {(): 3})
+    registry.callback("broken", "Broken", (), "gauge", lambda: 1 / 0)
+    lines = registry.render().splitlines()
+    assert "queue_depth 3" in lines
+    assert not any(line.startswith("broken ") for line in lines)
+
+
+def test_buffered_observations_replay_into_another_registry():
+    def registry_with_counter():
+        registry = MetricsRegistry()
+        return registry, registry.counter("work_total", "Work", ("stage",))
+
+    worker, worker_counter = registry_with_counter()
+    parent, parent_counter = registry_with_counter()
+    worker.buffer_observations()
+    worker_counter.inc(stage="ner")
+    worker_counter.inc(stage="ner")
+
+    assert worker_counter.samples() == []
+    parent.replay(worker.drain())
+    assert parent_counter.samples() == [("work_total", ("ner",), 2.0)]
+    assert worker.drain() == []
+    assert MetricsRegistry().drain() == []
+
+
+def _buffer_in_worker():
+    metrics.buffer_observations()
+
+
+def _observe_in_worker(seconds):
+    STAGE_SECONDS.observe(seconds, stage="test_worker")
+    return "done"
+
+
+@pytest.fixture
+def process_executor(monkeypatch):
+    monkeypatch.setattr(metrics, "worker_snapshots", {})
+    pool = PipelineExecutor(cpu_workers=1, io_workers=1, max_pending=4)
+    pool._cpu_pool = ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn"),
+                                         initializer=_buffer_in_worker)
+    yield pool
+    pool._cpu_pool.shutdown(wait=True)
+
+
+def test_worker_observations_reach_the_parent(process_executor):
+    def count():
+        samples = dict(((name, key), value) for name, key, value in STAGE_SECONDS.samples())
+        return samples.get(("resume_stage_seconds_count", ("test_worker",)), 0)
+
+    before = count()
+    assert asyncio.run(process_executor.run_cpu(_observe_in_worker, 0.2)) == "done"
+    assert count() == before + 1
+    # The worker also reports its memory, under its own pid
+    assert list(metrics.worker_snapshots) != [os.getpid()]
+    assert len(metrics.worker_snapshots) == 1
@@ -0,0 +1,77 @@
+"""Model loaders: fail fast without downloads, report through the ml loggers"""
+
+import logging
+import sys
+import types
+
+import numpy as np
+import pytest
+
+from app import ner_extractor
+from app.embedding_cache import load_or_build_embeddings
+from app.skill_index import build_skill_index
+
+
+@pytest.fixture
+def ml_logs(caplog, monkeypatch):
+    # setup_logging() turns propagation off for the service; tests read records directly
+    monkeypatch.setattr(logging.getLogger("ml"), "propagate", True)
+    caplog.set_level(logging.INFO, logger="ml")
+    return caplog
+
+
+def test_missing_spacy_model_fails_fast(monkeypatch, ml_logs):
+    def load(name, exclude=()):
+        raise OSError(f"[E050] Can't find model '{name}'")
+
+    monkeypatch.setitem(sys.modules, "spacy", types.SimpleNamespace(load=load))
+    monkeypatch.setattr("os.system", lambda command: pytest.fail(f"ran {command!r} on the request path"))
+
+    with pytest.raises(RuntimeError, match="spacy download"):
+        ner_extractor.load_spacy_pipeline()
+    assert any(r.name == "ml.ner" and r.levelno == logging.ERROR for r in ml_logs.records)
+
+
+def normalized(rows, dim=8, seed=0):
+    data = np.random.default_rng(seed).standard_normal((rows, dim)).astype(np.float32)
+    return data / np.linalg.norm(data, axis=1, keepdims=True)
+
+
+def test_embedding_cache_builds_once_then_maps(tmp_path, ml_logs, capsys):
+    skills = ["Python", "Docker", "SQL"]
+    calls = []
+
+    def encode(names):
+        calls.append(list(names))
+        return normalized(len(names))
+
+    first = load_or_build_embeddings("model", skills, str(tmp_path), encode)
+    second = load_or_build_embeddings("model", skills, str(tmp_path), encode)
+
+    assert calls == [skills]
+    assert np.allclose(first, second)
+    messages = [r.getMessage() for r in ml_logs.records if r.name == "ml.skills"]
+    assert messages == ["Computing skill embeddings", "Loaded cached skill embeddings"]
+    assert capsys.readouterr().out == ""
+
+
+def test_embedding_cache_key_changes_with_the_skill_list(tmp_path):
+    calls = []
+
+    def encode(names):
+        calls.append(list(names))
+        return normalized(len(names))
+
+    load_or_build_embeddings("model", ["Python"], str(tmp_path), encode)
+    load_or_build_embeddings("model", ["Python", "Go"], str(tmp_path), encode)
+    load_or_build_embeddings("other-model", ["Python"], str(tmp_path), encode)
+    assert len(calls) == 3
+
+
+def test_missing_hnswlib_falls_back_with_a_warning(monkeypatch, ml_logs, capsys):
+    monkeypatch.setitem(sys.modules, "hnswlib", None)
+    index = build_skill_index(normalized(300), backend="hnsw")
+
+    assert index.name == "ivf"
+    assert any(r.name == "ml.skills" and r.levelno == logging.WARNING for r in ml_logs.records)
+    assert capsys.readouterr().out == ""
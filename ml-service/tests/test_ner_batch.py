@@ -0,0 +1,76 @@
+"""iter_entities: rule-settled and model resumes come back in input order"""
+
+import itertools
+import random
+from types import SimpleNamespace
+
+import pytest
+
+from app import ner_extractor
+from app.ner_extractor import extract_entities_batch, iter_entities
+
+
+class FakeNlp:
+    """nlp.pipe that reads whole batches ahead before yielding, like spaCy"""
+
+    def __init__(self):
+        self.piped = []
+
+    def pipe(self, texts, n_process=1, batch_size=32):
+        batch = []
+        for text in texts:
+            self.piped.append(text)
+            batch.append(text)
+            if len(batch) == batch_size:
+                yield from (SimpleNamespace(text=t) for t in batch)
+                batch = []
+        yield from (SimpleNamespace(text=t) for t in batch)
+
+
+@pytest.fixture
+def nlp(monkeypatch):
+    nlp = FakeNlp()
+    monkeypatch.setattr(ner_extractor.registry, "get", lambda name: nlp)
+    monkeypatch.setattr(ner_extractor, "ner_text", lambda text: text)
+    # "rule ..." texts are settled by the rules; the rest need the model
+    monkeypatch.setattr(ner_extractor, "_rules_only",
+                        lambda nlp, text: SimpleNamespace(text="<rules>") if text.startswith("rule") else None)
+    monkeypatch.setattr(ner_extractor, "entities_from_doc", lambda doc, text: (text, doc.text))
+    return nlp
+
+
+def expected(texts):
+    return [(text, "<rules>" if text.startswith("rule") else text) for text in texts]
+
+
+@pytest.mark.parametrize("batch_size", [1, 2, 3, 8, 32])
+@pytest.mark.parametrize("seed", range(5))
+def test_mixed_texts_keep_input_order(nlp, batch_size, seed):
+    rng = random.Random(seed)
+    texts = [f"{rng.choice(['rule', 'model'])} {i}" for i in range(rng.randint(1, 60))]
+
+    assert list(iter_entities(texts, batch_size=batch_size)) == expected(texts)
+    # Only model texts and empty flush docs reach the pipe
+    assert all(text == "" or text.startswith("model") for text in nlp.piped)
+
+
+@pytest.mark.parametrize("texts", [
+    [],
+    ["rule 0"],
+    ["model 0"],
+    ["rule 0", "rule 1", "rule 2", "rule 3", "rule 4"],
+    ["model 0", "rule 1", "rule 2", "rule 3"],
+    ["rule 0", "rule 1", "rule 2", "model 3"],
+])
+@pytest.mark.parametrize("batch_size", [1, 2, 4])
+def test_edge_cases(nlp, texts, batch_size):
+    assert extract_entities_batch(texts, batch_size=batch_size) == expected(texts)
+
+
+def test_rule_only_streams_are_flushed(nlp):
+    # An endless run of rule-only resumes must still produce results
+    endless = (f"rule {i}" for i in itertools.count())
+    first = list(itertools.islice(iter_entities(endless, batch_size=4), 10))
+    assert first == expected([f"rule {i}" for i in range(10)])
+    # Flushed with a few empty docs, not by reading the whole input
+    assert len(nlp.piped) <= 16
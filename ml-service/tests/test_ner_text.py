@@ -0,0 +1,121 @@
+"""NER input selection and truncation; the trimmed spaCy pipeline and a missing model"""
+
+import sys
+import types
+
+import pytest
+
+from app import ner_extractor
+from app.model_registry import ModelRegistry
+from app.ner_extractor import UNUSED_COMPONENTS, load_spacy_pipeline, ner_text
+
+
+RESUME = """Priya Sharma
+priya@example.com
+Summary
+Backend engineer in Bengaluru.
+Skills: Python, FastAPI, SQL
+Experience
+Software Engineer at Infosys, 2021-2023
+Projects
+Resume parser with spaCy
+Education
+B.Tech, IIT Madras"""
+
+
+@pytest.fixture
+def trimmed(monkeypatch):
+    monkeypatch.setattr(ner_extractor.config, "NER_FULL_PIPELINE", False)
+    monkeypatch.setattr(ner_extractor.config, "NER_MAX_CHARS", 20000)
+
+
+def test_only_ner_sections_are_kept(trimmed):
+    text = ner_text(RESUME)
+
+    assert text == ("Priya Sharma\npriya@example.com\n\nBackend engineer in Bengaluru.\n\n"
+                    "Software Engineer at Infosys, 2021-2023\n\nB.Tech, IIT Madras")
+    assert "FastAPI" not in text
+    assert "spaCy" not in text
+
+
+@pytest.mark.parametrize("text", [
+    "just some text\nwith no headings",
+    "Skills\nPython, SQL\nProjects\nResume parser",
+])
+def test_whole_text_when_no_section_is_selected(trimmed, text):
+    assert ner_text(text) == text
+
+
+@pytest.mark.parametrize("max_chars, expected", [
+    (30, "line one is here"),
+    (40, "line one is here\nline two is here"),
+    (12, "line one is "),
+    (0, "line one is here\nline two is here\nline three"),
+    (1000, "line one is here\nline two is here\nline three"),
+])
+def test_truncated_at_a_line_break(trimmed, monkeypatch, max_chars, expected):
+    monkeypatch.setattr(ner_extractor.config, "NER_MAX_CHARS", max_chars)
+
+    assert ner_text("line one is here\nline two is here\nline three") == expected
+
+
+def test_full_pipeline_uses_the_whole_text(monkeypatch):
+    monkeypatch.setattr(ner_extractor.config, "NER_FULL_PIPELINE", True)
+    monkeypatch.setattr(ner_extractor.config, "NER_MAX_CHARS", 10)
+
+    assert ner_text(RESUME) == RESUME
+
+
+class FakeNlp:
+    def __init__(self, pipe_names, listening=()):
+        self.pipe_names = list(pipe_names)
+        self.listening = list(listening)
+
+    def get_pipe(self, name):
+        return types.SimpleNamespace(listening_components=self.listening)
+
+    def remove_pipe(self, name):
+        self.pipe_names.remove(name)
+
+
+@pytest.fixture
+def spacy_load(monkeypatch):
+    """Stand-in spacy module; records the exclude list of every load"""
+    calls = []
+
+    def load(name, exclude=()):
+        calls.append(list(exclude))
+        return FakeNlp(["tok2vec", "ner"])
+
+    monkeypatch.setitem(sys.modules, "spacy", types.SimpleNamespace(load=load))
+    return calls
+
+
+def test_trimmed_pipeline(spacy_load):
+    nlp = load_spacy_pipeline()
+
+    assert spacy_load == [list(UNUSED_COMPONENTS)]
+    assert nlp.pipe_names == ["ner"]
+
+
+def test_full_pipeline(spacy_load):
+    nlp = load_spacy_pipeline(full=True)
+
+    assert spacy_load == [[]]
+    assert nlp.pipe_names == ["tok2vec", "ner"]
+
+
+def test_missing_model_raises_through_the_registry(monkeypatch):
+    def load(name, exclude=()):
+        raise OSError(f"[E050] Can't find model '{name}'")
+
+    monkeypatch.setitem(sys.modules, "spacy", types.SimpleNamespace(load=load))
+    monkeypatch.setattr(ner_extractor.config, "NER_RULES", False)
+    registry = ModelRegistry()
+    registry.register("spacy", ner_extractor._load_spacy)
+
+    with pytest.raises(RuntimeError, match="en_core_web_sm is not installed") as error:
+        registry.get("spacy")
+    assert isinstance(error.value.__cause__, OSError)
+    assert not registry.is_loaded("spacy")
+    assert "spacy download" in registry.errors["spacy"]
@@ -0,0 +1,77 @@
+"""Page-parallel PDF extraction: range splitting and the PDF_MAX_PAGES cap"""
+
+import asyncio
+from dataclasses import dataclass
+from typing import List
+
+import pytest
+
+from app import config, pipeline
+from app.pipeline import read_pdf_ranges
+
+
+@dataclass
+class Pages:
+    page_count: int
+    pages: List[int]
+
+
+def pdf(page_count):
+    """extract(source, start, stop) over a PDF with page_count pages"""
+    def extract(file_path, start, stop):
+        return Pages(page_count, list(range(start, min(stop, page_count))))
+    return extract
+
+
+class InlineExecutor:
+    def __init__(self):
+        self.calls = []
+
+    async def run_cpu(self, fn, file_path, start, stop):
+        self.calls.append((start, stop))
+        return fn(file_path, start, stop)
+
+
+@pytest.fixture
+def inline(monkeypatch):
+    executor = InlineExecutor()
+    monkeypatch.setattr(pipeline, "executor", executor)
+    monkeypatch.setattr(config, "PDF_CHUNK_PAGES", 4)
+    monkeypatch.setattr(config, "PDF_MAX_PAGES", 50)
+    return executor
+
+
+def pages(ranges):
+    return [page for part in ranges for page in part.pages]
+
+
+def test_short_pdf_is_one_range(inline):
+    ranges = asyncio.run(read_pdf_ranges(pdf(2), "r.pdf"))
+    assert pages(ranges) == [0, 1]
+    assert inline.calls == [(0, 4)]
+
+
+def test_long_pdf_is_split_in_page_order(inline):
+    ranges = asyncio.run(read_pdf_ranges(pdf(10), "r.pdf"))
+    assert pages(ranges) == list(range(10))
+    assert inline.calls == [(0, 4), (4, 8), (8, 10)]
+
+
+def test_max_pages_caps_the_first_range(inline, monkeypatch):
+    monkeypatch.setattr(config, "PDF_MAX_PAGES", 2)
+    ranges = asyncio.run(read_pdf_ranges(pdf(10), "r.pdf"))
+    assert pages(ranges) == [0, 1]
+    assert inline.calls == [(0, 2)]
+
+
+def test_max_pages_caps_the_later_ranges(inline, monkeypatch):
+    monkeypatch.setattr(config, "PDF_MAX_PAGES", 6)
+    ranges = asyncio.run(read_pdf_ranges(pdf(10), "r.pdf"))
+    assert pages(ranges) == list(range(6))
+    assert inline.calls == [(0, 4), (4, 6)]
+
+
+def test_requested_stop_is_clamped_to_max_pages(inline, monkeypatch):
+    monkeypatch.setattr(config, "PDF_MAX_PAGES", 6)
+    assert pages(asyncio.run(read_pdf_ranges(pdf(10), "r.pdf", stop=3))) == [0, 1, 2]
+    assert pages(asyncio.run(read_pdf_ranges(pdf(10), "r.pdf", stop=20))) == list(range(6))
@@ -0,0 +1,174 @@
+"""Offline re-processing: inputs, the JSONL checkpoint, resume and retry"""
+
+import argparse
+import io
+import json
+import tarfile
+import zipfile
+from concurrent.futures import Future
+
+import pytest
+
+import reprocess
+from reprocess import JsonlOutput, iter_sources, latest_records
+
+
+class InlinePool:
+    """Runs submitted chunks immediately, in this process"""
+
+    def __init__(self, **kwargs):
+        pass
+
+    def submit(self, fn, *args):
+        future = Future()
+        future.set_result(fn(*args))
+        return future
+
+    def shutdown(self, wait=True, cancel_futures=False):
+        pass
+
+
+@pytest.fixture
+def pipeline(monkeypatch):
+    """process_chunk stand-in: files named bad*.pdf fail until `fixed` is set"""
+    state = {"fixed": False, "runs": []}
+
+    def process_chunk(items, version):
+        records = []
+        for key, filename, source in items:
+            state["runs"].append(key)
+            failing = filename.split("/")[-1].startswith("bad") and not state["fixed"]
+            records.append({"file": key, "pipeline_version": version, "error": "broken" if failing else None,
+                            "characters": 0 if failing else 120, "entities": None, "skills": []})
+        return records
+
+    monkeypatch.setattr(reprocess, "ProcessPoolExecutor", InlinePool)
+    monkeypatch.setattr(reprocess, "process_chunk", process_chunk)
+    monkeypatch.setattr(reprocess, "pipeline_version", lambda: "v1")
+    return state
+
+
+def archive_dir(tmp_path):
+    folder = tmp_path / "resumes"
+    (folder / "b").mkdir(parents=True)
+    for name in ("a1.pdf", "bad.pdf", "b/c.docx", "notes.txt"):
+        (folder / name).write_bytes(b"x")
+    return folder
+
+
+def args(tmp_path, *paths, **overrides):
+    options = dict(paths=[str(p) for p in paths], output=str(tmp_path / "out.jsonl"), format="jsonl",
+                   workers=1, chunk_size=2, restart=False, retry_failed=False)
+    options.update(overrides)
+    return argparse.Namespace(**options)
+
+
+def read_jsonl(path):
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+def test_iter_sources_walks_directories_and_archives(tmp_path):
+    folder = archive_dir(tmp_path)
+    zipped = tmp_path / "old.zip"
+    with zipfile.ZipFile(zipped, "w") as z:
+        z.writestr("x.pdf", b"zip pdf")
+        z.writestr("readme.md", b"skip me")
+    tarred = tmp_path / "old.tar.gz"
+    with tarfile.open(tarred, "w:gz") as t:
+        info = tarfile.TarInfo("dir/y.docx")
+        info.size = 8
+        t.addfile(info, io.BytesIO(b"tar docx"))
+
+    sources = list(iter_sources([str(folder), str(zipped), str(tarred)]))
+    assert [s.key for s in sources] == [
+        f"{folder}/a1.pdf", f"{folder}/bad.pdf", f"{folder}/b/c.docx",
+        f"{zipped}!x.pdf", f"{tarred}!dir/y.docx",
+    ]
+    # Plain files are sent as paths, archive members as bytes
+    assert sources[0].load() == f"{folder}/a1.pdf"
+    assert sources[3].load() == b"zip pdf"
+    assert sources[4].load() == b"tar docx"
+
+
+def test_jsonl_drops_a_torn_tail(tmp_path):
+    path = tmp_path / "out.jsonl"
+    path.write_text('{"file": "a"}\n{"file": "b"}\n{"file": "c', encoding="utf-8")
+    output = JsonlOutput(str(path))
+
+    assert [r["file"] for r in output.existing()] == ["a", "b"]
+    assert path.read_text(encoding="utf-8") == '{"file": "a"}\n{"file": "b"}\n'
+
+
+def test_latest_record_wins():
+    records = [{"file": "a", "error": "broken"}, {"file": "b", "error": None}, {"file": "a", "error": None}]
+    assert latest_records(records) == {"a": {"file": "a", "error": None}, "b": {"file": "b", "error": None}}
+
+
+def test_resume_skips_finished_and_failed_resumes(tmp_path, pipeline):
+    folder = archive_dir(tmp_path)
+    stats = reprocess.run(args(tmp_path, folder))
+    assert stats["processed"] == 3 and stats["errors"] == 1
+
+    pipeline["runs"].clear()
+    stats = reprocess.run(args(tmp_path, folder))
+    assert pipeline["runs"] == []
+    assert stats["skipped"] == 2 and stats["skipped_failed"] == 1
+    assert len(read_jsonl(tmp_path / "out.jsonl")) == 3
+
+
+def test_retry_failed_reruns_only_the_failures(tmp_path, pipeline):
+    folder = archive_dir(tmp_path)
+    reprocess.run(args(tmp_path, folder))
+
+    pipeline["fixed"] = True
+    pipeline["runs"].clear()
+    stats = reprocess.run(args(tmp_path, folder, retry_failed=True))
+    assert pipeline["runs"] == [f"{folder}/bad.pdf"]
+    assert stats["processed"] == 1 and stats["errors"] == 0
+
+    records = read_jsonl(tmp_path / "out.jsonl")
+    assert len(records) == 4
+    assert all(record["error"] is None for record in latest_records(records).values())
+
+    # Nothing left to retry
+    pipeline["runs"].clear()
+    reprocess.run(args(tmp_path, folder, retry_failed=True))
+    assert pipeline["runs"] == []
+
+
+def test_version_mismatch_is_refused_unless_restarting(tmp_path, pipeline, monkeypatch):
+    folder = archive_dir(tmp_path)
+    reprocess.run(args(tmp_path, folder))
+
+    monkeypatch.setattr(reprocess, "pipeline_version", lambda: "v2")
+    with pytest.raises(SystemExit, match="v1"):
+        reprocess.run(args(tmp_path, folder))
+
+    stats = reprocess.run(args(tmp_path, folder, restart=True))
+    assert stats["processed"] == 3
+    assert {r["pipeline_version"] for r in read_jsonl(tmp_path / "out.jsonl")} == {"v2"}
+
+
+def test_unreadable_members_become_error_records(tmp_path, pipeline):
+    zipped = tmp_path / "old.zip"
+    with zipfile.ZipFile(zipped, "w") as z:
+        z.writestr("x.pdf", b"zip pdf")
+    sources = list(iter_sources([str(zipped)]))
+    zipped.write_bytes(b"truncated")
+
+    items, failed = reprocess._load(sources)
+    assert items == [] and failed[0]["file"] == f"{zipped}!x.pdf"
+
+
+def test_parquet_writes_one_part_per_chunk(tmp_path, pipeline):
+    pytest.importorskip("pyarrow")
+    import pyarrow.parquet as pq
+
+    folder = archive_dir(tmp_path)
+    out = tmp_path / "parts"
+    reprocess.run(args(tmp_path, folder, output=str(out), format="parquet"))
+
+    parts = sorted(p.name for p in out.iterdir())
+    assert parts == ["part-00000.parquet", "part-00001.parquet"]
+    assert sum(pq.read_table(out / name).num_rows for name in parts) == 3
@@ -0,0 +1,97 @@
+"""Skill indexes: recall measurement, IVF against the exact scan, the recall floor"""
+
+import logging
+
+import numpy as np
+import pytest
+
+from app.skill_index import ExactSkillIndex, IVFSkillIndex, SkillIndex, build_skill_index, measure_recall, sample_queries
+
+
+def normalized(rows, dim=16, seed=0):
+    data = np.random.default_rng(seed).standard_normal((rows, dim)).astype(np.float32)
+    return data / np.linalg.norm(data, axis=1, keepdims=True)
+
+
+class FixedIndex(SkillIndex):
+    """Returns the same ids for every query"""
+
+    def __init__(self, embeddings, ids):
+        super().__init__(embeddings)
+        self.ids = np.array(ids)
+
+    def search(self, queries, k):
+        ids = np.tile(self.ids[:k], (queries.shape[0], 1))
+        return np.zeros(ids.shape, dtype=np.float32), ids
+
+
+@pytest.fixture
+def ml_logs(caplog, monkeypatch):
+    monkeypatch.setattr(logging.getLogger("ml"), "propagate", True)
+    caplog.set_level(logging.INFO, logger="ml")
+    return caplog
+
+
+def test_measure_recall():
+    data = normalized(50)
+    exact = ExactSkillIndex(data)
+    queries = data[:1]
+    _, true_ids = exact.search(queries, 4)
+
+    assert measure_recall(exact, exact, queries, k=4) == 1.0
+    half = list(true_ids[0, :2]) + [-1, -1]
+    assert measure_recall(FixedIndex(data, half), exact, queries, k=4) == 0.5
+    wrong = [i for i in range(50) if i not in true_ids[0]][:4]
+    assert measure_recall(FixedIndex(data, wrong), exact, queries, k=4) == 0.0
+
+
+def test_ivf_matches_exact_when_probing_every_cluster():
+    data = normalized(400, seed=1)
+    queries = sample_queries(data, n=32)
+    exact = ExactSkillIndex(data)
+    ivf = IVFSkillIndex(data, n_lists=20, n_probe=20)
+
+    exact_scores, exact_ids = exact.search(queries, 5)
+    ivf_scores, ivf_ids = ivf.search(queries, 5)
+    # Same neighbour scores (equal-score skills may swap places)
+    assert np.allclose(ivf_scores, exact_scores)
+    assert measure_recall(ivf, exact, queries, k=5) > 0.95
+    assert measure_recall(IVFSkillIndex(data, n_lists=20, n_probe=1), exact, queries) < 1.0
+
+
+@pytest.mark.parametrize("index", [
+    lambda data: ExactSkillIndex(data),
+    lambda data: IVFSkillIndex(data, n_lists=2, n_probe=1),
+])
+def test_search_pads_when_k_exceeds_the_skills(index):
+    data = normalized(3)
+    scores, ids = index(data).search(data[:2], 5)
+
+    assert scores.shape == ids.shape == (2, 5)
+    assert np.all(ids[:, 3:] == -1)
+    assert np.all(np.isneginf(scores[ids < 0]))
+    assert np.all(np.isfinite(scores[ids >= 0]))
+    # Real hits come first, best first
+    assert ids[0, 0] == 0 and ids[1, 0] == 1
+    for row, row_ids in zip(scores, ids):
+        assert np.all(np.diff(row[row_ids >= 0]) <= 0)
+
+
+def test_low_recall_ivf_probes_more_clusters():
+    data = normalized(2000, dim=32, seed=2)
+    loose = build_skill_index(data, backend="ivf", n_probe=1)
+    assert loose.name == "ivf" and loose.n_probe == 1
+
+    floor = min(0.99, loose.recall + 0.2)
+    widened = build_skill_index(data, backend="ivf", n_probe=1, min_recall=floor)
+    assert widened.name == "ivf"
+    assert widened.n_probe > 1
+    assert widened.recall >= floor
+
+
+def test_unreachable_recall_falls_back_to_exact(ml_logs):
+    data = normalized(2000, dim=32, seed=2)
+    index = build_skill_index(data, backend="ivf", n_probe=1, min_recall=1.01)
+
+    assert index.name == "exact" and index.recall == 1.0
+    assert any(r.name == "ml.skills" and r.levelno == logging.WARNING for r in ml_logs.records)
@@ -0,0 +1,41 @@
+"""Exact skill tier: spellings, aliases, ambiguous names and leftover words"""
+
+from app.skill_lexicon import SkillLexicon, unexplained_words
+
+
+SKILLS = ["Python", "React.js", "React", "Node.js", "C", "C++", "Go", "CI/CD", "Apache Spark", "Machine Learning"]
+
+
+def names(lexicon, text, **kwargs):
+    return [lexicon.skills[hit.skill] for hit in lexicon.scan(text, **kwargs)]
+
+
+def test_spellings_and_aliases():
+    lexicon = SkillLexicon(SKILLS)
+    assert names(lexicon, "Built APIs in python with nodejs and cicd") == ["Python", "Node.js", "CI/CD"]
+    assert names(lexicon, "Streaming jobs on pyspark") == ["Apache Spark"]
+    assert names(lexicon, "react and React.js") == ["React", "React.js"]
+
+
+def test_longest_match_without_overlaps():
+    lexicon = SkillLexicon(SKILLS)
+    hits = lexicon.scan("Machine Learning and C++")
+    assert [lexicon.skills[h.skill] for h in hits] == ["Machine Learning", "C++"]
+    assert [(h.start, h.end) for h in hits] == [(0, 16), (21, 24)]
+
+
+def test_ambiguous_names_only_in_skill_lists():
+    lexicon = SkillLexicon(SKILLS)
+    assert names(lexicon, "Ready to go the extra mile") == []
+    assert names(lexicon, "Python, Go, C") == ["Python", "Go", "C"]
+    assert names(lexicon, "Go", skill_list=True) == ["Go"]
+    # One-letter names must be written exactly
+    assert names(lexicon, "python, c, go") == ["Python", "Go"]
+
+
+def test_unexplained_words():
+    lexicon = SkillLexicon(SKILLS)
+    text = "Languages: Python, Go and C++, etc"
+    assert unexplained_words(text, lexicon.scan(text)) == 0
+    text = "Python for payment reconciliation"
+    assert unexplained_words(text, lexicon.scan(text)) == 2
@@ -0,0 +1,123 @@
+"""StageGraph: dependency order, concurrency, failure and cancellation"""
+
+import asyncio
+
+import pytest
+
+from app.stage_graph import Stage, StageGraph
+
+
+def value(result, delay=0.0):
+    async def fn(**deps):
+        await asyncio.sleep(delay)
+        return result
+    return fn
+
+
+async def drain(graph):
+    return [item async for item in graph.run()]
+
+
+def test_rejects_unknown_dependencies_and_cycles():
+    with pytest.raises(ValueError):
+        StageGraph([Stage("a", value(1), deps=("missing",))])
+    with pytest.raises(ValueError):
+        StageGraph([Stage("a", value(1), deps=("b",)), Stage("b", value(2), deps=("a",))])
+
+
+def test_dependencies_receive_results_by_name():
+    async def add(a, b):
+        return a + b
+
+    graph = StageGraph([Stage("sum", add, deps=("a", "b")), Stage("a", value(1)), Stage("b", value(2))])
+    results = dict(asyncio.run(drain(graph)))
+
+    assert results == {"a": 1, "b": 2, "sum": 3}
+    assert graph.timings.started["sum"] >= max(graph.timings.finished["a"], graph.timings.finished["b"])
+
+
+def test_independent_stages_run_concurrently():
+    graph = StageGraph([Stage("a", value(1, 0.05)), Stage("b", value(2, 0.05))])
+    asyncio.run(drain(graph))
+
+    # b started before a finished
+    assert graph.timings.started["b"] < graph.timings.finished["a"]
+
+
+def test_dependents_start_before_the_consumer_resumes():
+    started = asyncio.Event()
+
+    async def dependent(first):
+        started.set()
+        return first + 1
+
+    async def consume():
+        graph = StageGraph([Stage("first", value(1)), Stage("second", dependent, deps=("first",))])
+        stream = graph.run()
+        assert await stream.__anext__() == ("first", 1)
+        # A slow consumer: the dependent must already be running
+        await asyncio.sleep(0.01)
+        assert started.is_set()
+        assert await stream.__anext__() == ("second", 2)
+        await stream.aclose()
+
+    asyncio.run(consume())
+
+
+def test_failure_cancels_and_awaits_the_other_stages():
+    cancelled = []
+
+    async def slow():
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            await asyncio.sleep(0)
+            cancelled.append("slow")
+            raise
+
+    async def boom():
+        raise RuntimeError("stage failed")
+
+    graph = StageGraph([Stage("slow", slow), Stage("boom", boom)])
+    with pytest.raises(RuntimeError):
+        asyncio.run(drain(graph))
+
+    assert graph.failed == "boom"
+    # The cancellation finished before run() returned
+    assert cancelled == ["slow"]
+
+
+def test_closing_the_stream_cancels_running_stages():
+    cancelled = []
+
+    async def slow():
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append("slow")
+            raise
+
+    async def consume():
+        graph = StageGraph([Stage("fast", value(1)), Stage("slow", slow)])
+        stream = graph.run()
+        assert await stream.__anext__() == ("fast", 1)
+        await stream.aclose()
+        return cancelled
+
+    assert asyncio.run(consume()) == ["slow"]
+
+
+def test_critical_path_follows_the_slowest_chain():
+    async def last(quick, slow):
+        return None
+
+    graph = StageGraph([
+        Stage("quick", value(None, 0.0)),
+        Stage("slow", value(None, 0.05)),
+        Stage("last", last, deps=("quick", "slow"))
+    ])
+    asyncio.run(drain(graph))
+
+    path, seconds = graph.critical_path()
+    assert path == ["slow", "last"]
+    assert seconds >= 0.05
@@ -0,0 +1,122 @@
+"""/analyze-resume/stream: stage events as NDJSON or SSE, errors and a full queue"""
+
+import asyncio
+import json
+from dataclasses import dataclass
+from typing import Dict
+from urllib.parse import urlencode
+
+import pytest
+from fastapi import HTTPException
+
+from app import main
+from app.executors import executor
+from app.pipeline import StageEvent
+
+
+BOUNDARY = "resume-boundary"
+
+
+@dataclass
+class Response:
+    status_code: int
+    headers: Dict[str, str]
+    text: str
+
+
+def upload(path, filename, data, content_type, **params):
+    """POST one multipart file straight through the ASGI app (no HTTP client needed)"""
+    body = (
+        f"--{BOUNDARY}\r\n"
+        f'Content-Disposition: form-data; name="file"; filename="{filename}"\r\n'
+        f"Content-Type: {content_type}\r\n\r\n"
+    ).encode() + data + f"\r\n--{BOUNDARY}--\r\n".encode()
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "POST",
+        "scheme": "http", "path": path, "raw_path": path.encode(), "root_path": "",
+        "query_string": urlencode(params).encode(), "client": ("test", 1), "server": ("test", 80),
+        "headers": [(b"content-type", f"multipart/form-data; boundary={BOUNDARY}".encode()),
+                    (b"content-length", str(len(body)).encode())],
+    }
+    messages = [{"type": "http.request", "body": body, "more_body": False}]
+    sent = []
+
+    async def receive():
+        if messages:
+            return messages.pop(0)
+        # The body is done: wait like a client that stays connected
+        await asyncio.sleep(3600)
+
+    async def send(message):
+        sent.append(message)
+
+    asyncio.run(main.app(scope, receive, send))
+    start = next(m for m in sent if m["type"] == "http.response.start")
+    return Response(
+        status_code=start["status"],
+        headers={k.decode().lower(): v.decode() for k, v in start["headers"]},
+        text=b"".join(m.get("body", b"") for m in sent if m["type"] == "http.response.body").decode()
+    )
+
+
+@pytest.fixture
+def service(monkeypatch):
+    async def not_cached(digest, start_time):
+        return f"v:{digest}", None
+
+    monkeypatch.setattr(main, "lookup_cached", not_cached)
+    executor.start()
+    yield
+    executor.shutdown()
+
+
+def pipeline(*events, error=None):
+    async def run_pipeline(path, filename, cache_key, start_time):
+        for stage, data in events:
+            yield StageEvent(stage, data)
+        if error is not None:
+            raise error
+    return run_pipeline
+
+
+def post(**params):
+    return upload("/analyze-resume/stream", "resume.pdf", b"%PDF-1.4 resume", "application/pdf", **params)
+
+
+def test_events_stream_as_ndjson_in_order(service, monkeypatch):
+    monkeypatch.setattr(main, "run_pipeline", pipeline(("text", "hello"), ("skills", [{"name": "Go"}])))
+    response = post()
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert lines == [{"event": "text", "data": "hello"}, {"event": "skills", "data": [{"name": "Go"}]}]
+    assert executor.pending == 0
+
+
+def test_sse_format(service, monkeypatch):
+    monkeypatch.setattr(main, "run_pipeline", pipeline(("text", "hello")))
+    response = post(format="sse")
+
+    assert response.headers["content-type"].startswith("text/event-stream")
+    assert response.text == 'event: text\ndata: "hello"\n\n'
+
+
+def test_failure_after_the_stream_started_is_an_error_event(service, monkeypatch):
+    error = HTTPException(status_code=400, detail="Resume text too short")
+    monkeypatch.setattr(main, "run_pipeline", pipeline(("text", "hi"), error=error))
+    lines = [json.loads(line) for line in post().text.splitlines()]
+
+    assert lines[-1] == {"event": "error", "data": {"status_code": 400, "detail": "Resume text too short"}}
+    assert executor.pending == 0
+
+
+def test_full_queue_is_a_503_before_streaming(service, monkeypatch):
+    monkeypatch.setattr(executor, "max_pending", 0)
+    response = post()
+    assert response.status_code == 503
+    assert "retry-after" in response.headers
+
+
+def test_wrong_file_type_is_rejected(service):
+    assert upload("/analyze-resume/stream", "resume.txt", b"plain text", "text/plain").status_code == 400
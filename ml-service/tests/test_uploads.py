@@ -0,0 +1,102 @@
+"""Upload limits: 413 from the middleware, chunked spooling to disk"""
+
+import asyncio
+import hashlib
+import io
+import json
+
+import pytest
+
+from app import config
+from app.uploads import UploadLimitMiddleware, UploadTooLargeError, _spool
+
+
+LIMIT = 1024 * 1024
+
+
+def reader_app(catch=False):
+    """An ASGI app that reads the whole body, then answers 200 with its size"""
+    async def app(scope, receive, send):
+        size = 0
+        try:
+            while True:
+                message = await receive()
+                size += len(message.get("body", b""))
+                if not message.get("more_body"):
+                    break
+        except UploadTooLargeError:
+            if not catch:
+                raise
+            # Like a framework turning a body error into its own response
+            await send({"type": "http.response.start", "status": 400, "headers": []})
+            await send({"type": "http.response.body", "body": b"bad body"})
+            return
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": str(size).encode()})
+    return app
+
+
+def call(app, body_chunks, path="/upload", content_length=None):
+    """Drive the middleware with a body arriving in chunks; returns (status, body)"""
+    headers = [] if content_length is None else [(b"content-length", str(content_length).encode())]
+    scope = {"type": "http", "path": path, "headers": headers}
+    messages = [{"type": "http.request", "body": chunk, "more_body": i < len(body_chunks) - 1}
+                for i, chunk in enumerate(body_chunks)]
+    sent = []
+
+    async def receive():
+        return messages.pop(0)
+
+    async def send(message):
+        sent.append(message)
+
+    asyncio.run(UploadLimitMiddleware(app, {"/upload": LIMIT})(scope, receive, send))
+    status = next(m["status"] for m in sent if m["type"] == "http.response.start")
+    return status, b"".join(m.get("body", b"") for m in sent if m["type"] == "http.response.body")
+
+
+def test_declared_length_over_the_limit_is_rejected_before_reading():
+    calls = []
+
+    async def app(scope, receive, send):
+        calls.append(scope)
+
+    status, body = call(app, [b""], content_length=LIMIT + 1)
+    assert status == 413
+    assert json.loads(body) == {"detail": "Upload exceeds the 1 MB limit"}
+    assert calls == []
+
+
+def test_undeclared_body_is_cut_off_once_it_passes_the_limit():
+    status, _ = call(reader_app(), [b"x" * (LIMIT // 2)] * 3)
+    assert status == 413
+
+
+def test_app_error_responses_become_413():
+    status, body = call(reader_app(catch=True), [b"x" * (LIMIT // 2)] * 3)
+    assert status == 413
+    assert b"bad body" not in body
+
+
+def test_bodies_within_the_limit_and_other_paths_pass():
+    assert call(reader_app(), [b"x" * 10, b"y" * 10]) == (200, b"20")
+    assert call(reader_app(), [b"x" * LIMIT] * 2, path="/other") == (200, str(2 * LIMIT).encode())
+
+
+def test_spool_copies_and_hashes_in_chunks(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "UPLOAD_TMP_DIR", str(tmp_path))
+    data = b"%PDF" + b"x" * (3 * 1024 * 1024)
+    path, size, digest = _spool(io.BytesIO(data), ".pdf", max_bytes=len(data))
+
+    assert path.endswith(".pdf") and path.startswith(str(tmp_path))
+    assert size == len(data)
+    assert digest == hashlib.sha256(data).hexdigest()
+    with open(path, "rb") as f:
+        assert f.read() == data
+
+
+def test_spool_over_the_limit_leaves_no_file(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "UPLOAD_TMP_DIR", str(tmp_path))
+    with pytest.raises(UploadTooLargeError):
+        _spool(io.BytesIO(b"x" * (LIMIT + 1)), ".pdf", max_bytes=LIMIT)
+    assert list(tmp_path.iterdir()) == []